@@ -0,0 +1,35 @@
+"""Performance benchmarks for the level up server
+
+Each benchmark is a module run from the project root, e.g.:
+
+    python -m benchmarks.index_plans
+"""
+import os
+from pathlib import Path
+import django
+
+
+def read_only(path):
+    """SQLite URI opening the database at `path` read-only"""
+    return Path(path).resolve().as_uri() + '?mode=ro'
+
+
+def setup_django(database=None):
+    """Configure Django, optionally against a separate database
+
+    Arguments:
+        database -- Path of the SQLite database the benchmark should use, or
+            a complete Django DATABASES entry for any other backend. The
+            reports read the same database
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'levelup.settings')
+
+    from django.conf import settings
+    if isinstance(database, dict):
+        settings.DATABASES['default'] = database
+        settings.DATABASES['reports'] = dict(database)
+    elif database is not None:
+        settings.DATABASES['default']['NAME'] = database
+        settings.DATABASES['reports']['NAME'] = read_only(database)
+
+    django.setup()
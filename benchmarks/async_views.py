@@ -0,0 +1,173 @@
+"""Read endpoint throughput under concurrent load, served by uvicorn (ASGI,
+async read views) against gunicorn (WSGI, sync workers) with the same number
+of worker processes
+
+    pip install uvicorn gunicorn
+    python -m benchmarks.async_views --workers 2 --concurrency 32 --latency-ms 2
+
+--latency-ms delays every query by that much inside the servers, standing in
+for the round trip to a database server; SQLite answers in microseconds,
+which leaves nothing for either server to overlap. Both servers read the
+same seeded SQLite database with the response cache off.
+"""
+import argparse
+import http.client
+import importlib.util
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks import setup_django
+
+PATHS = ('/profile', '/events?limit=20', '/games?limit=20')
+
+# Settings module the servers load, on top of levelup.settings
+SETTINGS = """
+import time
+from django.db.backends.signals import connection_created
+from levelup.settings import *
+
+DEBUG = False
+ALLOWED_HOSTS = ['127.0.0.1']
+DATABASES['default']['NAME'] = {database!r}
+RESPONSE_CACHE = None
+REQUEST_INSTRUMENTATION = None
+
+def delay(execute, sql, params, many, context):
+    time.sleep({latency!r})
+    return execute(sql, params, many, context)
+
+def add_delay(sender, connection, **kwargs):
+    connection.execute_wrappers.append(delay)
+
+if {latency!r}:
+    connection_created.connect(add_delay, weak=False)
+"""
+
+SERVERS = {
+    'asgi': ['uvicorn', 'levelup.asgi:application', '--host', '127.0.0.1', '--port', '{port}',
+             '--workers', '{workers}', '--log-level', 'warning', '--no-access-log'],
+    'wsgi': ['gunicorn', 'levelup.wsgi:application', '--bind', '127.0.0.1:{port}',
+             '--workers', '{workers}', '--log-level', 'warning'],
+}
+
+
+def free_port():
+    """An unused local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind, workers, settings_dir):
+    """Start a server in the background and wait until it accepts connections"""
+    port = free_port()
+    command = [arg.format(port=port, workers=workers) for arg in SERVERS[kind]]
+    env = dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE='levelup_bench_settings',
+        PYTHONPATH=os.pathsep.join([settings_dir, os.getcwd()]),
+        LEVELUP_ASYNC_READ_VIEWS='1' if kind == 'asgi' else '0',
+    )
+    server = subprocess.Popen([sys.executable, '-m'] + command, env=env)
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return server, port
+        except OSError:
+            time.sleep(0.2)
+
+    server.terminate()
+    raise RuntimeError(f"{kind} server did not start")
+
+
+def request(port, path, token):
+    """GET path on a fresh connection, returning (status, milliseconds)"""
+    start = time.perf_counter()
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    try:
+        conn.request('GET', path, headers={'Authorization': 'Token ' + token})
+        response = conn.getresponse()
+        response.read()
+        return response.status, (time.perf_counter() - start) * 1000
+    finally:
+        conn.close()
+
+
+def load(port, tokens, concurrency, seconds):
+    """Keep `concurrency` clients requesting PATHS for `seconds`"""
+    deadline = time.monotonic() + seconds
+
+    def client(number):
+        results = []
+        sent = number
+        while time.monotonic() < deadline:
+            results.append(request(port, PATHS[sent % len(PATHS)], tokens[sent % len(tokens)]))
+            sent += concurrency
+        return results
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        return [result for results in pool.map(client, range(concurrency)) for result in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--database', default=os.path.join(tempfile.gettempdir(), 'levelup_async_views.sqlite3'))
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--latency-ms', type=float, default=2)
+    args = parser.parse_args()
+
+    missing = [name for name in ('uvicorn', 'gunicorn') if importlib.util.find_spec(name) is None]
+    if missing:
+        sys.exit(f"install {' and '.join(missing)} to run this benchmark")
+
+    if os.path.exists(args.database):
+        os.remove(args.database)
+
+    setup_django(args.database)
+    from django.core.management import call_command
+    from levelupapi.models import Gamer
+
+    call_command('migrate', verbosity=0)
+    call_command(
+        'seed_levelup', users=200, games=2000, events=5000,
+        registrations=20000, skip_reports=True, skip_recommendations=True, verbosity=0
+    )
+    tokens = list(
+        Gamer.objects.order_by('id').values_list('user__auth_token__key', flat=True)[:50]
+    )
+
+    with tempfile.TemporaryDirectory() as settings_dir:
+        with open(os.path.join(settings_dir, 'levelup_bench_settings.py'), 'w') as settings_file:
+            settings_file.write(SETTINGS.format(database=args.database, latency=args.latency_ms / 1000))
+
+        for kind in ('wsgi', 'asgi'):
+            server, port = start_server(kind, args.workers, settings_dir)
+            try:
+                # Let every worker open its connection before measuring
+                load(port, tokens, args.concurrency, 1)
+                results = load(port, tokens, args.concurrency, args.seconds)
+            finally:
+                server.terminate()
+                server.wait()
+
+            latencies = sorted(ms for _, ms in results)
+            errors = sum(1 for status, _ in results if status != 200)
+            print(
+                f"{kind} {args.workers} workers, {args.concurrency} clients:"
+                f"  {len(results) / args.seconds:7.1f} req/s"
+                f"  p50 {statistics.median(latencies):7.1f} ms"
+                f"  p99 {latencies[int(len(latencies) * 0.99) - 1]:7.1f} ms"
+                f"  errors {errors}"
+            )
+
+if __name__ == '__main__':
+    main()
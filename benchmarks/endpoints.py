@@ -0,0 +1,312 @@
+"""Latency, throughput, SQL query count and peak memory of every route,
+driven in-process through the Django test client against a seeded database
+
+    python -m benchmarks.endpoints --output before.json
+    python -m benchmarks.endpoints --baseline before.json --threshold 1.25
+
+The database is seeded with `manage.py seed_levelup` the first time it is
+used. Every route is timed with the response and token caches off, then
+again with both warm (the warm_* columns). With --baseline the run fails
+when a route's p95 latency, cold or warm, grows past `threshold` times the
+baseline's, or when it runs more SQL queries on all its database aliases
+together.
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import ExitStack
+from itertools import count
+from benchmarks import setup_django
+
+
+def routes(client, fixtures):
+    """Every route as (name, request), where request() sends one request
+
+    Routes that change state put it back outside the timed call: signing
+    up is timed with the cancellation left untimed and vice versa.
+    """
+    usernames = count()
+    game = fixtures['game']
+    event = fixtures['event']
+    signup = f"/events/{fixtures['signup_event']}/signup"
+
+    def get(path):
+        return lambda: client.get(path)
+
+    def post(path, body=None):
+        return lambda: client.post(path, data=body() if body else None, content_type='application/json')
+
+    def register():
+        return {
+            "username": f"benchmark{os.getpid()}-{next(usernames)}",
+            "password": "levelup",
+            "email": "benchmark@example.com",
+            "first_name": "Bench",
+            "last_name": "Mark",
+            "bio": "",
+        }
+
+    return [
+        ("GET /gametypes", get("/gametypes"), None),
+        ("GET /games", get("/games"), None),
+        ("GET /games?pagination=cursor", get("/games?pagination=cursor"), None),
+        ("GET /games/{id}", get(f"/games/{game}"), None),
+        ("GET /events", get("/events"), None),
+        ("GET /events?pagination=cursor", get("/events?pagination=cursor"), None),
+        ("GET /events/{id}", get(f"/events/{event}"), None),
+        ("POST /events/{id}/signup", post(signup), lambda: client.delete(signup)),
+        ("DELETE /events/{id}/signup", lambda: client.delete(signup), post(signup)),
+        ("GET /profile", get("/profile"), None),
+        ("POST /login", post("/login", lambda: fixtures['credentials']), None),
+        ("POST /register", post("/register", register), None),
+        ("GET /reports/usergames", get("/reports/usergames"), None),
+        ("GET /reports/userevents", get("/reports/userevents"), None),
+    ]
+
+
+def measure(request, reset, requests, warmup):
+    """Time `requests` calls of one route and collect its statistics
+
+    The route is measured with the response and token caches off, so every
+    request runs the endpoint's queries and serialization, and then again
+    with both caches warm, which is reported as the warm_* statistics.
+
+    Arguments:
+        request -- Sends one request to the route
+        reset -- Optional untimed call restoring state between requests
+    """
+    from django.test import override_settings
+
+    with override_settings(RESPONSE_CACHE=None, GAMER_TOKEN_CACHE=None):
+        result = sample(request, reset, requests, warmup, memory=True)
+
+    warm = sample(request, reset, requests, warmup)
+    result.update({
+        'warm_queries': warm['queries'],
+        'warm_queries_by_alias': warm['queries_by_alias'],
+        'warm_p50_ms': warm['p50_ms'],
+        'warm_p95_ms': warm['p95_ms'],
+    })
+    return result
+
+
+def query_aliases():
+    """Database aliases the routes can query: the primary, the reports
+    database and the read replicas
+
+    Other configured aliases are left alone, capturing their queries would
+    open a connection to each.
+    """
+    from django.db import DEFAULT_DB_ALIAS
+    from levelup import replicas
+
+    return list(dict.fromkeys(
+        [DEFAULT_DB_ALIAS, replicas.reports_database(), *replicas.options()['ALIASES']]
+    ))
+
+
+def sample(request, reset, requests, warmup, memory=False):
+    """Time `requests` calls of one route after `warmup` untimed ones
+
+    Arguments:
+        memory -- Also trace the peak memory of one request
+    """
+    from django.db import connections, reset_queries
+    from django.test.utils import CaptureQueriesContext
+
+    def send():
+        response = request()
+        if response.streaming:
+            b"".join(response.streaming_content)
+        return response
+
+    def timed():
+        start = time.perf_counter()
+        response = send()
+        elapsed = (time.perf_counter() - start) * 1000
+        if reset is not None:
+            reset()
+        return response, elapsed
+
+    for _ in range(warmup):
+        timed()
+
+    # Each request clears the query log as it starts, so start from empty
+    reset_queries()
+    with ExitStack() as stack:
+        captured = {
+            alias: stack.enter_context(CaptureQueriesContext(connections[alias]))
+            for alias in query_aliases()
+        }
+        status_code = send().status_code
+    # The captured slices read the live logs, which later requests clear
+    queries = {alias: len(capture) for alias, capture in captured.items()}
+    if reset is not None:
+        reset()
+
+    result = {
+        'status': status_code,
+        'queries': sum(queries.values()),
+        'queries_by_alias': queries,
+    }
+
+    if memory:
+        # Tracing allocations slows everything down, so memory gets its own request
+        tracemalloc.start()
+        timed()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result['peak_kib'] = round(peak / 1024, 1)
+
+    samples = [timed()[1] for _ in range(requests)]
+
+    samples.sort()
+    result.update({
+        'mean_ms': round(statistics.mean(samples), 3),
+        'p50_ms': round(percentile(samples, 50), 3),
+        'p95_ms': round(percentile(samples, 95), 3),
+        'p99_ms': round(percentile(samples, 99), 3),
+        'requests_per_s': round(1000 * requests / sum(samples), 1),
+    })
+    return result
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of sorted samples"""
+    index = max(0, min(len(samples) - 1, round(pct / 100 * len(samples)) - 1))
+    return samples[index]
+
+
+def prepare(args):
+    """Seed the database if needed and pick the records the routes use"""
+    from django.core.management import call_command
+    from levelupapi.management.commands.seed_levelup import SEED_PASSWORD
+    from levelupapi.models import Event, Game, Gamer
+
+    call_command('migrate', verbosity=0)
+    if not Gamer.objects.exists():
+        call_command(
+            'seed_levelup', users=args.users, games=args.games, events=args.events,
+            registrations=args.registrations, seed=args.seed, verbosity=0
+        )
+
+    gamer = Gamer.objects.select_related('user__auth_token').order_by('id').first()
+    return {
+        'token': gamer.user.auth_token.key,
+        'credentials': {"username": gamer.user.username, "password": SEED_PASSWORD},
+        'game': Game.objects.order_by('id').values_list('id', flat=True).first(),
+        'event': Event.objects.order_by('id').values_list('id', flat=True).first(),
+        'signup_event': (
+            Event.objects.exclude(registration__gamer=gamer)
+            .order_by('id').values_list('id', flat=True).first()
+        ),
+    }
+
+
+def regressions(results, baseline, threshold):
+    """Describe every route that got slower or chattier than the baseline"""
+    found = []
+    for name, result in results['routes'].items():
+        before = baseline['routes'].get(name)
+        if before is None:
+            continue
+
+        for key, label in (('p95_ms', "p95"), ('warm_p95_ms', "warm p95")):
+            if key in before and result[key] > before[key] * threshold:
+                found.append(f"{name}: {label} {before[key]} ms -> {result[key]} ms")
+        if result['queries'] > before['queries']:
+            found.append(f"{name}: queries {before['queries']} -> {result['queries']}")
+
+    return found
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database', default=os.path.join(tempfile.gettempdir(), 'levelup_endpoints.sqlite3'))
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--games', type=int, default=2000)
+    parser.add_argument('--events', type=int, default=10000)
+    parser.add_argument('--registrations', type=int, default=50000)
+    parser.add_argument('--seed', type=int, default=17)
+    parser.add_argument('--requests', type=int, default=200, help="timed requests per route")
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--route', action='append', help="only run routes containing this text")
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--baseline', help="JSON results of an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=1.25, help="allowed p95 growth over the baseline")
+    args = parser.parse_args()
+
+    setup_django(args.database)
+    from django.conf import settings
+    from django.test import Client
+
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['testserver']
+    # Every login comes from the one test client address
+    settings.LOGIN_THROTTLE = None
+    logging.getLogger('django.request').setLevel(logging.CRITICAL)
+
+    fixtures = prepare(args)
+    client = Client(HTTP_AUTHORIZATION='Token ' + fixtures['token'])
+
+    results = {
+        'commit': git_commit(),
+        'database': args.database,
+        'requests': args.requests,
+        'routes': {},
+    }
+
+    for name, request, reset in routes(client, fixtures):
+        if args.route and not any(text in name for text in args.route):
+            continue
+
+        # The cancellation needs a signup to cancel on its first call
+        if name.startswith("DELETE"):
+            reset()
+
+        result = measure(request, reset, args.requests, args.warmup)
+        results['routes'][name] = result
+        print(
+            f"{name:<32} {result['status']:>3}  q {result['queries']:>3}"
+            f"  p50 {result['p50_ms']:8.2f}  p95 {result['p95_ms']:8.2f}  p99 {result['p99_ms']:8.2f} ms"
+            f"  {result['requests_per_s']:8.1f} req/s  peak {result['peak_kib']:9.1f} KiB"
+            f"  | warm q {result['warm_queries']:>3}  p50 {result['warm_p50_ms']:8.2f}"
+            f"  p95 {result['warm_p95_ms']:8.2f} ms"
+        )
+
+        # Leave the gamer signed out of the event for the next run
+        if name.startswith("POST /events"):
+            client.delete(f"/events/{fixtures['signup_event']}/signup")
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            found = regressions(results, json.load(baseline), args.threshold)
+
+        for regression in found:
+            print("REGRESSION " + regression)
+        if found:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Nested serializers and JSONRenderer against the FAST_JSON path (flat
+serializers and orjson) on 10k row pages, checking the bytes match
+
+    python -m benchmarks.fast_json --rows 10000 --requests 5
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from benchmarks import setup_django
+
+
+def timed(client, url, requests):
+    """GET url `requests` times and return the body and the median latency"""
+    content = client.get(url).content
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get(url)
+        samples.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.status_code
+    return content, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--database', default=os.path.join(tempfile.gettempdir(), 'levelup_fast_json.sqlite3'))
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--requests', type=int, default=5)
+    args = parser.parse_args()
+
+    if os.path.exists(args.database):
+        os.remove(args.database)
+
+    setup_django(args.database)
+    from django.core.management import call_command
+    from django.test import Client, override_settings
+    from levelupapi.models import Gamer
+
+    call_command('migrate', verbosity=0)
+    call_command(
+        'seed_levelup', users=200, games=args.rows, events=args.rows,
+        registrations=args.rows, skip_reports=True, skip_recommendations=True, verbosity=0
+    )
+
+    token = Gamer.objects.select_related('user__auth_token').order_by('id').first().user.auth_token.key
+    client = Client(HTTP_AUTHORIZATION='Token ' + token)
+
+    for url in (f"/events?limit={args.rows}", f"/games?limit={args.rows}"):
+        with override_settings(RESPONSE_CACHE=None, FAST_JSON=False, ALLOWED_HOSTS=['testserver']):
+            nested, nested_ms = timed(client, url, args.requests)
+        with override_settings(RESPONSE_CACHE=None, FAST_JSON=True, ALLOWED_HOSTS=['testserver']):
+            fast, fast_ms = timed(client, url, args.requests)
+
+        print(
+            f"GET {url:<24} nested {nested_ms:8.1f} ms  fast {fast_ms:8.1f} ms"
+            f"  speedup {nested_ms / fast_ms:4.1f}x  {len(fast) / 1024:,.0f} KiB"
+            f"  identical {fast == nested}"
+        )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Latency of /games?search= queries over the full-text index against the
+name LIKE scan they replace
+
+    python -m benchmarks.game_search --games 1000000
+
+Each search counts its games and reads the first page of 20, best matches
+first, as the games list does. The LIKE scan also matches inside words, so
+it can find more.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from benchmarks import setup_django
+
+SYLLABLES = (
+    "ka", "ro", "mi", "dra", "gon", "tel", "qu", "est", "vor", "an", "li", "sa",
+    "tor", "ben", "cas", "ti", "le", "mor", "ix", "ul",
+)
+
+# A few words show up in many names, most in a handful, as in real titles
+WORDS = ["ticket", "ride", "castle", "dragon", "quest", "empire"] + sorted({
+    "".join(random.Random(i).sample(SYLLABLES, 3)) for i in range(20000)
+})
+
+# (label, search text, extra filters)
+SEARCHES = [
+    ("autocomplete, one short prefix", "dra", {}),
+    ("two common words, last one a prefix", "castle dra", {}),
+    ("rare word", WORDS[300], {}),
+    ("no match", "zebra", {}),
+    ("with type and player filters", "quest", {'game_type_id': 3, 'num_players__gte': 4}),
+]
+
+
+def seed(cursor, rng, games, batch_size=50000):
+    """Bulk insert one gamer, ten game types and `games` games with raw SQL"""
+    cursor.execute(
+        """INSERT INTO auth_user (id, password, is_superuser, username, first_name,
+           last_name, email, is_staff, is_active, date_joined)
+           VALUES (1, '!', 0, 'gamer', 'Gamer', 'One', '', 0, 1, '2020-01-01 00:00:00')"""
+    )
+    cursor.execute("INSERT INTO levelupapi_gamer (id, bio, user_id) VALUES (1, '', 1)")
+    cursor.executemany(
+        "INSERT INTO levelupapi_gametype (id, name, updated_at) VALUES (%s, %s, '2020-01-01 00:00:00')",
+        [(i, f"Type {i}") for i in range(1, 11)]
+    )
+
+    for start in range(1, games + 1, batch_size):
+        cursor.executemany(
+            """INSERT INTO levelupapi_game (id, name, num_players, skill_level, creator_id,
+               game_type_id, updated_at) VALUES (%s, %s, %s, %s, 1, %s, '2020-01-01 00:00:00')""",
+            [
+                (i, " ".join(
+                    WORDS[(int(rng.paretovariate(1)) - 1) % len(WORDS)]
+                    for _ in range(rng.randint(1, 4))
+                ).title(),
+                 rng.randint(2, 8), rng.randint(1, 10), rng.randint(1, 10))
+                for i in range(start, min(start + batch_size, games + 1))
+            ]
+        )
+
+
+def timed(games, repeat):
+    """Milliseconds to count `games` and read their first page"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        games.count()
+        list(games.all()[:20])
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--database', default=os.path.join(tempfile.gettempdir(), 'levelup_game_search.sqlite3'))
+    parser.add_argument('--games', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=17)
+    args = parser.parse_args()
+
+    if os.path.exists(args.database):
+        os.remove(args.database)
+
+    setup_django(args.database)
+    from django.core.management import call_command
+    from django.db import connection, transaction
+    from levelupapi import search
+    from levelupapi.models import Game
+
+    call_command('migrate', verbosity=0)
+
+    start = time.perf_counter()
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            seed(cursor, random.Random(args.seed), args.games)
+    print(f"Seeded {args.games} games in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    search.rebuild()
+    print(f"Indexed them in {time.perf_counter() - start:.1f}s\n")
+
+    for label, text, filters in SEARCHES:
+        games = Game.objects.filter(**filters)
+        indexed = search.search_games(games, text).order_by('-search_rank', 'id')
+        scanned = games
+        for word in search.terms(text):
+            scanned = scanned.filter(name__icontains=word)
+        scanned = scanned.order_by('id')
+
+        print(f"{label} ({text!r}, {indexed.count()} found, {scanned.count()} by LIKE)")
+        print(f"  full-text {timed(indexed, args.repeat):9.3f} ms")
+        print(f"  LIKE scan {timed(scanned, args.repeat):9.3f} ms")
+        print()
+
+
+if __name__ == '__main__':
+    main()
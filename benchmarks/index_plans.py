@@ -0,0 +1,169 @@
+"""Query plans and timings for the hot EventGamer and Event lookups,
+before and after the composite indexes of migration 0003
+
+    python -m benchmarks.index_plans --registrations 1000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from benchmarks import setup_django
+
+# (label, SQL, params) for every lookup the API and reports run by the pair
+# of foreign keys or by calendar order
+QUERIES = [
+    (
+        "signup/retrieve: registration by (event, gamer)",
+        "SELECT 1 FROM levelupapi_eventgamer WHERE event_id = %s AND gamer_id = %s",
+        lambda rng, size: [rng.randint(1, size['events']), rng.randint(1, size['gamers'])],
+    ),
+    (
+        "profile: events a gamer signed up for",
+        """SELECT e.id, e.date, e.time FROM levelupapi_event e
+           JOIN levelupapi_eventgamer eg ON eg.event_id = e.id
+           WHERE eg.gamer_id = %s""",
+        lambda rng, size: [rng.randint(1, size['gamers'])],
+    ),
+    (
+        "calendar: events in a date window",
+        """SELECT e.id FROM levelupapi_event e
+           WHERE e.date BETWEEN %s AND %s ORDER BY e.date, e.time LIMIT 10""",
+        lambda rng, size: ['2021-03-01', '2021-03-31'],
+    ),
+    (
+        "calendar: events per day of a month",
+        """SELECT e.date, COUNT(e.id) FROM levelupapi_event e
+           WHERE e.date >= %s AND e.date < %s GROUP BY e.date ORDER BY e.date""",
+        lambda rng, size: ['2021-03-01', '2021-04-01'],
+    ),
+    (
+        "game schedule: a game's upcoming events",
+        """SELECT e.id FROM levelupapi_event e
+           WHERE e.game_id = %s AND e.date >= %s ORDER BY e.date""",
+        lambda rng, size: [rng.randint(1, size['games']), '2021-06-01'],
+    ),
+]
+
+
+def seed(cursor, rng, size, batch_size=50000):
+    """Bulk insert a synthetic data set with raw SQL"""
+    cursor.executemany(
+        """INSERT INTO auth_user (id, password, is_superuser, username, first_name,
+           last_name, email, is_staff, is_active, date_joined)
+           VALUES (%s, '!', 0, %s, 'Gamer', %s, '', 0, 1, '2020-01-01 00:00:00')""",
+        [(i, f"gamer{i}", str(i)) for i in range(1, size['gamers'] + 1)]
+    )
+    cursor.executemany(
+        "INSERT INTO levelupapi_gamer (id, bio, user_id) VALUES (%s, '', %s)",
+        [(i, i) for i in range(1, size['gamers'] + 1)]
+    )
+    cursor.executemany(
+        "INSERT INTO levelupapi_gametype (id, name) VALUES (%s, %s)",
+        [(i, f"Type {i}") for i in range(1, 11)]
+    )
+    cursor.executemany(
+        """INSERT INTO levelupapi_game (id, name, num_players, skill_level, creator_id, game_type_id)
+           VALUES (%s, %s, %s, %s, %s, %s)""",
+        [
+            (i, f"Game {i}", rng.randint(2, 8), rng.randint(1, 10),
+             rng.randint(1, size['gamers']), rng.randint(1, 10))
+            for i in range(1, size['games'] + 1)
+        ]
+    )
+    cursor.executemany(
+        """INSERT INTO levelupapi_event (id, date, time, location, creator_id, game_id)
+           VALUES (%s, %s, %s, '', %s, %s)""",
+        [
+            (i, f"2021-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+             f"{rng.randint(8, 22):02d}:00:00", rng.randint(1, size['gamers']),
+             rng.randint(1, size['games']))
+            for i in range(1, size['events'] + 1)
+        ]
+    )
+
+    per_event = max(1, size['registrations'] // size['events'])
+    rows = []
+    for event_id in range(1, size['events'] + 1):
+        for gamer_id in rng.sample(range(1, size['gamers'] + 1), min(per_event, size['gamers'])):
+            rows.append((event_id, gamer_id))
+        if len(rows) >= batch_size:
+            cursor.executemany(
+                "INSERT INTO levelupapi_eventgamer (event_id, gamer_id) VALUES (%s, %s)", rows
+            )
+            rows = []
+    if rows:
+        cursor.executemany(
+            "INSERT INTO levelupapi_eventgamer (event_id, gamer_id) VALUES (%s, %s)", rows
+        )
+
+
+def measure(connection, size, repeat):
+    """EXPLAIN and time every query against the current schema"""
+    results = []
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+        for label, sql, params in QUERIES:
+            rng = random.Random(label)
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params(rng, size))
+            plan = [row[-1] for row in cursor.fetchall()]
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                cursor.execute(sql, params(rng, size))
+                cursor.fetchall()
+            elapsed = (time.perf_counter() - start) / repeat
+
+            results.append((label, plan, elapsed))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--database', default=os.path.join(tempfile.gettempdir(), 'levelup_index_plans.sqlite3'))
+    parser.add_argument('--gamers', type=int, default=20000)
+    parser.add_argument('--games', type=int, default=5000)
+    parser.add_argument('--events', type=int, default=100000)
+    parser.add_argument('--registrations', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=17)
+    args = parser.parse_args()
+
+    if os.path.exists(args.database):
+        os.remove(args.database)
+
+    setup_django(args.database)
+    from django.core.management import call_command
+    from django.db import connection, transaction
+
+    size = {
+        'gamers': args.gamers,
+        'games': args.games,
+        'events': args.events,
+        'registrations': args.registrations,
+    }
+
+    call_command('migrate', 'auth', verbosity=0)
+    call_command('migrate', 'levelupapi', '0002', verbosity=0)
+
+    start = time.perf_counter()
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            seed(cursor, random.Random(args.seed), size)
+    print(f"Seeded {size} in {time.perf_counter() - start:.1f}s\n")
+
+    before = measure(connection, size, args.repeat)
+    call_command('migrate', 'levelupapi', '0003', verbosity=0)
+    after = measure(connection, size, args.repeat)
+
+    for (label, plan_before, time_before), (_, plan_after, time_after) in zip(before, after):
+        print(label)
+        print(f"  before {time_before * 1000:9.3f} ms  " + " | ".join(plan_before))
+        print(f"  after  {time_after * 1000:9.3f} ms  " + " | ".join(plan_after))
+        print()
+
+
+if __name__ == '__main__':
+    main()
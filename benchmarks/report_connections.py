@@ -0,0 +1,114 @@
+"""Per-request latency of the reports with a fresh sqlite3 connection per
+request (the old levelupreports code) against Django's managed connection,
+with and without persistent connections
+
+    python -m benchmarks.report_connections --requests 500
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+from benchmarks import setup_django
+
+USERGAMES_SQL = """
+    SELECT g.id, g.name, g.game_type_id, g.num_players, g.skill_level,
+           u.id user_id, u.first_name || ' ' || u.last_name AS full_name
+    FROM levelupapi_game g
+    JOIN levelupapi_gamer gr ON g.creator_id = gr.id
+    JOIN auth_user u ON gr.user_id = u.id
+"""
+
+
+def legacy_usergame_list(request, database):
+    """The report as it used to run: connect, query, group and render"""
+    from django.shortcuts import render
+    from levelupapi.models import Game
+
+    with sqlite3.connect(database) as conn:
+        conn.row_factory = sqlite3.Row
+        db_cursor = conn.cursor()
+        db_cursor.execute(USERGAMES_SQL)
+
+        games_by_user = {}
+        for row in db_cursor.fetchall():
+            game = Game(name=row['name'])
+            uid = row['user_id']
+            if uid in games_by_user:
+                games_by_user[uid]['games'].append(game)
+            else:
+                games_by_user[uid] = {"id": uid, "full_name": row["full_name"], "games": [game]}
+
+        return render(request, 'users/list_with_games.html', {'usergame_list': games_by_user.values()})
+
+
+def request_cycle(view, *args):
+    """Call a view between the request signals Django uses to open and
+    recycle database connections"""
+    from django.core import signals
+    from django.test import RequestFactory
+
+    request = RequestFactory().get('/reports/usergames')
+
+    def run():
+        signals.request_started.send(sender=None)
+        try:
+            return view(request, *args)
+        finally:
+            signals.request_finished.send(sender=None)
+
+    return run
+
+
+def timed(label, func, requests):
+    """Run func `requests` times and print latency statistics"""
+    func()
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    print(
+        f"{label:<36} mean {statistics.mean(samples):7.2f} ms"
+        f"  p50 {samples[len(samples) // 2]:7.2f} ms"
+        f"  p95 {samples[int(len(samples) * 0.95)]:7.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--database', default=os.path.join(tempfile.gettempdir(), 'levelup_report_connections.sqlite3'))
+    parser.add_argument('--gamers', type=int, default=20)
+    parser.add_argument('--games', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    if os.path.exists(args.database):
+        os.remove(args.database)
+
+    setup_django(args.database)
+    from django.core.management import call_command
+    from django.db import connection
+    from levelupreports.views import usergame_list
+
+    call_command('migrate', verbosity=0)
+    call_command(
+        'seed_levelup', users=args.gamers, games=args.games, events=0, registrations=0, verbosity=0
+    )
+
+    timed("sqlite3.connect per request", request_cycle(legacy_usergame_list, args.database), args.requests)
+
+    for conn_max_age in (0, 60):
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = conn_max_age
+        timed(
+            f"django connection, CONN_MAX_AGE={conn_max_age}",
+            request_cycle(usergame_list),
+            args.requests
+        )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Concurrent signups for one event, checking for duplicate registrations
+and oversubscription
+
+Every gamer double-clicks "sign up" from several threads at once against
+an event whose game seats fewer players than there are gamers:
+
+    python -m benchmarks.signup_stress --gamers 100 --capacity 10
+    python -m benchmarks.signup_stress --postgres levelup_stress
+
+--postgres takes a database name; host and credentials come from the usual
+PGHOST/PGUSER/PGPASSWORD environment variables and psycopg2 must be
+installed.
+"""
+import argparse
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks import setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--database', default=os.path.join(tempfile.gettempdir(), 'levelup_signup_stress.sqlite3'))
+    parser.add_argument('--postgres', metavar='NAME', default=None)
+    parser.add_argument('--gamers', type=int, default=100)
+    parser.add_argument('--clicks', type=int, default=2, help='concurrent signups per gamer')
+    parser.add_argument('--capacity', type=int, default=10)
+    parser.add_argument('--threads', type=int, default=16)
+    args = parser.parse_args()
+
+    if args.postgres is not None:
+        setup_django({
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': args.postgres,
+        })
+    else:
+        if os.path.exists(args.database):
+            os.remove(args.database)
+        setup_django({
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': args.database,
+            'OPTIONS': {'timeout': 30},
+        })
+
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.db import connection
+    from django.db.models import Count
+    from rest_framework.authtoken.models import Token
+    from rest_framework.test import APIClient
+    from levelupapi.models import Event, EventGamer, Game, Gamer, GameType
+
+    settings.ENFORCE_EVENT_CAPACITY = True
+    logging.getLogger('django.request').setLevel(logging.ERROR)
+    settings.ALLOWED_HOSTS = ['testserver']
+
+    call_command('migrate', verbosity=0)
+    call_command('flush', interactive=False, verbosity=0)
+
+    User = get_user_model()
+    tokens = []
+    for i in range(args.gamers):
+        user = User.objects.create(username=f"stress{i}")
+        Gamer.objects.create(user=user, bio="")
+        tokens.append(Token.objects.create(user=user).key)
+
+    creator = Gamer.objects.first()
+    game = Game.objects.create(
+        name="Stress", num_players=args.capacity, skill_level=1,
+        creator=creator, game_type=GameType.objects.create(name="Stress")
+    )
+    event = Event.objects.create(
+        date="2021-01-01", time="18:00", location="Everywhere", creator=creator, game=game
+    )
+
+    clicks = [token for token in tokens for _ in range(args.clicks)]
+    barrier = threading.Barrier(args.threads)
+
+    def signup(token):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Token ' + token)
+        try:
+            return client.post(f"/events/{event.id}/signup").status_code
+        except Exception as ex:  # pylint: disable=broad-except
+            return type(ex).__name__
+
+    def worker(batch):
+        barrier.wait()
+        try:
+            return [signup(token) for token in batch]
+        finally:
+            connection.close()
+
+    batches = [clicks[i::args.threads] for i in range(args.threads)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        outcomes = Counter(
+            outcome for results in pool.map(worker, batches) for outcome in results
+        )
+    elapsed = time.perf_counter() - start
+
+    registrations = EventGamer.objects.filter(event=event).count()
+    duplicates = (
+        EventGamer.objects.filter(event=event)
+        .values('gamer').annotate(n=Count('id')).filter(n__gt=1).count()
+    )
+
+    print(f"{connection.vendor}: {len(clicks)} signups from {args.threads} threads in {elapsed:.2f}s")
+    print(f"  responses     {dict(outcomes)}")
+    print(f"  registrations {registrations} (capacity {args.capacity})")
+    print(f"  duplicates    {duplicates}")
+
+    if registrations > args.capacity or duplicates:
+        raise SystemExit("FAILED: event was oversubscribed or double booked")
+
+
+if __name__ == '__main__':
+    main()
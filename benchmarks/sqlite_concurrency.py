@@ -0,0 +1,187 @@
+"""Mixed signup and event list load from several processes and threads,
+against Django's stock SQLite setup and the production profile of
+levelup.settings (WAL and the other SQLITE_PRAGMAS, IMMEDIATE transactions,
+read-only report connections)
+
+    python -m benchmarks.sqlite_concurrency --processes 4 --threads 8 --seconds 10
+
+Each client thread picks a request at random: signing its gamer up for an
+event or cancelling (--writes of them), reading the games by user report
+(--reports) or else listing events. Every profile gets a freshly seeded
+database, since the journal mode is stored in the file. Errors are requests
+that failed, typically with "database is locked".
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from collections import Counter
+from benchmarks import setup_django
+
+PROFILES = ('stock', 'production')
+
+
+def configure(profile, database):
+    """Set Django up against `database` with one of the PROFILES"""
+    if profile == 'stock':
+        setup_django({'ENGINE': 'django.db.backends.sqlite3', 'NAME': database})
+    else:
+        setup_django(database)
+
+    from django.conf import settings
+    settings.ALLOWED_HOSTS = ['testserver']
+    settings.DEBUG = False
+    settings.RESPONSE_CACHE = None
+    logging.getLogger('django.request').setLevel(logging.CRITICAL)
+
+
+def request(client, kind, event_id):
+    """Send one request, returning its status code or the exception's name"""
+    try:
+        if kind == 'signup':
+            return client.post(f"/events/{event_id}/signup").status_code
+        if kind == 'cancel':
+            return client.delete(f"/events/{event_id}/signup").status_code
+        if kind == 'report':
+            return client.get("/reports/usergames").status_code
+        return client.get("/events?limit=20").status_code
+    except Exception as ex:  # pylint: disable=broad-except
+        return type(ex).__name__
+
+
+def worker(profile, database, tokens, event_ids, args, number):
+    """One process of the load: `args.threads` clients for `args.seconds`
+
+    Returns:
+        list -- (request kind, outcome, milliseconds) of every request
+    """
+    configure(profile, database)
+    from django.db import connections
+    from rest_framework.test import APIClient
+
+    barrier = threading.Barrier(args.threads)
+    results = []
+    lock = threading.Lock()
+
+    def client(thread):
+        rng = random.Random(args.seed * 1000 + number * args.threads + thread)
+        api = APIClient()
+        api.credentials(HTTP_AUTHORIZATION='Token ' + rng.choice(tokens))
+        done = []
+
+        barrier.wait()
+        deadline = time.monotonic() + args.seconds
+        try:
+            while time.monotonic() < deadline:
+                draw = rng.random()
+                if draw < args.writes:
+                    kind = rng.choice(('signup', 'cancel'))
+                elif draw < args.writes + args.reports:
+                    kind = 'report'
+                else:
+                    kind = 'list'
+
+                start = time.perf_counter()
+                outcome = request(api, kind, rng.choice(event_ids))
+                done.append((kind, outcome, (time.perf_counter() - start) * 1000))
+        finally:
+            connections.close_all()
+
+        with lock:
+            results.extend(done)
+
+    threads = [threading.Thread(target=client, args=(thread, )) for thread in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def seed(profile, database, args):
+    """Seed a fresh database, returning the tokens and event ids to use"""
+    configure(profile, database)
+    from django.core.management import call_command
+    from django.db import connections
+    from levelupapi.models import Event, Gamer
+
+    call_command('migrate', verbosity=0)
+    call_command(
+        'seed_levelup', users=500, games=1000, events=2000, registrations=10000,
+        skip_recommendations=True, verbosity=0
+    )
+    tokens = list(Gamer.objects.values_list('user__auth_token__key', flat=True))
+    event_ids = list(Event.objects.order_by('-id').values_list('id', flat=True)[:args.hot_events])
+    connections.close_all()
+    return tokens, event_ids
+
+
+def run(profile, args):
+    """Seed the profile's database in a child process, then load it from
+    `args.processes` processes. Returns the combined results."""
+    database = f"{args.database}-{profile}.sqlite3"
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(database + suffix):
+            os.remove(database + suffix)
+
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(1) as pool:
+        tokens, event_ids = pool.apply(seed, (profile, database, args))
+
+    with context.Pool(args.processes) as pool:
+        batches = pool.starmap(worker, [
+            (profile, database, tokens, event_ids, args, number)
+            for number in range(args.processes)
+        ])
+    return [result for batch in batches for result in batch]
+
+
+def report(profile, results, args):
+    """Print throughput, latency and errors per request kind"""
+    clients = args.processes * args.threads
+    print(f"{profile}: {args.processes} processes x {args.threads} threads ({clients} clients)")
+    print(f"  {len(results) / args.seconds:8.1f} req/s")
+
+    for kind in ('list', 'report', 'signup', 'cancel'):
+        latencies = sorted(ms for done, _, ms in results if done == kind)
+        if not latencies:
+            continue
+        errors = Counter(
+            outcome for done, outcome, _ in results
+            if done == kind and (isinstance(outcome, str) or outcome >= 500)
+        )
+        print(
+            f"  {kind:<7} {len(latencies):7d} requests"
+            f"  p50 {statistics.median(latencies):8.1f} ms"
+            f"  p99 {latencies[max(int(len(latencies) * 0.99) - 1, 0)]:8.1f} ms"
+            f"  max {latencies[-1]:8.1f} ms"
+            f"  errors {dict(errors) or 0}"
+        )
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--database', default=os.path.join(tempfile.gettempdir(), 'levelup_sqlite_concurrency'),
+                        help="path prefix of the databases, one per profile")
+    parser.add_argument('--profiles', nargs='+', choices=PROFILES, default=list(PROFILES))
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--writes', type=float, default=0.3, help="share of signups and cancellations")
+    parser.add_argument('--reports', type=float, default=0.05, help="share of report reads")
+    parser.add_argument('--hot-events', type=int, default=50, help="events the signups go to")
+    parser.add_argument('--seed', type=int, default=17)
+    args = parser.parse_args()
+
+    for profile in args.profiles:
+        report(profile, run(profile, args), args)
+
+
+if __name__ == '__main__':
+    main()
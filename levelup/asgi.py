@@ -13,4 +13,7 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'levelup.settings')
 
+# Answer the read endpoints with async views, see levelup.settings
+os.environ.setdefault('LEVELUP_ASYNC_READ_VIEWS', '1')
+
 application = get_asgi_application()
@@ -0,0 +1,203 @@
+"""Per-request SQL and timing instrumentation
+
+RequestInstrumentationMiddleware counts the SQL each request runs through
+`connection.execute_wrapper` and splits each request's time between the
+database, the view outside of SQL (mostly building the serializers' data) and
+the renderer encoding the response. It reports the totals as Server-Timing
+response headers and as one JSON log line per request on the
+`levelup.instrumentation` logger. Queries slower than
+SLOW_QUERY_MS are logged with their SQL and the view that ran them, and the
+same statement running DUPLICATE_QUERY_THRESHOLD times or more in one request
+is logged as a likely N+1.
+
+The middleware is opt-in through the REQUEST_INSTRUMENTATION setting. Work a
+streaming response does after the view returns is not counted.
+"""
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('levelup.instrumentation')
+
+DEFAULTS = {
+    'SLOW_QUERY_MS': 100,
+    'DUPLICATE_QUERY_THRESHOLD': 2,
+}
+
+# Metrics of the request being handled in the current thread or task
+current_metrics = ContextVar('current_metrics', default=None)
+
+IN_LIST = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def fingerprint(sql):
+    """Identify a statement regardless of its parameters
+
+    Literals become placeholders and an IN list of any length looks the same,
+    so an N+1 loop produces a single fingerprint.
+    """
+    normalized = IN_LIST.sub('(%s)', LITERAL.sub('%s', sql))
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12]
+
+
+class RequestMetrics:
+    """SQL and rendering timings collected while handling one request"""
+
+    def __init__(self):
+        self.queries = []
+        self.db_time = 0.0
+        self.render_started = None
+        self.render_time = 0.0
+
+    def record(self, sql, duration):
+        """Add one executed statement taking `duration` seconds"""
+        self.queries.append((sql, duration))
+        self.db_time += duration
+
+    def rendering(self):
+        """Note the response's rendering starting, with the SQL so far"""
+        self.render_started = (time.perf_counter(), self.db_time)
+
+    def rendered(self, response=None):
+        """Post-render callback adding the rendering's time outside of SQL"""
+        start, db_time = self.render_started
+        self.render_time += time.perf_counter() - start - (self.db_time - db_time)
+
+    def duplicates(self, threshold):
+        """Map fingerprints run at least `threshold` times to their count and SQL"""
+        counts = Counter(fingerprint(sql) for sql, _ in self.queries)
+        found = {}
+        for sql, _ in self.queries:
+            key = fingerprint(sql)
+            if counts[key] >= threshold and key not in found:
+                found[key] = (counts[key], sql)
+        return found
+
+
+def timed_execute(execute, sql, params, many, context):
+    """Execute wrapper recording the statement in the current request's metrics"""
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics = current_metrics.get()
+        if metrics is not None:
+            metrics.record(sql, time.perf_counter() - start)
+
+
+def view_name(request):
+    """Name the view that handled `request`, e.g. Events.list"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+
+    view = match.func
+    cls = getattr(view, 'cls', None)
+    if cls is None:
+        return getattr(view, '__name__', repr(view))
+
+    action = (getattr(view, 'actions', None) or {}).get(request.method.lower())
+    return f"{cls.__name__}.{action}" if action else cls.__name__
+
+
+class RequestInstrumentationMiddleware:
+    """Measure each request's SQL, view and rendering work
+
+    Enabled when settings.REQUEST_INSTRUMENTATION is a dict of options (see
+    DEFAULTS); otherwise Django drops the middleware at startup.
+    """
+
+    def __init__(self, get_response):
+        options = getattr(settings, 'REQUEST_INSTRUMENTATION', None)
+        if options is None:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        self.options = {**DEFAULTS, **options}
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        reset = current_metrics.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timed_execute))
+                response = self.get_response(request)
+        finally:
+            current_metrics.reset(reset)
+        total = time.perf_counter() - start
+
+        # Without a rendering step, e.g. for a streamed export, everything
+        # outside of SQL counts as the view's
+        if metrics.render_started is None:
+            view_time = total - metrics.db_time
+        else:
+            render_start, db_time = metrics.render_started
+            view_time = render_start - start - db_time
+
+        view = view_name(request)
+        duplicates = metrics.duplicates(self.options['DUPLICATE_QUERY_THRESHOLD'])
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={metrics.db_time * 1000:.2f};desc="{len(metrics.queries)} queries"',
+            f'view;dur={view_time * 1000:.2f}',
+            f'render;dur={metrics.render_time * 1000:.2f}',
+            f'total;dur={total * 1000:.2f}',
+        ])
+
+        self.log_slow_queries(metrics, view)
+        for key, (count, sql) in duplicates.items():
+            logger.warning(json.dumps({
+                'event': 'duplicate_query',
+                'view': view,
+                'fingerprint': key,
+                'count': count,
+                'sql': sql,
+            }))
+
+        logger.info(json.dumps({
+            'event': 'request',
+            'method': request.method,
+            'path': request.path,
+            'view': view,
+            'status': response.status_code,
+            'queries': len(metrics.queries),
+            'duplicate_queries': sum(count for count, _ in duplicates.values()),
+            'db_ms': round(metrics.db_time * 1000, 2),
+            'view_ms': round(view_time * 1000, 2),
+            'render_ms': round(metrics.render_time * 1000, 2),
+            'total_ms': round(total * 1000, 2),
+        }))
+
+        return response
+
+    def process_template_response(self, request, response):
+        """Time the rendering of DRF and template responses, which Django
+        runs right after this hook"""
+        metrics = current_metrics.get()
+        if metrics is not None:
+            metrics.rendering()
+            response.add_post_render_callback(metrics.rendered)
+        return response
+
+    def log_slow_queries(self, metrics, view):
+        """Log every statement slower than SLOW_QUERY_MS"""
+        threshold = self.options['SLOW_QUERY_MS'] / 1000
+        for sql, duration in metrics.queries:
+            if duration >= threshold:
+                logger.warning(json.dumps({
+                    'event': 'slow_query',
+                    'view': view,
+                    'duration_ms': round(duration * 1000, 2),
+                    'sql': sql,
+                }))
@@ -0,0 +1,213 @@
+"""Read replica routing
+
+ReplicaRoutingMiddleware marks the reads of each GET, HEAD and OPTIONS
+request as fit for a replica, and ReplicaRouter sends them to one of the
+DATABASES aliases listed in READ_REPLICAS['ALIASES']. Everything else goes
+to the primary, the `default` database: writes, the reads of requests that
+write, reads inside a transaction on the primary, management commands and
+the auth tokens and sessions, which must be found right after register
+and login.
+
+A gamer who wrote stays pinned to the primary for MAX_LAG_SECONDS after
+the write, so their next reads see it. The pins are kept in the Django
+cache named by READ_REPLICAS['CACHE_ALIAS'] under the request's
+Authorization header or session cookie. Replicas measured further behind
+the primary than MAX_LAG_SECONDS are skipped until they catch up, so no
+read is staler than that, and when every replica is behind the primary
+serves the reads.
+
+The levelupreports tables are read from a replica whenever nothing is being
+written, including while an export streams after its request returned, and
+otherwise from the REPORTS_DATABASE alias, read-only connections to the
+primary.
+"""
+import hashlib
+import logging
+import os
+import random
+import threading
+import time
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.utils import DatabaseError
+
+logger = logging.getLogger('levelup.replicas')
+
+DEFAULTS = {
+    'ALIASES': [],
+    'MAX_LAG_SECONDS': 5,
+    'LAG_CHECK_SECONDS': 5,
+    'CACHE_ALIAS': 'default',
+}
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Apps whose reads go to a replica, or to REPORTS_DATABASE, even outside
+# of a read request
+REPLICA_APPS = ('levelupreports', )
+
+# Apps whose reads always go to the primary
+PRIMARY_APPS = ('authtoken', 'sessions')
+
+# True while handling a request whose reads may go to a replica, False
+# while handling one that writes or whose gamer is pinned, None outside of
+# requests
+reading_from_replica = ContextVar('reading_from_replica', default=None)
+
+# Primary replication lag of each replica alias as (checked at, seconds)
+_lags = {}
+_lags_lock = threading.Lock()
+
+
+def options():
+    """The READ_REPLICAS settings over DEFAULTS"""
+    return {**DEFAULTS, **(getattr(settings, 'READ_REPLICAS', None) or {})}
+
+
+def measure_lag(alias):
+    """Seconds the replica `alias` is behind the primary
+
+    PostgreSQL standbys report the age of the last transaction they
+    replayed, or no lag when they have replayed everything they received.
+    A SQLite replica is a copy made by the sync_replica command, so it is
+    as old as its file.
+    """
+    connection = connections[alias]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT CASE
+                    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                END
+            """)
+            return float(cursor.fetchone()[0])
+
+    if connection.vendor == 'sqlite' and not connection.is_in_memory_db():
+        return time.time() - os.path.getmtime(connection.settings_dict['NAME'])
+
+    return 0.0
+
+
+def lag(alias, check_every):
+    """The last lag measured for `alias`, measured again every `check_every`
+    seconds. An unreachable replica counts as infinitely far behind."""
+    now = time.monotonic()
+    with _lags_lock:
+        checked_at, seconds = _lags.get(alias, (None, None))
+    if checked_at is not None and now - checked_at < check_every:
+        return seconds
+
+    try:
+        seconds = measure_lag(alias)
+    except (DatabaseError, OSError):
+        logger.warning("Replica %s is unreachable, reading from the primary", alias, exc_info=True)
+        seconds = float('inf')
+
+    with _lags_lock:
+        _lags[alias] = (now, seconds)
+    return seconds
+
+
+def reset_lags():
+    """Forget the measured lags, so each replica is checked on its next read"""
+    with _lags_lock:
+        _lags.clear()
+
+
+def replica(fallback=DEFAULT_DB_ALIAS):
+    """A replica alias within MAX_LAG_SECONDS of the primary, or `fallback`"""
+    config = options()
+    healthy = [
+        alias for alias in config['ALIASES']
+        if lag(alias, config['LAG_CHECK_SECONDS']) <= config['MAX_LAG_SECONDS']
+    ]
+    return random.choice(healthy) if healthy else fallback
+
+
+def reports_database():
+    """The alias reading the primary for the reports"""
+    return getattr(settings, 'REPORTS_DATABASE', None) or DEFAULT_DB_ALIAS
+
+
+def writing():
+    """Whether the primary is in a transaction, whose reads must see its writes"""
+    return connections[DEFAULT_DB_ALIAS].in_atomic_block
+
+
+class ReplicaRouter:
+    """Send reads to a replica where the request allows it, see the module
+    docstring. With no READ_REPLICAS aliases everything uses `default`."""
+
+    def db_for_read(self, model, **hints):
+        app_label = model._meta.app_label
+        if app_label in PRIMARY_APPS or writing():
+            return DEFAULT_DB_ALIAS
+
+        on_replica = reading_from_replica.get()
+        if app_label in REPLICA_APPS and on_replica is not False:
+            return replica(fallback=reports_database())
+        if on_replica:
+            return replica()
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive their schema from the primary
+        return db == DEFAULT_DB_ALIAS or (
+            db not in options()['ALIASES'] and db != reports_database()
+        )
+
+
+def pin_key(request):
+    """Cache key pinning the requesting gamer to the primary, None for
+    requests without credentials"""
+    credentials = (
+        request.META.get('HTTP_AUTHORIZATION')
+        or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    )
+    if not credentials:
+        return None
+    return "replica-pin:" + hashlib.sha1(credentials.encode()).hexdigest()
+
+
+class ReplicaRoutingMiddleware:
+    """Decide where each request reads from and pin gamers who write
+
+    Enabled when READ_REPLICAS lists replica aliases; otherwise Django
+    drops the middleware at startup.
+    """
+
+    def __init__(self, get_response):
+        config = options()
+        if not config['ALIASES']:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        self.pins = caches[config['CACHE_ALIAS']]
+        self.max_lag = config['MAX_LAG_SECONDS']
+
+    def __call__(self, request):
+        key = pin_key(request)
+        safe = request.method in SAFE_METHODS
+
+        on_replica = safe and (key is None or self.pins.get(key) is None)
+        reset = reading_from_replica.set(on_replica)
+        try:
+            response = self.get_response(request)
+        finally:
+            reading_from_replica.reset(reset)
+
+        if not safe and key is not None:
+            self.pins.set(key, True, timeout=self.max_lag)
+
+        return response
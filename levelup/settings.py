@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -40,27 +41,102 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework.authtoken',
     'corsheaders',
-    'levelupapi',
-    'levelupreports'
+    'levelupapi.apps.LevelupapiConfig',
+    'levelupreports.apps.LevelupreportsConfig'
 ]
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'levelupapi.authentication.GamerTokenAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'levelupapi.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 10
 }
 
+# In-process cache of authenticated tokens with their users and gamers.
+# Set to None to look the token up on every request
+GAMER_TOKEN_CACHE = {
+    'MAX_SIZE': 10000,
+    'TIMEOUT': 60,
+}
+
+# Reject event signups once an event has as many gamers registered as its
+# game's num_players
+ENFORCE_EVENT_CAPACITY = False
+
+# Per-request SQL and timing instrumentation (levelup.instrumentation). Set to
+# a dict such as {'SLOW_QUERY_MS': 100, 'DUPLICATE_QUERY_THRESHOLD': 2} to add
+# Server-Timing headers and log each request's queries
+REQUEST_INSTRUMENTATION = None
+
+# Serve list pages from .values() rows through compiled flat serializers
+# (levelupapi.views.flat) and render JSON with orjson when it is installed.
+# The output is identical to the nested serializers'
+FAST_JSON = False
+
+# Route the read endpoints (profile, event and game lists, reports) and login
+# as async views (levelupapi.views.asynchronous). levelup.asgi turns this on;
+# leave it off under WSGI, where an async view costs an event loop per request
+ASYNC_READ_VIEWS = os.environ.get('LEVELUP_ASYNC_READ_VIEWS', '') == '1'
+
+# Login password checks run on a pool of WORKERS threads (levelupapi.login),
+# hashing in parallel without holding up other requests. Logins arriving
+# while QUEUE more checks wait for a worker are answered 503
+LOGIN_HASHING = {
+    'WORKERS': 4,
+    'QUEUE': 32,
+}
+
+# Logins over IP_ATTEMPTS per client address in IP_WINDOW seconds, or over
+# USERNAME_FAILURES attempts for a username in USERNAME_WINDOW seconds
+# without a successful one, are answered 429 before their password is
+# hashed. CACHE_ALIAS names a cache holding only the counts; point it at a
+# shared backend to count across processes. Set to None to allow every
+# attempt
+LOGIN_THROTTLE = {
+    'IP_ATTEMPTS': 30,
+    'IP_WINDOW': 60,
+    'USERNAME_FAILURES': 5,
+    'USERNAME_WINDOW': 300,
+    'CACHE_ALIAS': 'login-throttle',
+}
+
+# Serialized payloads of the read endpoints, invalidated by bumping
+# generations from the model signals (levelupapi.cache). Set to None to
+# serialize every request
+RESPONSE_CACHE = {
+    'ALIAS': 'responses',
+    'TIMEOUT': 300,
+}
+
+# Database aliases that safe-method requests and the reports read from
+# (levelup.replicas). A gamer who writes reads from the primary for
+# MAX_LAG_SECONDS afterwards, and replicas further behind than that are
+# skipped. Set LEVELUP_REPLICA_DATABASE to try it with a SQLite copy kept
+# current by `python manage.py sync_replica`
+READ_REPLICAS = {
+    'ALIASES': ['replica'] if os.environ.get('LEVELUP_REPLICA_DATABASE') else [],
+    'MAX_LAG_SECONDS': 5,
+    'LAG_CHECK_SECONDS': 5,
+    # Point it at a shared backend so pins hold across processes
+    'CACHE_ALIAS': 'default',
+}
+
 CORS_ORIGIN_WHITELIST = (
     'http://localhost:3000',
     'http://127.0.0.1:3000'
 )
 
 MIDDLEWARE = [
+    'levelup.instrumentation.RequestInstrumentationMiddleware',
+    'levelup.replicas.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -92,16 +168,111 @@ TEMPLATES = [
 WSGI_APPLICATION = 'levelup.wsgi.application'
 
 
+# Caches
+# https://docs.djangoproject.com/en/3.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': {
+        # Evicts the least recently used entries past MAX_ENTRIES, point it
+        # at a shared backend to share entries and generations between
+        # processes
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'levelup-responses',
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    },
+    'login-throttle': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'levelup-login-throttle',
+    },
+}
+
+
 # Database
 # https://docs.djangoproject.com/en/3.1/ref/settings/#databases
 
+# Run on every SQLite connection as it opens. WAL lets readers carry on
+# while a signup writes, synchronous=NORMAL syncs at checkpoints rather than
+# on every commit (a power cut may lose the last commits, never corrupt the
+# file), busy_timeout waits for the write lock instead of failing with
+# "database is locked", and mmap_size and cache_size (negative is KiB) keep
+# the hot pages in memory
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+}
+
+# Read-only connections can't change the journal or sync modes, WAL is
+# recorded in the file by the primary
+SQLITE_READ_ONLY_PRAGMAS = ('busy_timeout', 'mmap_size', 'cache_size')
+
+
+def sqlite_options(pragmas, transaction_mode='IMMEDIATE'):
+    """OPTIONS of a SQLite database running the given SQLITE_PRAGMAS
+
+    IMMEDIATE transactions take the write lock up front, so a transaction
+    that reads and then writes waits out busy_timeout for the lock instead
+    of failing when another connection wrote in between.
+    """
+    return {
+        'init_command': '; '.join(f'PRAGMA {name}={SQLITE_PRAGMAS[name]}' for name in pragmas),
+        'transaction_mode': transaction_mode,
+    }
+
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        # Keep connections open between requests instead of reconnecting
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': sqlite_options(SQLITE_PRAGMAS),
+    },
+    # The reports read the primary's file over separate read-only
+    # connections, see REPORTS_DATABASE
+    'reports': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': (BASE_DIR / 'db.sqlite3').as_uri() + '?mode=ro',
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': sqlite_options(SQLITE_READ_ONLY_PRAGMAS, transaction_mode=None),
+        'TEST': {
+            'MIRROR': 'default',
+        },
+    },
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('LEVELUP_REPLICA_DATABASE', BASE_DIR / 'replica.sqlite3'),
+        'CONN_MAX_AGE': 60,
+        'OPTIONS': sqlite_options(SQLITE_READ_ONLY_PRAGMAS, transaction_mode=None),
+        'TEST': {
+            'MIRROR': 'default',
+        },
+    },
 }
 
+DATABASE_ROUTERS = ['levelup.replicas.ReplicaRouter']
+
+# Alias the levelupreports tables are read from when no read replica is
+# up to date (levelup.replicas). None reads them from the primary
+REPORTS_DATABASE = 'reports'
+
+
+# Authentication backends, ModelBackend checking passwords on the
+# LOGIN_HASHING pool (levelupapi.login)
+
+AUTHENTICATION_BACKENDS = [
+    'levelupapi.login.HashingPoolBackend',
+]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
@@ -140,3 +311,24 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/3.1/howto/static-files/
 
 STATIC_URL = '/static/'
+
+
+# Logging
+# https://docs.djangoproject.com/en/3.1/topics/logging/
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'levelup.instrumentation': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
@@ -1,10 +1,15 @@
 """Route configuration"""
+from django.conf import settings
 from django.conf.urls import include
 from django.urls import path
 from rest_framework import routers
-from levelupapi.views import register_user, login_user
+from levelupapi.views import register_user, login_user, alogin_user, login_stats, cache_stats
 from levelupapi.views import GameTypes, Games, Events, Profile
 
+# Await login password checks on the event loop under ASGI
+if settings.ASYNC_READ_VIEWS:
+    login_user = alogin_user
+
 router = routers.DefaultRouter(trailing_slash=False)
 router.register(r'gametypes', GameTypes, 'gametype')
 router.register(r'games', Games, 'game')
@@ -16,5 +21,7 @@ urlpatterns = [
     path('', include('levelupreports.urls')),
     path('register', register_user),
     path('login', login_user),
+    path('login/stats', login_stats),
+    path('cache/stats', cache_stats),
     path('api-auth', include('rest_framework.urls', namespace='rest_framework')),
 ] 
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class LevelupapiConfig(AppConfig):
     name = 'levelupapi'
+
+    def ready(self):
+        # Connect the app's signal handlers
+        from levelupapi import signals  # pylint: disable=unused-import,import-outside-toplevel
@@ -0,0 +1,138 @@
+"""Token authentication that loads the authenticated gamer with the token"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+class TokenCache:
+    """In-process LRU cache of authenticated tokens, keyed by token key
+
+    Entries expire after GAMER_TOKEN_CACHE['TIMEOUT'] seconds and the least
+    recently used entry is evicted past GAMER_TOKEN_CACHE['MAX_SIZE']. Local
+    changes to a token, its user or its gamer evict the entry through the
+    signal handlers in levelupapi.signals; other processes keep serving their
+    copy until it expires, so the timeout bounds how stale a token can be.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+
+    @property
+    def options(self):
+        """The cache settings, or None when the cache is disabled"""
+        return getattr(settings, 'GAMER_TOKEN_CACHE', None)
+
+    def get(self, key):
+        """Return the cached token for `key`, or None"""
+        if self.options is None:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            token, expires = entry
+            if expires < time.monotonic():
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return token
+
+    def set(self, token):
+        """Cache an authenticated token"""
+        options = self.options
+        if options is None:
+            return
+
+        with self._lock:
+            self._entries[token.key] = (token, time.monotonic() + options['TIMEOUT'])
+            self._entries.move_to_end(token.key)
+            self._keys_by_user[token.user_id] = token.key
+
+            while len(self._entries) > options['MAX_SIZE']:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key):
+        """Evict a token by key"""
+        with self._lock:
+            self._remove(key)
+
+    def delete_user(self, user_id):
+        """Evict the token belonging to a user"""
+        with self._lock:
+            key = self._keys_by_user.get(user_id)
+            if key is not None:
+                self._remove(key)
+
+    def clear(self):
+        """Evict every token"""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._keys_by_user.pop(entry[0].user_id, None)
+
+
+token_cache = TokenCache()
+
+
+def request_copy(token):
+    """Shallow copies of a cached token, its user and its gamer
+
+    Concurrent requests share the cached instances, so each one gets copies
+    it can change without the others or the cache seeing it.
+    """
+    token = copy.copy(token)
+    user = token.user = copy.copy(token.user)
+    gamer = getattr(user, 'gamer', None)
+    if gamer is not None:
+        user.gamer = copy.copy(gamer)
+    return token
+
+
+class GamerTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication that also loads the user's gamer
+
+    The token, user and gamer come back from a single joined query (or from
+    the token cache) and the gamer is attached to the request as
+    `request.gamer`, so views never have to look it up again.
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+
+        if result is not None:
+            user, token = result
+            request.gamer = getattr(user, 'gamer', None)
+
+        return result
+
+    def authenticate_credentials(self, key):
+        token = token_cache.get(key)
+
+        if token is None:
+            try:
+                token = Token.objects.select_related('user__gamer').get(key=key)
+            except Token.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+            if not token.user.is_active:
+                raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+            token_cache.set(token)
+
+        token = request_copy(token)
+        return (token.user, token)
@@ -0,0 +1,148 @@
+"""Generation-versioned cache of serialized API responses"""
+import hashlib
+import threading
+import time
+from functools import partial
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+# Namespaces every model change may invalidate, see levelupapi.signals
+GAME_TYPES = 'gametypes'
+GAMES = 'games'
+EVENTS = 'events'
+RECOMMENDATIONS = 'recommendations'
+
+
+def registrations(gamer_id):
+    """Namespace of one gamer's event signups, which decide `joined`"""
+    return f"registrations:{gamer_id}"
+
+
+class ResponseCache:
+    """Serialized payloads stored under the generations of their namespaces
+
+    Every key embeds the current generation of each namespace the payload
+    depends on, so invalidating is a matter of bumping a namespace's
+    generation: entries of older generations are never looked up again and
+    age out of the backend, which is the Django cache named by
+    RESPONSE_CACHE['ALIAS'] (LRU eviction with the local memory backend).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def options(self):
+        """The cache settings, or None when the cache is disabled"""
+        return getattr(settings, 'RESPONSE_CACHE', None)
+
+    @property
+    def backend(self):
+        """The Django cache holding generations and payloads"""
+        return caches[self.options['ALIAS']]
+
+    def generations(self, namespaces):
+        """Current generation of each namespace
+
+        A namespace without a stored generation (never used, or evicted)
+        starts at the current time in nanoseconds, past any generation it
+        had before.
+        """
+        keys = [f"generation:{namespace}" for namespace in namespaces]
+        found = self.backend.get_many(keys)
+
+        for key in keys:
+            if key not in found:
+                generation = time.time_ns()
+                if not self.backend.add(key, generation, timeout=None):
+                    generation = self.backend.get(key, generation)
+                found[key] = generation
+
+        return [found[key] for key in keys]
+
+    def key(self, request, namespaces, gamer_id=None):
+        """Cache key of the response to `request` at the current generations"""
+        query = sorted(request.query_params.lists())
+        source = (
+            request.build_absolute_uri(request.path), query, gamer_id,
+            self.generations(namespaces)
+        )
+        return "response:" + hashlib.sha1(repr(source).encode()).hexdigest()
+
+    def get(self, key):
+        """Return the cached entry for `key` or None, counting hits and misses"""
+        entry = self.backend.get(key)
+
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+
+        return entry
+
+    def set(self, key, entry):
+        """Store an entry under `key` for RESPONSE_CACHE['TIMEOUT'] seconds"""
+        self.backend.set(key, entry, timeout=self.options.get('TIMEOUT', 300))
+
+    def bump(self, *namespaces):
+        """Move the namespaces to a new generation"""
+        if self.options is None:
+            return
+
+        for namespace in namespaces:
+            key = f"generation:{namespace}"
+            try:
+                self.backend.incr(key)
+            except ValueError:
+                self.backend.set(key, time.time_ns(), timeout=None)
+
+        if (getattr(settings, 'READ_REPLICAS', None) or {}).get('ALIASES'):
+            # Replicas may serve the old rows for a while yet, see bumped_within()
+            self.backend.set_many(
+                {f"bumped:{namespace}": time.time() for namespace in namespaces}, timeout=None
+            )
+
+    def bumped_within(self, namespaces, seconds):
+        """Whether any of the namespaces was bumped in the last `seconds`
+
+        Only recorded when READ_REPLICAS lists replicas. A payload read from a
+        replica that recently must not be cached under the new generation.
+        """
+        since = time.time() - seconds
+        bumped = self.backend.get_many([f"bumped:{namespace}" for namespace in namespaces])
+        return any(at >= since for at in bumped.values())
+
+    def invalidate(self, *namespaces):
+        """Bump the namespaces now and again once the transaction commits
+
+        The second bump drops anything a concurrent request cached from the
+        old rows between the first bump and the commit.
+        """
+        self.bump(*namespaces)
+        transaction.on_commit(partial(self.bump, *namespaces))
+
+    def stats(self):
+        """Hit and miss counts of this process"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else None,
+            }
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        if self.options is not None:
+            self.backend.clear()
+
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,308 @@
+"""Password checks for /login on a bounded worker pool, behind throttling
+
+Checking a password runs the deliberately slow PBKDF2 hash. hashing_pool
+runs those checks on LOGIN_HASHING['WORKERS'] threads; hashlib releases the
+GIL while hashing, so the checks run in parallel with each other and with
+the Python of other requests. At most QUEUE more checks wait for a worker,
+past that logins are turned away with PoolSaturated rather than piling up
+in every server worker. HashingPoolBackend, listed in AUTHENTICATION_BACKENDS,
+checks passwords there for authenticate() and aauthenticate(), so the async
+login view leaves the event loop free while it waits.
+
+login_throttle counts attempts per client IP and attempts per username since
+its last successful login in the Django cache named by
+LOGIN_THROTTLE['CACHE_ALIAS']. Each attempt is counted before its password
+is hashed and rejected when the count incr() returns is over a limit, so
+concurrent attempts can't all slip under it.
+
+Only the hashing leaves the request's thread; the user is read and any
+upgraded hash saved on it, in the request's transaction.
+"""
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.cache import caches
+from rest_framework.authtoken.models import Token
+
+User = get_user_model()
+
+HASHING_DEFAULTS = {
+    'WORKERS': 4,
+    'QUEUE': 32,
+}
+
+
+class PoolSaturated(Exception):
+    """Every hashing worker is busy and the queue is full"""
+
+
+class HashingPool:
+    """Bounded thread pool for password hashing, with saturation metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._capacity = 0
+        self._running = 0
+        self._waiting = 0
+        self._completed = 0
+        self._rejected = 0
+
+    @property
+    def options(self):
+        """LOGIN_HASHING over HASHING_DEFAULTS"""
+        return {**HASHING_DEFAULTS, **(getattr(settings, 'LOGIN_HASHING', None) or {})}
+
+    def _reserve(self):
+        """Take a slot, starting the pool on first use"""
+        with self._lock:
+            if self._executor is None:
+                options = self.options
+                self._executor = ThreadPoolExecutor(
+                    max_workers=options['WORKERS'], thread_name_prefix='login-hashing'
+                )
+                self._capacity = options['WORKERS'] + options['QUEUE']
+
+            if self._running + self._waiting >= self._capacity:
+                self._rejected += 1
+                raise PoolSaturated
+            self._waiting += 1
+
+    def _call(self, function, args):
+        with self._lock:
+            self._waiting -= 1
+            self._running += 1
+        try:
+            return function(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    def submit(self, function, *args):
+        """Schedule `function(*args)` on the pool
+
+        Raises:
+            PoolSaturated -- When WORKERS + QUEUE calls are already in flight
+
+        Returns:
+            concurrent.futures.Future -- The call's result
+        """
+        self._reserve()
+        return self._executor.submit(self._call, function, args)
+
+    def run(self, function, *args):
+        """Call `function(*args)` on the pool and wait for its result"""
+        return self.submit(function, *args).result()
+
+    async def arun(self, function, *args):
+        """Await `function(*args)` on the pool without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(function, *args))
+
+    def stats(self):
+        """Pool size, calls in flight and calls turned away in this process"""
+        options = self.options
+        with self._lock:
+            return {
+                'workers': options['WORKERS'],
+                'queue': options['QUEUE'],
+                'running': self._running,
+                'waiting': self._waiting,
+                'completed': self._completed,
+                'rejected': self._rejected,
+            }
+
+    def shutdown(self):
+        """Stop the workers and reset the metrics, a new pool starts on the
+        next call"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+        with self._lock:
+            self._completed = 0
+            self._rejected = 0
+
+
+class LoginThrottle:
+    """Fixed-window limits on login attempts per IP and per username
+
+    A username's count covers its attempts since the last successful one.
+    Enabled by the LOGIN_THROTTLE setting; None turns it off.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rejected = {'ip': 0, 'username': 0}
+
+    @property
+    def options(self):
+        """The throttle settings, or None when throttling is off"""
+        return getattr(settings, 'LOGIN_THROTTLE', None)
+
+    @property
+    def backend(self):
+        """The Django cache holding the counts, and nothing else"""
+        return caches[self.options['CACHE_ALIAS']]
+
+    @staticmethod
+    def username_key(username):
+        """Cache key of a username's attempts, alike for any case"""
+        return "login-username:" + hashlib.sha1(username.lower().encode()).hexdigest()
+
+    def attempt(self, username, ip):
+        """Count a login attempt from `ip` for `username`
+
+        Returns:
+            int -- Seconds to wait before trying again when the attempt is
+            over a limit, else None
+        """
+        options = self.options
+        if options is None:
+            return None
+
+        if self._count(f"login-ip:{ip}", options['IP_WINDOW']) > options['IP_ATTEMPTS']:
+            return self._reject('ip', options['IP_WINDOW'])
+        if self._count(self.username_key(username), options['USERNAME_WINDOW']) > options['USERNAME_FAILURES']:
+            return self._reject('username', options['USERNAME_WINDOW'])
+        return None
+
+    def withdraw(self, username, ip):
+        """Take back an attempt from `ip` for `username` that was never
+        checked"""
+        if self.options is None:
+            return
+
+        for key in (f"login-ip:{ip}", self.username_key(username)):
+            try:
+                self.backend.decr(key)
+            except ValueError:
+                pass
+
+    def succeeded(self, username):
+        """Forget the username's attempts"""
+        if self.options is not None:
+            self.backend.delete(self.username_key(username))
+
+    def stats(self):
+        """Attempts rejected by this process, by limit"""
+        with self._lock:
+            return {f'rejected_{limit}': count for limit, count in self._rejected.items()}
+
+    def clear(self):
+        """Reset the counts and metrics"""
+        if self.options is not None:
+            self.backend.clear()
+        with self._lock:
+            for limit in self._rejected:
+                self._rejected[limit] = 0
+
+    def _count(self, key, window):
+        # The window starts with the first count and isn't extended by the rest
+        self.backend.add(key, 0, timeout=window)
+        try:
+            return self.backend.incr(key)
+        except ValueError:
+            # The window ran out between add() and incr()
+            self.backend.set(key, 1, timeout=window)
+            return 1
+
+    def _reject(self, limit, window):
+        with self._lock:
+            self._rejected[limit] += 1
+        return window
+
+
+hashing_pool = HashingPool()
+login_throttle = LoginThrottle()
+
+
+def client_ip(request):
+    """The address a login comes from, as the server sees it"""
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def find_user(username):
+    """The user logging in, with their token, or None"""
+    return (
+        User.objects.select_related('auth_token')
+        .filter(**{User.USERNAME_FIELD: username}).first()
+    )
+
+
+def verify(user, password):
+    """Check a password on a hashing worker, no database access
+
+    Unknown users still cost one hash, so response times don't tell which
+    usernames exist.
+
+    Returns:
+        tuple -- (whether the password matches, the password rehashed with
+        the current hasher when the stored hash is outdated, else None)
+    """
+    if user is None:
+        make_password(password)
+        return False, None
+
+    rehashed = []
+    valid = check_password(password, user.password, lambda raw: rehashed.append(make_password(raw)))
+    return valid, (rehashed[0] if rehashed else None)
+
+
+class HashingPoolBackend(ModelBackend):
+    """ModelBackend checking passwords on hashing_pool
+
+    authenticate() and aauthenticate() raise PoolSaturated when the pool
+    turns the check away.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        user = find_user(username)
+        return self.checked(user, hashing_pool.run(verify, user, password))
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        user = await sync_to_async(find_user)(username)
+        verified = await hashing_pool.arun(verify, user, password)
+        return await sync_to_async(self.checked)(user, verified)
+
+    def checked(self, user, verified):
+        """The user when the check passed and they may log in, else None,
+        saving their upgraded hash"""
+        valid, rehashed = verified
+        if not valid or not self.user_can_authenticate(user):
+            return None
+
+        if rehashed is not None:
+            user.password = rehashed
+            user.save(update_fields=['password'])
+        return user
+
+
+def complete(user, username):
+    """Record an authenticated login and return the user's token key, or
+    None when the login failed"""
+    if user is None:
+        return None
+
+    login_throttle.succeeded(username)
+    try:
+        return user.auth_token.key
+    except Token.DoesNotExist:
+        return Token.objects.create(user=user).key
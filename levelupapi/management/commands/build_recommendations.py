@@ -0,0 +1,29 @@
+"""Command building the game recommendations"""
+import time
+from django.core.management.base import BaseCommand
+from levelupapi import recommendations
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the game recommendations of the gamers whose co-attendance changed, "
+        "or of every gamer with --all"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="rebuild every gamer's recommendations")
+        parser.add_argument('--batch-size', type=int, default=recommendations.BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+
+        if options['all']:
+            stored = recommendations.build(batch_size=options['batch_size'])
+            gamers = "every gamer"
+        else:
+            refreshed, stored = recommendations.refresh_stale(batch_size=options['batch_size'])
+            gamers = f"{refreshed} gamers"
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {stored} recommendations for {gamers} in {time.perf_counter() - start:.2f}s"
+        ))
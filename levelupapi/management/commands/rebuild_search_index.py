@@ -0,0 +1,21 @@
+"""Command rebuilding the games search index"""
+import time
+from django.core.management.base import BaseCommand
+from levelupapi import search
+from levelupapi.models import Game
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text index of game names from scratch (SQLite only)"
+
+    def handle(self, *args, **options):
+        if not search.indexed():
+            self.stdout.write("The database indexes game names itself, nothing to rebuild")
+            return
+
+        start = time.perf_counter()
+        search.rebuild()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {Game.objects.count()} games in {time.perf_counter() - start:.2f}s"
+        ))
@@ -0,0 +1,250 @@
+"""Command bulk-seeding the database with synthetic level up data"""
+import random
+import time
+from datetime import date, time as time_of_day, timedelta
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from rest_framework.authtoken.models import Token
+from levelupapi import recommendations, search
+from levelupapi.cache import response_cache
+from levelupapi.models import Event, EventGamer, Game, Gamer, GameType
+from levelupreports import summary
+
+User = get_user_model()
+
+# Every seeded user can log in with this password
+SEED_PASSWORD = 'levelup'
+
+# Seeded game names are "<adjective> <noun> <number>"
+ADJECTIVES = (
+    'Ancient', 'Arcane', 'Brave', 'Cosmic', 'Crimson', 'Dark', 'Electric', 'Epic',
+    'Forgotten', 'Galactic', 'Golden', 'Hidden', 'Iron', 'Lost', 'Mystic', 'Royal',
+    'Shadow', 'Silent', 'Super', 'Wild'
+)
+NOUNS = (
+    'Adventure', 'Armada', 'Builders', 'Castle', 'Conquest', 'Dungeon', 'Empire',
+    'Frontier', 'Heroes', 'Island', 'Kingdom', 'Legends', 'Monopoly', 'Outpost',
+    'Quest', 'Rally', 'Settlers', 'Tactics', 'Voyage', 'Wizards'
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk create synthetic users, gamers, tokens, game types, games, events and "
+        f"registrations for load testing. Seeded users log in with password '{SEED_PASSWORD}'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--game-types', type=int, default=10)
+        parser.add_argument('--games', type=int, default=2000)
+        parser.add_argument('--events', type=int, default=10000)
+        parser.add_argument('--registrations', type=int, default=50000)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=17, help="random seed, equal seeds give equal data but for the token keys")
+        parser.add_argument(
+            '--skip-reports', action='store_true',
+            help="don't rebuild the report tables afterwards"
+        )
+        parser.add_argument(
+            '--skip-recommendations', action='store_true',
+            help="don't build the game recommendations afterwards"
+        )
+
+    def handle(self, *args, **options):
+        self.check_counts(options)
+        self.verbosity = options['verbosity']
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.total_rows = 0
+        start = time.perf_counter()
+
+        gamers = self.seed_users(options['users'])
+        game_types = self.seed(
+            GameType, options['game_types'],
+            lambda pk, i: GameType(id=pk, name=f"Game type {i}")
+        )
+        games = self.seed(
+            Game, options['games'],
+            lambda pk, i: Game(
+                id=pk,
+                name=f"{self.rng.choice(ADJECTIVES)} {self.rng.choice(NOUNS)} {i}",
+                num_players=self.rng.randint(2, 10),
+                skill_level=self.rng.randint(1, 10),
+                creator_id=self.rng.choice(gamers),
+                game_type_id=self.rng.choice(game_types)
+            )
+        )
+        events = self.seed(
+            Event, options['events'],
+            lambda pk, i: Event(
+                id=pk,
+                date=date(2020, 1, 1) + timedelta(days=self.rng.randrange(730)),
+                time=time_of_day(self.rng.randint(8, 22), self.rng.choice((0, 30))),
+                location=f"Table {self.rng.randint(1, 100)}",
+                creator_id=self.rng.choice(gamers),
+                game_id=self.rng.choice(games)
+            )
+        )
+        self.seed_registrations(gamers, events, options['registrations'])
+
+        # The rows were inserted with explicit ids, which PostgreSQL's
+        # sequences don't follow
+        self.reset_sequences([User, Gamer, GameType, Game, Event])
+
+        # Bulk inserts send no signals to index the games
+        self.timed("search index", search.rebuild)
+
+        if not options['skip_reports']:
+            self.timed("report tables", summary.rebuild)
+
+        if not options['skip_recommendations']:
+            self.timed("recommendations", recommendations.build)
+
+        # Bulk inserts send no signals to invalidate cached responses
+        response_cache.clear()
+
+        elapsed = time.perf_counter() - start
+        self.log(self.style.SUCCESS(
+            f"Seeded {self.total_rows} rows in {elapsed:.1f}s "
+            f"({self.total_rows / elapsed:,.0f} rows/s)"
+        ))
+
+    @staticmethod
+    def check_counts(options):
+        """Refuse counts the seeded rows can't be built from
+
+        Raises:
+            CommandError -- A count is negative, or games or events are
+            asked for without the rows they point to
+        """
+        for name in ('users', 'game_types', 'games', 'events', 'registrations'):
+            if options[name] < 0:
+                raise CommandError(f"--{name.replace('_', '-')} can't be negative")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        needs = {
+            'games': ('users', 'game_types'),
+            'events': ('users', 'games'),
+        }
+        for name, sources in needs.items():
+            for source in sources:
+                if options[name] and not options[source]:
+                    raise CommandError(
+                        f"--{name} needs --{source.replace('_', '-')} above 0 to pick from"
+                    )
+
+    def seed_users(self, count):
+        """Create users with a shared, pre-hashed password, their gamers and tokens
+
+        Returns:
+            list -- Primary keys of the new gamers
+        """
+        password = make_password(SEED_PASSWORD)
+        first_user = self.next_id(User)
+
+        self.seed(
+            User, count,
+            lambda pk, i: User(
+                id=pk,
+                username=f"gamer{pk}@example.com",
+                email=f"gamer{pk}@example.com",
+                password=password,
+                first_name="Gamer",
+                last_name=str(pk)
+            )
+        )
+        gamers = self.seed(
+            Gamer, count,
+            lambda pk, i: Gamer(id=pk, user_id=first_user + i, bio=f"Seeded gamer {i}")
+        )
+        self.insert(Token, (
+            Token(key=Token.generate_key(), user_id=first_user + i)
+            for i in range(count)
+        ))
+
+        return gamers
+
+    def seed_registrations(self, gamers, events, count):
+        """Sign distinct gamers up for events until `count` registrations exist"""
+        per_event, remainder = divmod(count, len(events)) if events else (0, 0)
+
+        def rows():
+            for i, event_id in enumerate(events):
+                attendees = min(per_event + (1 if i < remainder else 0), len(gamers))
+                for gamer_id in self.rng.sample(gamers, attendees):
+                    yield EventGamer(event_id=event_id, gamer_id=gamer_id)
+
+        self.insert(EventGamer, rows())
+
+    def seed(self, model, count, build):
+        """Bulk create `count` instances of a model built by build(pk, i)
+
+        Primary keys are assigned here rather than by the database so the
+        data is the same for every run with the same seed and backend.
+
+        Returns:
+            list -- Primary keys of the new rows
+        """
+        first_id = self.next_id(model)
+        self.insert(model, (build(first_id + i, i) for i in range(count)))
+
+        return list(range(first_id, first_id + count))
+
+    def insert(self, model, instances):
+        """bulk_create instances in batches, each in its own transaction"""
+        label = str(model._meta.verbose_name_plural).lower()
+        start = time.perf_counter()
+        inserted = 0
+        batch = []
+
+        for instance in instances:
+            batch.append(instance)
+            if len(batch) == self.batch_size:
+                inserted += self.flush(model, batch)
+                batch = []
+        inserted += self.flush(model, batch)
+
+        self.total_rows += inserted
+        elapsed = time.perf_counter() - start
+        self.log(
+            f"  {label:<16} {inserted:>10,} rows {elapsed:7.1f}s "
+            f"{inserted / elapsed if elapsed else 0:>12,.0f} rows/s"
+        )
+
+    def flush(self, model, batch):
+        """Insert one batch, returning how many rows it held"""
+        if batch:
+            with transaction.atomic():
+                model.objects.bulk_create(batch, batch_size=self.batch_size)
+        return len(batch)
+
+    @staticmethod
+    def reset_sequences(models):
+        """Move the primary key sequences of `models` past their rows"""
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def timed(self, label, func):
+        """Run func and report how long it took"""
+        start = time.perf_counter()
+        func()
+        self.log(f"  {label:<16} {'':>10}      {time.perf_counter() - start:7.1f}s")
+
+    def log(self, message):
+        """Report progress unless running with --verbosity 0"""
+        if self.verbosity > 0:
+            self.stdout.write(message)
+
+    @staticmethod
+    def next_id(model):
+        """The first primary key after the model's existing rows"""
+        return (model.objects.aggregate(max_id=Max('pk'))['max_id'] or 0) + 1
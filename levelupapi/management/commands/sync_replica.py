@@ -0,0 +1,49 @@
+"""Command copying the primary SQLite database onto a local replica"""
+import os
+import sqlite3
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def copy(primary, path):
+    """Copy the primary's database over the SQLite file at `path` with the
+    online backup API, which retries while readers hold the file"""
+    primary.ensure_connection()
+    target = sqlite3.connect(path)
+    try:
+        primary.connection.backup(target)
+    finally:
+        target.close()
+
+    # levelup.replicas measures a SQLite replica's lag by the file's age
+    os.utime(path)
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database over a SQLite replica, once or every --every "
+        "seconds, to try read replicas locally"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='replica', help="alias of the replica to copy onto")
+        parser.add_argument('--every', type=float, help="keep copying, this many seconds apart")
+
+    def handle(self, *args, **options):
+        primary = connections[DEFAULT_DB_ALIAS]
+        replica = connections[options['database']]
+        if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+            raise CommandError("Only SQLite databases are copied, replicate others with the database's own tools")
+
+        path = str(replica.settings_dict['NAME'])
+        while True:
+            start = time.perf_counter()
+            copy(primary, path)
+            self.stdout.write(self.style.SUCCESS(
+                f"Copied the primary onto {path} in {time.perf_counter() - start:.2f}s"
+            ))
+
+            if options['every'] is None:
+                return
+            time.sleep(options['every'])
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicate_registrations(apps, schema_editor):
+    """Keep the first registration of every (event, gamer) pair so the
+    unique constraint can be created"""
+    EventGamer = apps.get_model('levelupapi', 'EventGamer')
+    db_alias = schema_editor.connection.alias
+
+    duplicates = (
+        EventGamer.objects.using(db_alias)
+        .values('event', 'gamer')
+        .annotate(first_id=Min('id'), registrations=models.Count('id'))
+        .filter(registrations__gt=1)
+    )
+
+    for duplicate in duplicates:
+        EventGamer.objects.using(db_alias).filter(
+            event=duplicate['event'], gamer=duplicate['gamer']
+        ).exclude(id=duplicate['first_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('levelupapi', '0002_event_calendar_index'),
+    ]
+
+    # Build the composite indexes before dropping the single-column foreign
+    # key indexes they replace
+    operations = [
+        migrations.RunPython(remove_duplicate_registrations, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='eventgamer',
+            constraint=models.UniqueConstraint(fields=('event', 'gamer'), name='unique_event_gamer'),
+        ),
+        migrations.AddIndex(
+            model_name='eventgamer',
+            index=models.Index(fields=['gamer', 'event'], name='eventgamer_gamer_event_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['game', 'date'], name='event_game_date_idx'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='game',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='levelupapi.game'),
+        ),
+        migrations.AlterField(
+            model_name='eventgamer',
+            name='event',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='registration', to='levelupapi.event'),
+        ),
+        migrations.AlterField(
+            model_name='eventgamer',
+            name='gamer',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='registration', to='levelupapi.gamer'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:15
+
+import django.db.models.deletion
+import levelupapi.models.game_search_entry
+from django.db import migrations, models
+
+FTS_TOKENIZER = "unicode61 remove_diacritics 2"
+
+
+def create_search_index(apps, schema_editor):
+    """Index game names for levelupapi.search
+
+    SQLite gets the FTS5 table behind GameSearchEntry, with prefix indexes
+    for autocomplete; PostgreSQL gets a GIN index over the names' words,
+    which it maintains itself.
+    """
+    Game = apps.get_model('levelupapi', 'Game')
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE levelupapi_game_fts USING fts5("
+            f"name, tokenize='{FTS_TOKENIZER}', prefix='1 2 3')"
+        )
+        schema_editor.execute("INSERT INTO levelupapi_game_fts (rowid, name) SELECT id, name FROM levelupapi_game")
+
+    elif vendor == 'postgresql':
+        from django.contrib.postgres.indexes import GinIndex
+        from django.contrib.postgres.search import SearchVector
+
+        schema_editor.add_index(Game, GinIndex(SearchVector('name', config='simple'), name='game_name_search_idx'))
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE levelupapi_game_fts")
+
+    elif vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS game_name_search_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('levelupapi', '0004_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameSearchEntry',
+            fields=[
+                ('game', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='levelupapi.game')),
+                ('name', levelupapi.models.game_search_entry.FullTextField()),
+            ],
+            options={
+                'db_table': 'levelupapi_game_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:15
+
+from django.db import migrations
+
+
+def create_trigram_index(apps, schema_editor):
+    """Index the trigrams of game names for fuzzy search on PostgreSQL
+
+    SQLite has no trigram index; its searches only match word prefixes.
+    """
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute(
+            "CREATE INDEX game_name_trigram_idx ON levelupapi_game USING gin (name gin_trgm_ops)"
+        )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS game_name_trigram_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('levelupapi', '0006_game_recommendations'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('levelupapi', '0007_game_name_trigrams'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stalerecommendation',
+            name='registrations_changed',
+            field=models.BooleanField(default=False),
+        ),
+    ]
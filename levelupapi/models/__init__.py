@@ -2,5 +2,8 @@
 from .event import Event
 from .event_gamer import EventGamer
 from .game import Game
+from .game_recommendation import GameRecommendation, StaleRecommendation
+from .game_search_entry import GameSearchEntry
 from .game_type import GameType
 from .gamer import Gamer
+from .bulk import bulk_insert, post_bulk_create
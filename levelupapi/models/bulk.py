@@ -0,0 +1,22 @@
+"""Bulk inserts that still reach the signal handlers"""
+from django.db import transaction
+from django.dispatch import Signal
+
+# Sent with `instances` after bulk_insert(), which sends no post_save
+post_bulk_create = Signal()
+
+
+def bulk_insert(model, instances):
+    """Insert `instances` with one bulk_create and announce them together
+
+    Receivers of post_bulk_create run inside the same transaction as the
+    insert, so their bookkeeping commits or rolls back with the rows.
+
+    Returns:
+        list -- The created instances, with primary keys on backends that
+        return them from bulk inserts
+    """
+    with transaction.atomic():
+        created = model.objects.bulk_create(instances)
+        post_bulk_create.send(sender=model, instances=created)
+    return created
@@ -1,5 +1,65 @@
 """Event Model Module"""
 from django.db import models
+from django.db.models import Count, Exists, F, FloatField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+
+class EventQuerySet(models.QuerySet):
+    """Custom queryset for events"""
+
+    def with_joined(self, gamer):
+        """Annotate each event with whether the given gamer is attending it
+
+        The lookup is a correlated EXISTS subquery, so the attendance flag
+        comes back with the events themselves instead of costing one query
+        per event.
+        """
+        from .event_gamer import EventGamer
+
+        registrations = EventGamer.objects.filter(event=OuterRef('pk'), gamer=gamer)
+        return self.annotate(joined=Exists(registrations))
+
+    def with_attendance(self):
+        """Annotate each event with its attendee count, the spots its game
+        leaves and its fill rate (attendees per spot, None without spots)
+
+        Like `joined`, the count is a correlated subquery in the events query
+        itself, so it is only evaluated for the rows a page returns, can be
+        filtered and sorted on, and is dropped from the paginator's count().
+        """
+        from .event_gamer import EventGamer
+
+        counts = (
+            EventGamer.objects.filter(event=OuterRef('pk'))
+            .order_by().values('event').annotate(count=Count('id')).values('count')
+        )
+        return self.annotate(attendee_count=Coalesce(Subquery(counts), 0)).annotate(
+            spots_left=F('game__num_players') - F('attendee_count'),
+            fill_rate=(
+                Cast('attendee_count', FloatField())
+                / NullIf(Cast('game__num_players', FloatField()), 0.0)
+            )
+        )
+
+    def with_attendees(self, limit):
+        """Prefetch the first `limit` gamers to sign up for each event, with
+        their users, onto `first_attendees`
+
+        The slice is applied per event by a window function in the single
+        prefetch query.
+        """
+        from .event_gamer import EventGamer
+
+        registrations = (
+            EventGamer.objects
+            .select_related('gamer__user')
+            .only('event', 'gamer', 'gamer__user__first_name', 'gamer__user__last_name')
+            .order_by('id')
+        )
+        return self.prefetch_related(
+            Prefetch('registration', queryset=registrations[:limit], to_attr='first_attendees')
+        )
+
 
 class Event(models.Model):
     """Event database model"""
@@ -7,13 +67,30 @@ class Event(models.Model):
     time = models.TimeField(auto_now=False, auto_now_add=False)
     location = models.CharField(max_length=75)
     creator = models.ForeignKey("Gamer", on_delete=models.CASCADE)
-    game = models.ForeignKey("Game", on_delete=models.CASCADE)
+    # Covered by the (game, date) index below
+    game = models.ForeignKey("Game", on_delete=models.CASCADE, db_index=False)
+    # Version stamp for conditional GETs
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = EventQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Supports the calendar ordering used to paginate events
+            models.Index(fields=['date', 'time', 'id'], name='event_calendar_idx'),
+            # Supports finding a game's events by date
+            models.Index(fields=['game', 'date'], name='event_game_date_idx'),
+        ]
 
     @property
     def joined(self):
-        """Non-mapped model property reflecting whether user is attending event"""
-        return self.__joined
+        """Non-mapped model property reflecting whether user is attending event
+
+        Populated by the `joined` annotation from `Event.objects.with_joined()`,
+        None when the event was loaded without it.
+        """
+        return self.__dict__.get('_joined')
 
     @joined.setter
     def joined(self, value):
-        self.__joined = value
+        self.__dict__['_joined'] = value
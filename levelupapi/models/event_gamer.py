@@ -1,7 +1,98 @@
 """EventGamer Model Module"""
-from django.db import models
+from django.db import connections, models
+from django.db.models.signals import post_save
+
+
+class EventGamerQuerySet(models.QuerySet):
+    """Custom queryset for event registrations"""
+
+    def register(self, event_id, gamer, enforce_capacity=False):
+        """Sign a gamer up for an event in a single INSERT ... SELECT
+
+        The SELECT only yields a row when the event exists and, with
+        `enforce_capacity`, when fewer gamers than the game's `num_players`
+        are already registered. Duplicate signups are rejected by the
+        unique (event, gamer) constraint and raise IntegrityError.
+
+        Must be called inside a transaction. On backends with row locks the
+        event row is locked first so concurrent signups for the same event
+        are counted one at a time; SQLite serializes the write itself.
+
+        Returns:
+            EventGamer -- The new registration, or None if the event does
+            not exist or is full
+        """
+        from .event import Event
+        from .game import Game
+
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+
+        if enforce_capacity and connection.features.has_select_for_update:
+            list(Event.objects.using(self.db).select_for_update().filter(pk=event_id).values_list('pk'))
+
+        sql = f"""
+            INSERT INTO {quote(self.model._meta.db_table)} (event_id, gamer_id)
+            SELECT e.id, %s
+            FROM {quote(Event._meta.db_table)} e
+        """
+        params = [gamer.id]
+
+        if enforce_capacity:
+            sql += f"""
+            JOIN {quote(Game._meta.db_table)} game ON game.id = e.game_id
+            WHERE e.id = %s AND (
+                SELECT COUNT(*) FROM {quote(self.model._meta.db_table)} eg
+                WHERE eg.event_id = e.id
+            ) < game.num_players
+            """
+        else:
+            sql += "WHERE e.id = %s"
+        params.append(event_id)
+
+        returning = connection.features.can_return_columns_from_insert
+        if returning:
+            sql += " RETURNING id"
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+            if returning:
+                row = cursor.fetchone()
+                if row is None:
+                    return None
+                registration_id = row[0]
+            else:
+                if cursor.rowcount == 0:
+                    return None
+                registration_id = cursor.lastrowid
+
+        # Let the rest of the app react to the raw insert like it would to save()
+        registration = self.model(id=registration_id, event_id=event_id, gamer=gamer)
+        registration._state.adding = False
+        registration._state.db = self.db
+        post_save.send(
+            sender=self.model, instance=registration, created=True,
+            update_fields=None, raw=False, using=self.db
+        )
+
+        return registration
+
 
 class EventGamer(models.Model):
     """EventGamer Database Model"""
-    gamer = models.ForeignKey("Gamer", on_delete=models.CASCADE, related_name="registration")
-    event = models.ForeignKey("Event", on_delete=models.CASCADE, related_name="registration")
+    # Both foreign keys are covered by the composite indexes below
+    gamer = models.ForeignKey("Gamer", on_delete=models.CASCADE, related_name="registration", db_index=False)
+    event = models.ForeignKey("Event", on_delete=models.CASCADE, related_name="registration", db_index=False)
+
+    objects = EventGamerQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            # A gamer can only sign up for an event once
+            models.UniqueConstraint(fields=['event', 'gamer'], name='unique_event_gamer'),
+        ]
+        indexes = [
+            # Supports looking up every event a gamer is signed up for
+            models.Index(fields=['gamer', 'event'], name='eventgamer_gamer_event_idx'),
+        ]
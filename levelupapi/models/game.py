@@ -8,3 +8,5 @@ class Game(models.Model):
     skill_level = models.IntegerField()
     creator = models.ForeignKey("Gamer", on_delete=models.CASCADE)
     game_type = models.ForeignKey("GameType", on_delete=models.CASCADE)
+    # Version stamp for conditional GETs
+    updated_at = models.DateTimeField(auto_now=True)
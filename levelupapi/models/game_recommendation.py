@@ -0,0 +1,37 @@
+"""GameRecommendation Model Module"""
+from django.db import models
+
+
+class GameRecommendation(models.Model):
+    """A game recommended to a gamer, one of their top few
+
+    Written offline by levelupapi.recommendations and removed along with
+    its gamer or game by the cascading foreign keys.
+    """
+    # Covered by the unique (gamer, rank) constraint below
+    gamer = models.ForeignKey("Gamer", on_delete=models.CASCADE, related_name="+", db_index=False)
+    game = models.ForeignKey("Game", on_delete=models.CASCADE, related_name="recommendations")
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            # Also serves a gamer's recommendations in rank order
+            models.UniqueConstraint(fields=['gamer', 'rank'], name='unique_gamer_recommendation_rank'),
+        ]
+
+
+class StaleRecommendation(models.Model):
+    """A gamer whose co-attendance changed since their recommendations
+    were built, see levelupapi.recommendations.refresh_stale()
+
+    No foreign key constraint: registrations mark their gamer while the
+    gamer itself may be on its way out.
+    """
+    gamer = models.OneToOneField(
+        "Gamer", on_delete=models.DO_NOTHING, db_constraint=False,
+        primary_key=True, related_name="+"
+    )
+    # The gamer's own registrations changed, which makes everyone they
+    # attended events with stale too once the refresh gets to it
+    registrations_changed = models.BooleanField(default=False)
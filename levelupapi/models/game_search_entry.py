@@ -0,0 +1,34 @@
+"""GameSearchEntry Model Module"""
+from django.db import models
+
+
+class FullTextField(models.TextField):
+    """A column of an FTS5 table, searchable with `__match`"""
+
+
+@FullTextField.register_lookup
+class Match(models.Lookup):
+    """FTS5 full-text match, e.g. name__match='"castle"*'"""
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+class GameSearchEntry(models.Model):
+    """A game's name in the levelupapi_game_fts FTS5 table
+
+    The table only exists on SQLite, created by migration 0005 and kept in
+    step with Game by levelupapi.search.
+    """
+    game = models.OneToOneField(
+        "Game", on_delete=models.DO_NOTHING, db_constraint=False,
+        primary_key=True, db_column='rowid', related_name='search_entry'
+    )
+    name = FullTextField()
+
+    class Meta:
+        managed = False
+        db_table = 'levelupapi_game_fts'
@@ -4,3 +4,5 @@ from django.db import models
 class GameType(models.Model):
     """GameType Database Model"""
     name = models.CharField(max_length=30)
+    # Version stamp for conditional GETs
+    updated_at = models.DateTimeField(auto_now=True)
@@ -0,0 +1,257 @@
+"""Offline game recommendations from co-attendance, skill and game type
+
+A gamer's candidates are the games their co-attendees (gamers who attended
+the same events) went to events of, weighted by how many events they
+shared. The counts are a sparse matrix product, attendance x attendance x
+games, which the database computes for a batch of gamers in one grouped
+query. The candidates with the highest counts are then scored with the
+gamer's skill level and game type affinity and the top RECOMMENDED_GAMES
+stored as GameRecommendation rows, which /games/recommended reads in rank
+order.
+
+New and cancelled registrations mark stale their gamers and the attendees of
+their events (see levelupapi.signals). refresh_stale() adds the gamers'
+co-attendees at other events, whose candidates count what the gamers went
+to, and rebuilds only those.
+"""
+import heapq
+from collections import Counter, defaultdict
+from django.db import connection, transaction
+from levelupapi.cache import RECOMMENDATIONS, response_cache
+from levelupapi.models import (
+    Event, EventGamer, Game, GameRecommendation, Gamer, StaleRecommendation
+)
+
+# Recommendations kept per gamer
+RECOMMENDED_GAMES = 20
+
+# Games per gamer with the most co-attendance that are scored
+CANDIDATES = 200
+
+# Gamers scored per pass
+BATCH_SIZE = 250
+
+# How much each signal weighs in a score between 0 and 1
+CO_ATTENDANCE_WEIGHT = 0.6
+GAME_TYPE_WEIGHT = 0.25
+SKILL_WEIGHT = 0.15
+
+# Widest gap between skill levels that still counts as some affinity
+SKILL_SPREAD = 10
+
+# Per (gamer, game): how many events of the game the gamer's co-attendees
+# went to, each co-attendee counted once per event they shared with the
+# gamer, for the CANDIDATES games with the highest counts that the gamer
+# neither created nor went to events of. Shared events and the
+# co-attendees' games are tallied first, so the product only joins the two
+# tallies.
+CO_ATTENDANCE_SQL = """
+    WITH shared AS (
+        SELECT own.gamer_id AS gamer_id, other.gamer_id AS co_attendee_id, COUNT(*) AS events
+        FROM {registrations} own
+        JOIN {registrations} other ON other.event_id = own.event_id AND other.gamer_id <> own.gamer_id
+        WHERE own.gamer_id IN ({gamers})
+        GROUP BY own.gamer_id, other.gamer_id
+    ),
+    played AS (
+        SELECT registration.gamer_id AS gamer_id, event.game_id AS game_id, COUNT(*) AS events
+        FROM {registrations} registration
+        JOIN {events} event ON event.id = registration.event_id
+        WHERE registration.gamer_id IN (SELECT co_attendee_id FROM shared)
+        GROUP BY registration.gamer_id, event.game_id
+    ),
+    known AS (
+        SELECT registration.gamer_id AS gamer_id, event.game_id AS game_id
+        FROM {registrations} registration
+        JOIN {events} event ON event.id = registration.event_id
+        WHERE registration.gamer_id IN ({gamers})
+        UNION
+        SELECT creator_id, id FROM {games} WHERE creator_id IN ({gamers})
+    ),
+    totals AS (
+        SELECT shared.gamer_id AS gamer_id, played.game_id AS game_id,
+            SUM(shared.events * played.events) AS events
+        FROM shared
+        JOIN played ON played.gamer_id = shared.co_attendee_id
+        GROUP BY shared.gamer_id, played.game_id
+    ),
+    candidates AS (
+        SELECT totals.gamer_id, totals.game_id, totals.events, ROW_NUMBER() OVER (
+            PARTITION BY totals.gamer_id ORDER BY totals.events DESC, totals.game_id DESC
+        ) AS position
+        FROM totals
+        LEFT JOIN known ON known.gamer_id = totals.gamer_id AND known.game_id = totals.game_id
+        WHERE known.gamer_id IS NULL
+    )
+    SELECT candidates.gamer_id, game.id, game.skill_level, game.game_type_id, candidates.events
+    FROM candidates
+    JOIN {games} game ON game.id = candidates.game_id
+    WHERE candidates.position <= %s
+"""
+
+
+def co_attendance(gamer_ids):
+    """Co-attendance counts of the candidate games of a batch of gamers
+
+    Returns:
+        dict -- Per gamer id, a list of (game id, skill level, game type id,
+        count) tuples
+    """
+    quote = connection.ops.quote_name
+    sql = CO_ATTENDANCE_SQL.format(
+        registrations=quote(EventGamer._meta.db_table),
+        events=quote(Event._meta.db_table),
+        games=quote(Game._meta.db_table),
+        gamers=', '.join(['%s'] * len(gamer_ids)),
+    )
+
+    candidates = defaultdict(list)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, list(gamer_ids) * 3 + [CANDIDATES])
+        for gamer_id, *candidate in cursor.fetchall():
+            candidates[gamer_id].append(tuple(candidate))
+    return candidates
+
+
+def score(candidates, skill_levels, game_types):
+    """The top RECOMMENDED_GAMES of a gamer's candidates as (score, game id)
+
+    Arguments:
+        candidates -- (game id, skill level, game type id, count) tuples
+        skill_levels -- Skill levels of the games the gamer attended events of
+        game_types -- Counter of the game types of those events
+    """
+    if not candidates:
+        return []
+
+    most_shared = max(count for *_, count in candidates)
+    skill = sum(skill_levels) / len(skill_levels)
+    attended = sum(game_types.values())
+
+    def weigh(candidate):
+        game_id, skill_level, game_type_id, count = candidate
+        return (
+            CO_ATTENDANCE_WEIGHT * count / most_shared
+            + GAME_TYPE_WEIGHT * game_types[game_type_id] / attended
+            + SKILL_WEIGHT * max(0, 1 - abs(skill_level - skill) / SKILL_SPREAD),
+            game_id
+        )
+
+    # Ties go to the newer game
+    return heapq.nlargest(RECOMMENDED_GAMES, map(weigh, candidates))
+
+
+def build_batch(gamer_ids):
+    """Replace the recommendations of a batch of gamers, returning how many
+    were stored"""
+    # Registrations arriving from here on mark their gamers stale again.
+    # Gamers flagged since refresh_stale() added their co-attendees stay
+    # marked until the next refresh adds them
+    StaleRecommendation.objects.filter(gamer_id__in=gamer_ids, registrations_changed=False).delete()
+
+    candidates = co_attendance(gamer_ids)
+
+    skill_levels = defaultdict(list)
+    game_types = defaultdict(Counter)
+    attendance = EventGamer.objects.filter(gamer_id__in=gamer_ids).values_list(
+        'gamer_id', 'event__game__skill_level', 'event__game__game_type_id'
+    )
+    for gamer_id, skill_level, game_type_id in attendance:
+        skill_levels[gamer_id].append(skill_level)
+        game_types[gamer_id][game_type_id] += 1
+
+    recommendations = [
+        GameRecommendation(gamer_id=gamer_id, game_id=game_id, rank=rank, score=round(weight, 6))
+        for gamer_id in gamer_ids
+        for rank, (weight, game_id) in enumerate(
+            score(candidates[gamer_id], skill_levels[gamer_id], game_types[gamer_id]),
+            start=1
+        )
+    ]
+
+    with transaction.atomic():
+        GameRecommendation.objects.filter(gamer_id__in=gamer_ids).delete()
+        GameRecommendation.objects.bulk_create(recommendations)
+
+    return len(recommendations)
+
+
+def build(gamer_ids=None, batch_size=BATCH_SIZE):
+    """Rebuild the recommendations of the given gamers, every gamer by default
+
+    Returns:
+        int -- Recommendations stored
+    """
+    if gamer_ids is None:
+        # Every co-attendee is rebuilt anyway
+        StaleRecommendation.objects.filter(registrations_changed=True).update(registrations_changed=False)
+        gamer_ids = Gamer.objects.order_by('id').values_list('id', flat=True)
+    gamer_ids = list(gamer_ids)
+
+    stored = 0
+    for start in range(0, len(gamer_ids), batch_size):
+        stored += build_batch(gamer_ids[start:start + batch_size])
+
+    response_cache.invalidate(RECOMMENDATIONS)
+    return stored
+
+
+def refresh_stale(batch_size=BATCH_SIZE):
+    """Rebuild the recommendations of the gamers marked stale
+
+    Returns:
+        tuple -- (gamers refreshed, recommendations stored)
+    """
+    mark_co_attendees_stale()
+    gamer_ids = list(
+        StaleRecommendation.objects.order_by('gamer_id').values_list('gamer_id', flat=True)
+    )
+    return len(gamer_ids), build(gamer_ids, batch_size)
+
+
+def mark_stale(event_ids, gamer_ids):
+    """Mark stale the given gamers and the attendees of the given events
+
+    One INSERT ... SELECT, leaving gamers that are already marked alone.
+    The gamers are flagged as having changed their registrations, and
+    refresh_stale() adds everyone they attended other events with, which
+    would make each signup cost more the more events its gamer went to.
+    """
+    if not event_ids or not gamer_ids:
+        return
+
+    quote = connection.ops.quote_name
+    stale = quote(StaleRecommendation._meta.db_table)
+    gamers = ', '.join(['%s'] * len(gamer_ids))
+    sql = f"""
+        INSERT INTO {stale} (gamer_id, registrations_changed)
+        SELECT gamer_id, FALSE FROM {quote(EventGamer._meta.db_table)}
+        WHERE event_id IN ({', '.join(['%s'] * len(event_ids))}) AND gamer_id NOT IN ({gamers})
+        UNION
+        SELECT id, TRUE FROM {quote(Gamer._meta.db_table)}
+        WHERE id IN ({gamers})
+        ON CONFLICT (gamer_id) DO UPDATE SET registrations_changed = TRUE
+        WHERE excluded.registrations_changed
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, list(event_ids) + list(gamer_ids) * 2)
+
+
+def mark_co_attendees_stale():
+    """Mark stale everyone who attended an event with a gamer whose
+    registrations changed, whose candidates count the games that gamer
+    went to, and clear the flags"""
+    quote = connection.ops.quote_name
+    stale = quote(StaleRecommendation._meta.db_table)
+    registrations = quote(EventGamer._meta.db_table)
+    sql = f"""
+        INSERT INTO {stale} (gamer_id, registrations_changed)
+        SELECT DISTINCT other.gamer_id, FALSE
+        FROM {registrations} own
+        JOIN {registrations} other ON other.event_id = own.event_id
+        WHERE own.gamer_id IN (SELECT gamer_id FROM {stale} WHERE registrations_changed)
+        ON CONFLICT DO NOTHING
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(sql)
+        StaleRecommendation.objects.filter(registrations_changed=True).update(registrations_changed=False)
@@ -0,0 +1,48 @@
+"""JSON rendering backed by orjson when it is installed"""
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson under settings.FAST_JSON
+
+    The output is byte for byte what JSONRenderer writes with the default
+    compact, unicode and strict settings; anything else (indented output,
+    other REST_FRAMEWORK JSON settings, values orjson rejects, or orjson not
+    being installed) is rendered by JSONRenderer itself.
+    """
+
+    def fast(self, accepted_media_type, renderer_context):
+        """Whether orjson can reproduce JSONRenderer's output for this render"""
+        return (
+            orjson is not None
+            and getattr(settings, 'FAST_JSON', False)
+            and api_settings.COMPACT_JSON
+            and api_settings.UNICODE_JSON
+            and api_settings.STRICT_JSON
+            and self.get_indent(accepted_media_type, renderer_context or {}) is None
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or not self.fast(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                # Dates and times go through the DRF encoder like they would
+                # with json.dumps
+                option=orjson.OPT_PASSTHROUGH_DATETIME
+            )
+        except (orjson.JSONEncodeError, ValueError):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escaped by JSONRenderer so the output is also valid JavaScript
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -0,0 +1,135 @@
+"""Full-text and prefix search over game names
+
+On SQLite the names are copied into the levelupapi_game_fts FTS5 table
+(GameSearchEntry), kept in step with Game by the signal handlers in
+levelupapi.signals or all at once with rebuild(). On PostgreSQL the names
+are searched through the GIN index over their tsvector, and names within a
+typo or two of the search through the pg_trgm index over the names; the
+database keeps both up to date itself.
+"""
+import re
+from django.db import connection, transaction
+from django.db.models import BooleanField, Case, FloatField, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.db.models.expressions import RawSQL
+from levelupapi.models import GameSearchEntry
+
+# Most matches of one search that are ranked, see search_games()
+SEARCH_LIMIT = 1000
+
+# search_rank of the matches past SEARCH_LIMIT, below any ranked match
+UNRANKED = -1.0
+
+# FTS5 rank is bm25(), where better matches are more negative
+FTS_RANK = '-"levelupapi_game_fts"."rank"'
+
+
+def terms(text):
+    """The words of a search, lower cased"""
+    return re.findall(r'\w+', text.lower())
+
+
+def indexed():
+    """Whether game names are copied into the FTS5 table"""
+    return connection.vendor == 'sqlite'
+
+
+def index_games(games, created=False):
+    """Write the search entries of the given saved games
+
+    Arguments:
+        games -- Saved Game instances
+        created -- The games were just inserted, so have no entries to replace
+    """
+    if not indexed():
+        return
+
+    entries = [GameSearchEntry(game_id=game.pk, name=game.name) for game in games]
+    if created:
+        GameSearchEntry.objects.bulk_create(entries)
+        return
+
+    with transaction.atomic():
+        GameSearchEntry.objects.filter(pk__in=[game.pk for game in games]).delete()
+        GameSearchEntry.objects.bulk_create(entries)
+
+
+def remove_games(game_ids):
+    """Drop the search entries of deleted games"""
+    if indexed():
+        GameSearchEntry.objects.filter(pk__in=game_ids).delete()
+
+
+def rebuild():
+    """Index every game from scratch and merge the index into one segment"""
+    if not indexed():
+        return
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("DELETE FROM levelupapi_game_fts")
+        cursor.execute("INSERT INTO levelupapi_game_fts (rowid, name) SELECT id, name FROM levelupapi_game")
+        cursor.execute("INSERT INTO levelupapi_game_fts (levelupapi_game_fts) VALUES ('optimize')")
+
+        # Without statistics SQLite takes ?type= for the more selective
+        # filter and runs the full-text match once per game of the type
+        cursor.execute("ANALYZE levelupapi_game")
+
+
+def search_games(games, text):
+    """Narrow `games` to those whose name starts a word with every word of
+    `text`, e.g. "tick ri" finds "Ticket to Ride"
+
+    The games are annotated with `search_rank`, higher for better matches.
+    Ranking costs a little for every match, so when more than SEARCH_LIMIT
+    of `games` match, as they do for the first letter or two typed, only the
+    newest SEARCH_LIMIT of them are ranked and the rest are found with the
+    UNRANKED rank, after them.
+
+    On PostgreSQL names whose words are close to the search by trigram
+    similarity match too, so "tiket" finds "Ticket to Ride".
+    """
+    words = terms(text)
+    if not words:
+        return games.annotate(search_rank=Value(0.0)).none()
+
+    if indexed():
+        matches = games.filter(
+            search_entry__name__match=' AND '.join(f'"{word}"*' for word in words)
+        )
+        return matches.annotate(search_rank=newest_ranked(
+            RawSQL(FTS_RANK, ()), matches.order_by('-search_entry__pk')
+        ))
+
+    from django.contrib.postgres.search import (
+        SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+    )
+
+    # Same expression as the game_name_search_idx index
+    vector = SearchVector('name', config='simple')
+    query = SearchQuery(
+        ' & '.join(f'{word}:*' for word in words), search_type='raw', config='simple'
+    )
+    # `text <% name`, answered from the game_name_trigram_idx index
+    similar = RawSQL('%s <%% "levelupapi_game"."name"', (text, ), output_field=BooleanField())
+    matches = games.annotate(search=vector).filter(Q(search=query) | Q(similar))
+    return matches.annotate(search_rank=newest_ranked(
+        SearchRank(vector, query) + TrigramWordSimilarity(text, 'name'), matches.order_by('-pk')
+    ))
+
+
+def newest_ranked(rank, newest):
+    """`rank` for the first SEARCH_LIMIT games of `newest` and UNRANKED for
+    the rest"""
+    # Looked up on the game rather than its search entry, which would turn
+    # the FTS5 join into an outer join MATCH can't run in
+    return Case(
+        When(pk__gte=oldest_of(newest), then=rank),
+        default=Value(UNRANKED),
+        output_field=FloatField()
+    )
+
+
+def oldest_of(newest):
+    """The smallest primary key among the first SEARCH_LIMIT rows of `newest`,
+    0 when it has fewer rows, as a subquery"""
+    return Coalesce(Subquery(newest.values('pk')[SEARCH_LIMIT - 1:SEARCH_LIMIT]), 0)
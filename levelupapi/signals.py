@@ -0,0 +1,132 @@
+"""Signal handlers for the levelupapi app"""
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from levelupapi import recommendations, search
+from levelupapi.authentication import token_cache
+from levelupapi.cache import EVENTS, GAME_TYPES, GAMES, registrations, response_cache
+from levelupapi.models import Event, EventGamer, Game, Gamer, GameType, post_bulk_create
+
+User = get_user_model()
+
+# User fields shown nested in games and events
+SHOWN_USER_FIELDS = {'first_name', 'last_name', 'email'}
+
+
+@receiver([post_save, post_delete], sender=Token)
+def evict_cached_token(sender, instance, **kwargs):
+    """A changed or deleted token must authenticate against the database"""
+    token_cache.delete_user(instance.user_id)
+    token_cache.delete(instance.key)
+
+
+@receiver([post_save, post_delete], sender=User)
+def evict_cached_user(sender, instance, **kwargs):
+    """Drop the cached token of a changed or deleted user"""
+    token_cache.delete_user(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Gamer)
+def evict_cached_gamer(sender, instance, **kwargs):
+    """Drop the cached token of a changed or deleted gamer's user"""
+    token_cache.delete_user(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def touch_user_content(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Move the version stamps and cached payloads of games and events showing a changed user"""
+    if raw or created:
+        return
+    if update_fields is not None and not SHOWN_USER_FIELDS & set(update_fields):
+        return
+
+    now = timezone.now()
+    Game.objects.filter(creator__user=instance).update(updated_at=now)
+    Event.objects.filter(
+        Q(creator__user=instance) | Q(game__creator__user=instance)
+        | Q(registration__gamer__user=instance)
+    ).update(updated_at=now)
+    response_cache.invalidate(GAMES, EVENTS)
+
+
+@receiver([post_save, post_delete], sender=GameType)
+def invalidate_game_type(sender, instance, **kwargs):
+    """Game types are listed on their own and nested in games and events"""
+    response_cache.invalidate(GAME_TYPES, GAMES, EVENTS)
+
+
+@receiver([post_save, post_delete], sender=Game)
+def invalidate_game(sender, instance, **kwargs):
+    """Games are listed on their own and nested in events"""
+    response_cache.invalidate(GAMES, EVENTS)
+
+
+@receiver(post_save, sender=Game)
+def index_game(sender, instance, created, update_fields=None, **kwargs):
+    """Keep a saved game findable by its current name"""
+    if update_fields is None or 'name' in update_fields:
+        search.index_games([instance], created=created)
+
+
+@receiver(post_delete, sender=Game)
+def unindex_game(sender, instance, **kwargs):
+    """Deleted games drop out of search results"""
+    search.remove_games([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=Event)
+def invalidate_event(sender, instance, **kwargs):
+    """Events are only shown by the events endpoints"""
+    response_cache.invalidate(EVENTS)
+
+
+@receiver([post_save, post_delete], sender=EventGamer)
+def invalidate_registration(sender, instance, **kwargs):
+    """A signup changes the event's attendance and `joined` for the gamer"""
+    response_cache.invalidate(EVENTS, registrations(instance.gamer_id))
+
+
+@receiver([post_save, post_delete], sender=EventGamer)
+def stale_recommendations(sender, instance, **kwargs):
+    """A signup or cancellation changes who the event's attendees attended
+    events with, and which games the gamer's co-attendees saw them play,
+    which only the refresh looks up"""
+    recommendations.mark_stale([instance.event_id], [instance.gamer_id])
+
+
+@receiver(post_bulk_create, sender=Game)
+def invalidate_games(sender, instances, **kwargs):
+    """A batch of games shows up like a single saved game"""
+    response_cache.invalidate(GAMES, EVENTS)
+
+
+@receiver(post_bulk_create, sender=Game)
+def index_games(sender, instances, **kwargs):
+    """A batch of games is searchable like a single saved game"""
+    search.index_games(instances, created=True)
+
+
+@receiver(post_bulk_create, sender=Event)
+def invalidate_events(sender, instances, **kwargs):
+    """A batch of events shows up like a single saved event"""
+    response_cache.invalidate(EVENTS)
+
+
+@receiver(post_bulk_create, sender=EventGamer)
+def invalidate_registrations(sender, instances, **kwargs):
+    """A batch of signups changes the events' attendance and `joined` for
+    each gamer in it"""
+    gamer_ids = {instance.gamer_id for instance in instances}
+    response_cache.invalidate(EVENTS, *(registrations(gamer_id) for gamer_id in gamer_ids))
+
+
+@receiver(post_bulk_create, sender=EventGamer)
+def stale_batch_recommendations(sender, instances, **kwargs):
+    """A batch of signups changes co-attendance like single signups do"""
+    recommendations.mark_stale(
+        {instance.event_id for instance in instances},
+        {instance.gamer_id for instance in instances}
+    )
@@ -1,5 +1,6 @@
 """Views Package"""
-from .auth import login_user, register_user
+from .auth import login_user, alogin_user, login_stats, register_user
+from .caching import cache_stats
 from .gametype import GameTypes
 from .game import Games
 from .event import Events
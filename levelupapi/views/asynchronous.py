@@ -0,0 +1,98 @@
+"""Async read views for ASGI deployments
+
+With settings.ASYNC_READ_VIEWS on, a ViewSet using AsyncViewSetMixin that
+defines an `a<action>` coroutine for an action (alist for list, aretrieve for
+retrieve) is routed as an async view. Those requests are answered on the
+event loop; the ViewSet's other actions run in the request's worker thread
+like any sync view served over ASGI. Keep the setting off under WSGI, where
+every async view costs an event loop per request.
+
+Django's async ORM methods (acount(), aget(), ...) all hop to the request's
+one worker thread, so awaiting several of them together still runs the
+queries one after another. `concurrently` gives each independent query a
+worker thread and database connection of its own instead.
+"""
+import asyncio
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.utils.decorators import classonlymethod
+
+
+def in_transaction():
+    """Whether this thread has a transaction open on any database"""
+    return any(conn.in_atomic_block for conn in connections.all(initialized_only=True))
+
+
+def isolated(call):
+    """`call` for a worker thread, recycling the thread's connections after
+    it like a request would"""
+    def run():
+        try:
+            return call()
+        finally:
+            close_old_connections()
+    return run
+
+
+async def concurrently(*calls):
+    """Run blocking calls that each make their own queries at the same time
+
+    Inside a transaction, e.g. under TestCase, every call has to use the
+    request's connection to see its writes, so the calls run one after
+    another on the request's thread instead.
+
+    Returns:
+        list -- The calls' results, in order
+    """
+    if await sync_to_async(in_transaction)():
+        return [await sync_to_async(call)() for call in calls]
+
+    return await asyncio.gather(*(
+        sync_to_async(isolated(call), thread_sensitive=False)() for call in calls
+    ))
+
+
+class AsyncViewSetMixin:
+    """Routes a ViewSet as an async view under settings.ASYNC_READ_VIEWS"""
+    async_dispatch = False
+
+    @classonlymethod
+    def as_view(cls, actions=None, **initkwargs):
+        actions = actions or {}
+        has_async_action = any(hasattr(cls, f'a{action}') for action in actions.values())
+        if not (getattr(settings, 'ASYNC_READ_VIEWS', False) and has_async_action):
+            return super().as_view(actions, **initkwargs)
+
+        # dispatch() returns a coroutine, which Django awaits once the view
+        # is marked as one
+        view = super().as_view(actions, async_dispatch=True, **initkwargs)
+        return markcoroutinefunction(view)
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.async_dispatch:
+            return self.adispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        """APIView.dispatch() awaiting the action's `a<action>` coroutine"""
+        action = self.action_map.get(request.method.lower(), None)
+        handler = getattr(self, f'a{action}', None) if action is not None else None
+        if handler is None:
+            return await sync_to_async(super().dispatch)(request, *args, **kwargs)
+
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            # Authentication may look the token up
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
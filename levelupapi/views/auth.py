@@ -1,18 +1,53 @@
 """Authentication Module"""
 import json
+from asgiref.sync import sync_to_async
 from django.http import HttpResponse
-from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth import aauthenticate, authenticate, get_user_model
 from rest_framework import status
 from rest_framework.authtoken.models import Token
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
 from django.views.decorators.csrf import csrf_exempt
+from levelupapi.login import PoolSaturated, client_ip, complete, hashing_pool, login_throttle
 from levelupapi.models import Gamer
 
 User = get_user_model()
 
+def login_response(token_key):
+    """Respond to a checked login with the token, or as invalid when None"""
+    if token_key is not None:
+        data = json.dumps({ "valid": True, "token": token_key })
+    else:
+        data = json.dumps({ "valid": False })
+    return HttpResponse(data, content_type='application/json')
+
+def rejected_response(message, status_code, retry_after):
+    """Turn a login away before checking its password"""
+    data = json.dumps({ "valid": False, "message": message })
+    response = HttpResponse(data, content_type='application/json', status=status_code)
+    response['Retry-After'] = str(retry_after)
+    return response
+
+def throttled(wait):
+    """Response to a login over the LOGIN_THROTTLE limits"""
+    return rejected_response(
+        'Too many login attempts, try again later.', status.HTTP_429_TOO_MANY_REQUESTS, wait
+    )
+
+def busy():
+    """Response to a login arriving while the hashing pool is saturated"""
+    return rejected_response(
+        'Too many logins at once, try again shortly.', status.HTTP_503_SERVICE_UNAVAILABLE, 1
+    )
+
 @csrf_exempt
 def login_user(request):
     """Handle the authentication of a Gamer
 
+    The password is checked on the hashing pool by HashingPoolBackend, see
+    levelupapi.login
+
     Method arguments:
         request -- The full HTTP request object
     """
@@ -21,22 +56,65 @@ def login_user(request):
 
     # If the request is an HTTP POST, pull out relevant information
     if request.method == 'POST':
+        username = req_body['username']
+        password = req_body['password']
 
-        # verify using the builtin authenticate method
+        # Floods are turned away before any hashing
+        ip = client_ip(request)
+        wait = login_throttle.attempt(username, ip)
+        if wait is not None:
+            return throttled(wait)
+
+        try:
+            user = authenticate(request, username=username, password=password)
+        except PoolSaturated:
+            login_throttle.withdraw(username, ip)
+            return busy()
+
+        # Respond with the token, or as invalid when the credentials did not
+        # match an existing user
+        return login_response(complete(user, username))
+
+@csrf_exempt
+async def alogin_user(request):
+    """login_user for ASGI deployments, awaiting the password check so the
+    event loop keeps serving other requests
+
+    Method arguments:
+        request -- The full HTTP request object
+    """
+
+    req_body = json.loads(request.body.decode())
+
+    if request.method == 'POST':
         username = req_body['username']
         password = req_body['password']
-        authenticated_user = authenticate(username=username, password=password)
-
-        # If authentication successful, respond with the token
-        if authenticated_user is not None:
-            token = Token.objects.get(user=authenticated_user)
-            data = json.dumps({ "valid": True, "token": token.key })
-            return HttpResponse(data, content_type='application/json')
-
-        # Credentials did not match existing user, cannot log user in
-        else:
-            data = json.dumps({ "valid": False })
-            return HttpResponse(data, content_type='application/json')
+
+        ip = client_ip(request)
+        wait = await sync_to_async(login_throttle.attempt)(username, ip)
+        if wait is not None:
+            return throttled(wait)
+
+        try:
+            user = await aauthenticate(request, username=username, password=password)
+        except PoolSaturated:
+            await sync_to_async(login_throttle.withdraw)(username, ip)
+            return busy()
+
+        return login_response(await sync_to_async(complete)(user, username))
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def login_stats(request):
+    """Report the hashing pool's saturation and the throttled logins of this process
+
+    Returns:
+        Response -- JSON object with the hashing and throttle metrics
+    """
+    return Response({
+        'hashing': hashing_pool.stats(),
+        'throttle': login_throttle.stats(),
+    })
 
 @csrf_exempt
 def register_user(request):
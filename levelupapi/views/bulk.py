@@ -0,0 +1,214 @@
+"""Batch creation of games and events and batch event signup
+
+Every item of a batch is validated and its foreign keys resolved with one
+in_bulk() query per model before anything is written. A batch is all or
+nothing: when any item fails, nothing is inserted and the response lists
+each item's problem, with 424 Failed Dependency on the items that were
+fine. Otherwise all rows go in with one bulk_create in a single transaction.
+"""
+from collections import Counter
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count
+from rest_framework import serializers, status
+from rest_framework.response import Response
+from levelupapi.models import Event, EventGamer, Game, GameType, bulk_insert
+
+# Largest batch one request may carry
+MAX_ITEMS = 5000
+
+
+class GameItemSerializer(serializers.Serializer):
+    """One game of a POST /games/bulk batch"""
+    name = serializers.CharField(max_length=100)
+    numPlayers = serializers.IntegerField(source='num_players')
+    skillLevel = serializers.IntegerField(source='skill_level')
+    gameTypeId = serializers.IntegerField(source='game_type_id')
+
+
+class EventItemSerializer(serializers.Serializer):
+    """One event of a POST /events/bulk batch"""
+    gameId = serializers.IntegerField(source='game_id')
+    date = serializers.DateField()
+    time = serializers.TimeField()
+    location = serializers.CharField(max_length=75)
+
+
+class SignupItemSerializer(serializers.Serializer):
+    """One signup of a POST /events/signup/bulk batch"""
+    eventId = serializers.IntegerField(source='event_id')
+
+
+def failed(code, message):
+    """Result of an item that stopped the batch"""
+    return {'status': code, 'message': message}
+
+
+def batch_response(results, created=None):
+    """Respond with per-item results
+
+    Arguments:
+        results -- One failure dict or None per item
+        created -- The created instances when the batch went in
+    """
+    if created is not None:
+        return Response(
+            {'results': [{'status': status.HTTP_201_CREATED, 'id': item.id} for item in created]},
+            status=status.HTTP_201_CREATED
+        )
+
+    not_created = failed(status.HTTP_424_FAILED_DEPENDENCY, 'Not created, other items failed.')
+    return Response(
+        {'results': [result or not_created for result in results]},
+        status=status.HTTP_400_BAD_REQUEST
+    )
+
+
+def validated_items(request, item_serializer):
+    """Validate the batch in the request body
+
+    Returns:
+        tuple -- (validated items, None), or (None, error Response)
+    """
+    items = request.data
+    if not isinstance(items, list) or not items:
+        return None, Response(
+            {'message': 'Expected a non-empty list of items.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(items) > MAX_ITEMS:
+        return None, Response(
+            {'message': f'A batch holds at most {MAX_ITEMS} items.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    serializer = item_serializer(data=items, many=True)
+    if not serializer.is_valid():
+        errors = serializer.errors
+        if not isinstance(errors, dict):
+            errors = dict(enumerate(errors))
+        # Newer DRF reports only the invalid items, keyed by index
+        results = [
+            {'status': status.HTTP_400_BAD_REQUEST, 'errors': errors[index]} if errors.get(index) else None
+            for index in range(len(items))
+        ]
+        return None, batch_response(results)
+
+    return serializer.validated_data, None
+
+
+def create_games(request):
+    """Create a batch of games for the requesting gamer
+
+    Returns:
+        Response -- Per-item results, 201 when every game was created
+    """
+    items, error = validated_items(request, GameItemSerializer)
+    if error is not None:
+        return error
+
+    game_types = GameType.objects.in_bulk({item['game_type_id'] for item in items})
+    results = [
+        None if item['game_type_id'] in game_types
+        else failed(status.HTTP_404_NOT_FOUND, 'Game type does not exist.')
+        for item in items
+    ]
+    if any(results):
+        return batch_response(results)
+
+    games = bulk_insert(Game, [Game(creator=request.gamer, **item) for item in items])
+    return batch_response(results, games)
+
+
+def create_events(request):
+    """Create a batch of events organized by the requesting gamer
+
+    Returns:
+        Response -- Per-item results, 201 when every event was created
+    """
+    items, error = validated_items(request, EventItemSerializer)
+    if error is not None:
+        return error
+
+    games = Game.objects.only('id').in_bulk({item['game_id'] for item in items})
+    results = [
+        None if item['game_id'] in games
+        else failed(status.HTTP_404_NOT_FOUND, 'Game does not exist.')
+        for item in items
+    ]
+    if any(results):
+        return batch_response(results)
+
+    events = bulk_insert(Event, [Event(creator=request.gamer, **item) for item in items])
+    return batch_response(results, events)
+
+
+def signup(request):
+    """Sign the requesting gamer up for a batch of events
+
+    The body is a list of {"eventId": ...} items. An item fails the batch
+    for the same reasons a single signup would: a missing event, an existing
+    signup (or the same event twice) or, with ENFORCE_EVENT_CAPACITY, a full
+    event.
+
+    Returns:
+        Response -- Per-item results, 201 when every signup was created
+    """
+    items, error = validated_items(request, SignupItemSerializer)
+    if error is not None:
+        return error
+    event_ids = [item['event_id'] for item in items]
+
+    gamer = request.gamer
+    enforce_capacity = settings.ENFORCE_EVENT_CAPACITY
+
+    try:
+        with transaction.atomic():
+            events = Event.objects.select_related('game').only('id', 'game', 'game__num_players')
+            if enforce_capacity and connection.features.has_select_for_update:
+                # Counted one batch at a time like single signups
+                events = events.select_for_update()
+            events = events.in_bulk(set(event_ids))
+
+            joined = set(
+                EventGamer.objects.filter(gamer=gamer, event_id__in=events)
+                .values_list('event_id', flat=True)
+            )
+            attendees = Counter()
+            if enforce_capacity:
+                attendees.update(dict(
+                    EventGamer.objects.filter(event_id__in=events)
+                    .values('event_id').annotate(count=Count('id'))
+                    .values_list('event_id', 'count')
+                ))
+
+            results = []
+            for event_id in event_ids:
+                event = events.get(event_id)
+                if event is None:
+                    results.append(failed(status.HTTP_404_NOT_FOUND, 'Event does not exist.'))
+                elif event_id in joined:
+                    results.append(failed(
+                        status.HTTP_422_UNPROCESSABLE_ENTITY, 'Gamer already signed up for this event.'
+                    ))
+                elif enforce_capacity and attendees[event_id] >= event.game.num_players:
+                    results.append(failed(status.HTTP_422_UNPROCESSABLE_ENTITY, 'Event is full.'))
+                else:
+                    results.append(None)
+                    joined.add(event_id)
+                    attendees[event_id] += 1
+
+            if any(results):
+                return batch_response(results)
+
+            registrations = bulk_insert(
+                EventGamer, [EventGamer(event_id=event_id, gamer=gamer) for event_id in event_ids]
+            )
+    except IntegrityError:
+        # A concurrent signup got in first
+        return Response(
+            {'message': 'Gamer already signed up for one of these events.'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+
+    return batch_response(results, registrations)
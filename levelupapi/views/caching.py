@@ -0,0 +1,110 @@
+"""Response caching for the level up ViewSets"""
+from functools import wraps
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.utils.cache import get_conditional_response
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from levelup import replicas
+from levelupapi.cache import registrations, response_cache
+
+# Headers replayed with a cached payload
+CACHED_HEADERS = ('ETag', 'Cache-Control')
+
+
+def cache_key(request, namespaces, per_gamer):
+    """The response cache key of a GET request and the namespaces it uses"""
+    scopes = list(namespaces)
+    gamer_id = None
+    if per_gamer:
+        gamer_id = request.gamer.id
+        scopes.append(registrations(gamer_id))
+
+    return response_cache.key(request, scopes, gamer_id), scopes
+
+
+def cached_response(request, key):
+    """The cached response for `key`, or None on a miss"""
+    entry = response_cache.get(key)
+    if entry is None:
+        return None
+
+    data, headers = entry
+    response = Response(data, headers=headers)
+    response['X-Cache'] = 'HIT'
+    return get_conditional_response(
+        request, etag=headers.get('ETag'), response=response
+    )
+
+
+def store(key, response, scopes):
+    """Cache a view's response when it is a serialized payload
+
+    A payload read from a replica is left uncached while the replica may
+    still lag behind a recent change to one of its namespaces.
+    """
+    stale = replicas.reading_from_replica.get() and response_cache.bumped_within(
+        scopes, replicas.options()['MAX_LAG_SECONDS']
+    )
+    if response.status_code == 200 and isinstance(response, Response) and not stale:
+        headers = {
+            header: response[header]
+            for header in CACHED_HEADERS if response.has_header(header)
+        }
+        response_cache.set(key, (response.data, headers))
+    response['X-Cache'] = 'MISS'
+
+
+def cached(*namespaces, per_gamer=False):
+    """Serve a GET view's serialized payload from the response cache
+
+    The entry is keyed by the URL, its query parameters and the generations
+    of `namespaces`; `per_gamer` views also key on the requesting gamer and
+    the generation of their signups, so `joined` is never served stale. Hits
+    skip the view entirely and still answer If-None-Match with 304. Responses
+    carry an X-Cache header of HIT or MISS. Works on async views too.
+    """
+    def decorator(method):
+        if iscoroutinefunction(method):
+            @wraps(method)
+            async def async_wrapper(self, request, *args, **kwargs):
+                if request.method != 'GET' or response_cache.options is None:
+                    return await method(self, request, *args, **kwargs)
+
+                # The key reads the namespaces' generations from the cache
+                key, scopes = await sync_to_async(cache_key)(request, namespaces, per_gamer)
+                response = await sync_to_async(cached_response)(request, key)
+                if response is not None:
+                    return response
+
+                response = await method(self, request, *args, **kwargs)
+                await sync_to_async(store)(key, response, scopes)
+                return response
+            return async_wrapper
+
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method != 'GET' or response_cache.options is None:
+                return method(self, request, *args, **kwargs)
+
+            key, scopes = cache_key(request, namespaces, per_gamer)
+            response = cached_response(request, key)
+            if response is not None:
+                return response
+
+            response = method(self, request, *args, **kwargs)
+            store(key, response, scopes)
+            return response
+        return wrapper
+    return decorator
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def cache_stats(request):
+    """Report the response cache's hit and miss counts for this process
+
+    Returns:
+        Response -- JSON object with hits, misses and hit_rate
+    """
+    return Response(response_cache.stats())
@@ -0,0 +1,112 @@
+"""Helpers for loading the relations a serializer will walk up front"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework.serializers import BaseSerializer, ListSerializer, RelatedField
+
+
+def related_lookups(serializer, model):
+    """Derive the joins needed to render `serializer` for instances of `model`
+
+    Every nested serializer whose source is a relation on the model becomes
+    either a select_related path (forward foreign keys and one-to-ones) or a
+    Prefetch (reverse and many-to-many relations). Nested serializers inside
+    a prefetched relation are planned against the related model in turn.
+
+    Returns:
+        tuple -- (select_related paths, Prefetch objects)
+    """
+    select = []
+    prefetch = []
+
+    for field in serializer.fields.values():
+        if not isinstance(field, BaseSerializer) or field.source == '*':
+            continue
+
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            continue
+
+        if not model_field.is_relation:
+            continue
+
+        child = field.child if isinstance(field, ListSerializer) else field
+        related_model = model_field.related_model
+        nested_select, nested_prefetch = related_lookups(child, related_model)
+
+        if model_field.many_to_one or model_field.one_to_one:
+            select.append(field.source)
+            select.extend(f'{field.source}__{path}' for path in nested_select)
+            prefetch.extend(
+                Prefetch(f'{field.source}__{lookup.prefetch_through}', queryset=lookup.queryset)
+                for lookup in nested_prefetch
+            )
+        else:
+            queryset = related_model.objects.select_related(*nested_select)
+            queryset = queryset.prefetch_related(*nested_prefetch)
+            prefetch.append(Prefetch(field.source, queryset=queryset))
+
+    return select, prefetch
+
+
+def loaded_fields(serializer, model):
+    """The columns `serializer` reads from `model` and its joined relations
+
+    Returns:
+        list -- Field paths for QuerySet.only(), or None when a relation is
+            prefetched and every column has to be loaded
+    """
+    paths = []
+
+    for field in serializer.fields.values():
+        if field.source == '*':
+            continue
+
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            # Properties and annotations, e.g. Event.joined
+            continue
+
+        if isinstance(field, BaseSerializer):
+            if isinstance(field, ListSerializer) or not model_field.concrete:
+                return None
+            nested = loaded_fields(field, model_field.related_model)
+            if nested is None:
+                return None
+            paths.append(field.source)
+            paths.extend(f'{field.source}__{path}' for path in nested)
+        elif model_field.concrete or isinstance(field, RelatedField):
+            paths.append(field.source)
+
+    return paths
+
+
+def eager_load(queryset, serializer, include=()):
+    """Apply the joins `serializer` needs to `queryset`
+
+    Given a serializer instance, which may have been pruned by ?fields=, only
+    the columns it renders are loaded.
+
+    Arguments:
+        queryset -- The queryset that will be handed to the serializer
+        serializer -- A serializer class or instance
+        include -- More fields to load, e.g. the ones pagination orders by
+    """
+    trim = not isinstance(serializer, type)
+    if not trim:
+        serializer = serializer()
+
+    select, prefetch = related_lookups(serializer, queryset.model)
+
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+
+    if trim:
+        fields = loaded_fields(serializer, queryset.model)
+        if fields is not None:
+            queryset = queryset.only(*fields, *include)
+
+    return queryset
@@ -1,17 +1,123 @@
 """View module for handling requests about events"""
+from datetime import date, datetime, timedelta
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from rest_framework import status, serializers
+from django.db import IntegrityError, transaction
+from django.db.models import Count, OuterRef, Subquery
+from rest_framework import exceptions, status, serializers
 from rest_framework.viewsets import ViewSet
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from levelupapi.cache import EVENTS, RECOMMENDATIONS
 from levelupapi.models import Game, Event, Gamer, EventGamer
+from levelupapi.views import bulk
+from levelupapi.views.asynchronous import AsyncViewSetMixin
+from levelupapi.views.caching import cached
+from levelupapi.views.conditional import conditional
+from levelupapi.views.eager_loading import eager_load
 from levelupapi.views.game import GameSerializer
+from levelupapi.views.pagination import EventCursorPagination, PaginatedViewSetMixin
+from levelupapi.views.params import boolean, query_value
+from levelupapi.views.sparse import SparseFieldsMixin
 
 User = get_user_model()
 
-class Events(ViewSet):
+# Most attendees ?attendees= can list per event
+MAX_ATTENDEES = 10
+
+# Fields read from Event.objects.with_attendance()
+ATTENDANCE_FIELDS = {'attendee_count', 'spots_left'}
+
+# Upcoming events listed by /events/recommended
+RECOMMENDED_EVENTS = 20
+
+# Sort orders ?ordering= can pick for limit/offset pages of events
+EVENT_ORDERINGS = {
+    'fill_rate': ('fill_rate', 'date', 'time', 'id'),
+    '-fill_rate': ('-fill_rate', 'date', 'time', 'id'),
+}
+
+def filter_events(events, request):
+    """Apply the events filters in the query string
+
+    `events` must be annotated by Event.objects.with_joined(). The date
+    window is a range scan of the (date, time, id) calendar index.
+    """
+
+    # Support filtering events by game, e.g.:
+    #   http://localhost:8000/events?gameId=1
+    game = query_value(request, 'gameId', int)
+    if game is not None:
+        events = events.filter(game__id=game)
+
+    # Support filtering events by a window of dates, e.g.:
+    #   http://localhost:8000/events?from=2020-11-01&to=2020-11-30
+    start = query_value(request, 'from', date.fromisoformat)
+    if start is not None:
+        events = events.filter(date__gte=start)
+    end = query_value(request, 'to', date.fromisoformat)
+    if end is not None:
+        events = events.filter(date__lte=end)
+
+    # Support filtering events by their organizer, e.g.:
+    #   http://localhost:8000/events?creator=1
+    creator = query_value(request, 'creator', int)
+    if creator is not None:
+        events = events.filter(creator__id=creator)
+
+    # Support filtering events by whether the gamer signed up, e.g.:
+    #   http://localhost:8000/events?joined=true
+    joined = query_value(request, 'joined', boolean)
+    if joined is not None:
+        events = events.filter(joined=joined)
+
+    return events
+
+def month_range(value):
+    """The first days of a month such as 2020-11 and of the month after it
+
+    Raises:
+        ValueError -- The value is not a month, or is the last month dates go to
+    """
+    month = datetime.strptime(value, '%Y-%m').date()
+    try:
+        return month, (month + timedelta(days=31)).replace(day=1)
+    except OverflowError:
+        raise ValueError(value)
+
+def attendee_limit(request):
+    """How many attendees ?attendees= asks to list per event, 0 for none"""
+    try:
+        limit = int(request.query_params.get('attendees', 0))
+    except ValueError:
+        return 0
+    return max(0, min(limit, MAX_ATTENDEES))
+
+def event_version(view, request, pk=None):
+    """Version stamp of an event, its game and game type, its attendance and
+    the gamer's signup
+
+    Registration ids only grow, so with the attendee count the newest one
+    tells a cancellation followed by another signup apart from no change.
+    Name changes of creators and attendees touch the events' updated_at, see
+    levelupapi.signals
+    """
+    newest_registration = EventGamer.objects.filter(event=OuterRef('pk')).order_by('-id').values('id')[:1]
+    try:
+        return Event.objects.with_joined(request.gamer).with_attendance().filter(pk=pk).annotate(
+            newest_registration=Subquery(newest_registration)
+        ).values_list(
+            'updated_at', 'game__updated_at', 'game__game_type__updated_at', 'joined',
+            'attendee_count', 'newest_registration'
+        ).first()
+    except ValueError:
+        return None
+
+class Events(AsyncViewSetMixin, PaginatedViewSetMixin, ViewSet):
     """Level up events"""
+    cursor_pagination_class = EventCursorPagination
+    ordering = EventCursorPagination.ordering
 
     def create(self, request):
         """Handle POST operations for events
@@ -19,7 +125,7 @@ class Events(ViewSet):
         Returns
             Response -- JSON serialized event instance
         """
-        creator = Gamer.objects.get(user=request.auth.user)
+        creator = request.gamer
         game = Game.objects.get(pk=request.data['gameId'])
 
         event = Event()
@@ -36,36 +142,47 @@ class Events(ViewSet):
         except ValidationError as ex:
             return Response({'reason': ex.message}, status=status.HTTP_400_BAD_REQUEST)
 
+    @cached(EVENTS, per_gamer=True)
+    @conditional(event_version)
     def retrieve(self, request, pk=None):
         """Handle GET requests for single event
 
         Returns:
-            Response -- JSON serialized game instance
+            Response -- JSON serialized game instance, or 304 when unchanged
         """
-        gamer = Gamer.objects.get(user=request.auth.user)
+        gamer = request.gamer
 
         try:
-            event = Event.objects.get(pk=pk)
+            serializer = EventSerializer(context={'request': request})
+            events = eager_load(Event.objects.with_joined(gamer), serializer)
+            if ATTENDANCE_FIELDS & set(serializer.fields):
+                events = events.with_attendance()
+            limit = attendee_limit(request)
+            if limit:
+                events = events.with_attendees(limit)
+            event = events.get(pk=pk)
         except Event.DoesNotExist:
             return Response({'message': 'No event with given id found.'}, status=status.HTTP_404_NOT_FOUND)
-        
-        event.joined = None
-        try:
-            EventGamer.objects.get(event=event, gamer=gamer)
-            event.joined = True
-        except EventGamer.DoesNotExist:
-            event.joined = False
 
         serializer = EventSerializer(event, context={'request': request})
         return Response(serializer.data)
 
+    @action(methods=['post'], detail=False, url_path='bulk')
+    def bulk_create(self, request):
+        """Handle POST requests with a batch of events, see levelupapi.views.bulk
+
+        Returns:
+            Response -- Per-item results, 201 when every event was created
+        """
+        return bulk.create_events(request)
+
     def update(self, request, pk=None):
         """Handle PUT requests for an event
 
         Returns:
             Response -- Empty body with 204 status code
         """
-        creator = Gamer.objects.get(user=request.auth.user)
+        creator = request.gamer
         game = Game.objects.get(pk=request.data['gameId'])
 
         event = Event.objects.get(pk=pk)
@@ -97,58 +214,166 @@ class Events(ViewSet):
         except Exception as ex:
             return Response({'message': ex.args[0]}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)       
 
+    def list_queryset(self, request):
+        """The filtered events of a list request, loaded for EventSerializer"""
+        gamer = request.gamer
+
+        # `joined` is annotated onto every event in the same query
+        serializer = EventSerializer(context={'request': request})
+        events = eager_load(
+            Event.objects.with_joined(gamer), serializer, include=self.ordering
+        )
+
+        has_space = query_value(request, 'has_space', boolean)
+        ordering = request.query_params.get('ordering', None)
+        if ordering in EVENT_ORDERINGS and isinstance(self.get_paginator(request), EventCursorPagination):
+            raise exceptions.ValidationError({'ordering': 'Cursor pages are always in calendar order.'})
+        if ATTENDANCE_FIELDS & set(serializer.fields) or has_space is not None or ordering in EVENT_ORDERINGS:
+            events = events.with_attendance()
+
+        limit = attendee_limit(request)
+        if limit:
+            events = events.with_attendees(limit)
+
+        events = filter_events(events, request)
+
+        # Support filtering events by whether they have spots left, e.g.:
+        #   http://localhost:8000/events?has_space=true
+        if has_space is not None:
+            events = events.filter(**{'spots_left__gt' if has_space else 'spots_left__lte': 0})
+
+        return events
+
+    def get_ordering(self, request):
+        """Sort limit/offset pages by ?ordering=fill_rate or -fill_rate, in
+        calendar order otherwise"""
+        return EVENT_ORDERINGS.get(request.query_params.get('ordering', None), self.ordering)
+
+    @cached(EVENTS, per_gamer=True)
     def list(self, request):
         """Handle GET requests to events resource
 
         Returns:
-            Response -- JSON serialized list of events
+            Response -- JSON serialized page of events
         """
-        events = Event.objects.all()
-        gamer = Gamer.objects.get(user=request.auth.user)
+        return self.paginated_response(request, self.list_queryset(request), EventSerializer)
 
-        # Support filtering events by game
-        game = self.request.query_params.get('gameId', None)
-        if game is not None:
-            events = events.filter(game__id=type)
+    @cached(EVENTS, per_gamer=True)
+    async def alist(self, request):
+        """Handle GET requests to events resource in async views, see
+        levelupapi.views.asynchronous
 
-        for event in events:
-            event.joined = None
+        Returns:
+            Response -- JSON serialized page of events
+        """
+        return await self.apaginated_response(request, self.list_queryset(request), EventSerializer)
 
-            try:
-                EventGamer.objects.get(event=event, gamer=gamer)
-                event.joined = True
+    @action(methods=['get'], detail=False)
+    @cached(EVENTS, per_gamer=True)
+    def calendar(self, request):
+        """Handle GET requests for a month of events, e.g.:
+            http://localhost:8000/events/calendar?month=2020-11
 
-            except EventGamer.DoesNotExist:
-                event.joined = False
+        The list filters apply too. The days are counted from the
+        (date, time, id) calendar index alone.
+
+        Returns:
+            Response -- JSON object with the month and its days' event counts
+        """
+        months = query_value(request, 'month', month_range)
+        if months is None:
+            return Response(
+                {'message': 'A month such as ?month=2020-11 is required.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        month, next_month = months
+
+        events = filter_events(Event.objects.with_joined(request.gamer), request)
+        days = (
+            events.filter(date__gte=month, date__lt=next_month)
+            .values('date').annotate(count=Count('id')).order_by('date')
+        )
+
+        return Response({
+            'month': month.strftime('%Y-%m'),
+            'days': [{ 'date': day['date'], 'count': day['count'] } for day in days]
+        })
+
+    @action(methods=['get'], detail=False)
+    @cached(EVENTS, RECOMMENDATIONS, per_gamer=True)
+    def recommended(self, request):
+        """Handle GET requests for upcoming events of the games recommended
+        to the gamer that they have not joined yet
+
+        Returns:
+            Response -- JSON serialized events, by the game's recommendation
+            and then in calendar order
+        """
+        gamer = request.gamer
+        serializer = EventSerializer(context={'request': request})
+        events = eager_load(Event.objects.with_joined(gamer), serializer)
+        if ATTENDANCE_FIELDS & set(serializer.fields):
+            events = events.with_attendance()
+
+        events = events.filter(
+            game__recommendations__gamer=gamer, date__gte=date.today(), joined=False
+        ).order_by('game__recommendations__rank', 'date', 'time', 'id')
 
-        serializer = EventSerializer(events, many=True, context={'request': request})
+        serializer = EventSerializer(events[:RECOMMENDED_EVENTS], many=True, context={'request': request})
         return Response(serializer.data)
 
+    @action(methods=['post'], detail=False, url_path='signup/bulk')
+    def bulk_signup(self, request):
+        """Sign up for a batch of events, see levelupapi.views.bulk
+
+        Returns:
+            Response -- Per-item results, 201 when every signup was created
+        """
+        return bulk.signup(request)
+
     @action(methods=['post', 'delete'], detail=True)
     def signup(self, request, pk=None):
         """Managing gamers signing up for events"""
 
         # A gamer wants to sign up for an event
         if request.method == "POST":
-            event = Event.objects.get(pk=pk)
-            gamer = Gamer.objects.get(user=request.auth.user)
+            try:
+                event_id = int(pk)
+            except ValueError:
+                return Response(
+                    {'message': 'Event does not exist.'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
 
             try:
-                # Determine if user is already signed up
-                registration = EventGamer.objects.get(event=event, gamer=gamer)
+                # Registering is a single INSERT, the unique (event, gamer)
+                # constraint rejects a gamer that is already signed up
+                with transaction.atomic():
+                    registration = EventGamer.objects.register(
+                        event_id, request.gamer,
+                        enforce_capacity=settings.ENFORCE_EVENT_CAPACITY
+                    )
+            except IntegrityError:
                 return Response(
                     {'message': 'Gamer already signed up for this event.'},
                     status=status.HTTP_422_UNPROCESSABLE_ENTITY
                 )
-            except EventGamer.DoesNotExist:
-                # The user is not signed up
-                registration = EventGamer()
-                registration.event = event
-                registration.gamer = gamer
-                registration.save()
 
+            if registration is not None:
                 return Response({}, status=status.HTTP_201_CREATED)
 
+            # Nothing was inserted, find out why
+            if not Event.objects.filter(pk=event_id).exists():
+                return Response(
+                    {'message': 'Event does not exist.'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+
+            return Response(
+                {'message': 'Event is full.'},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+
         elif request.method == "DELETE":
             # Handle the case that client specifies an event that does not exist
             try:
@@ -159,7 +384,7 @@ class Events(ViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            gamer = Gamer.objects.get(user=request.auth.user)
+            gamer = request.gamer
 
             try:
                 # Try to delete the signup
@@ -191,10 +416,27 @@ class EventGamerSerializer(serializers.ModelSerializer):
         model = Gamer
         fields = ('user', )
 
-class EventSerializer(serializers.HyperlinkedModelSerializer):
-    """JSON serializer for events"""
+class EventAttendeeSerializer(serializers.ModelSerializer):
+    """JSON serializer for a gamer signed up for an event"""
+    id = serializers.ReadOnlyField(source='gamer_id')
+    first_name = serializers.ReadOnlyField(source='gamer.user.first_name')
+    last_name = serializers.ReadOnlyField(source='gamer.user.last_name')
+
+    class Meta:
+        model = EventGamer
+        fields = ('id', 'first_name', 'last_name')
+
+class EventSerializer(SparseFieldsMixin, serializers.HyperlinkedModelSerializer):
+    """JSON serializer for events
+
+    `attendee_count` and `spots_left` come from Event.objects.with_attendance(),
+    and with ?attendees=N the first N attendees are listed from
+    Event.objects.with_attendees()
+    """
     creator = EventGamerSerializer(many=False)
     game = GameSerializer(many=False)
+    attendee_count = serializers.IntegerField(read_only=True)
+    spots_left = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Event
@@ -202,4 +444,18 @@ class EventSerializer(serializers.HyperlinkedModelSerializer):
             view_name='event',
             lookup_field='id'
         )
-        fields = ('id', 'url', 'game', 'creator', 'location', 'date', 'time', 'joined')
+        fields = (
+            'id', 'url', 'game', 'creator', 'location', 'date', 'time', 'joined',
+            'attendee_count', 'spots_left'
+        )
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        request = self.context.get('request', None)
+        if request is not None and attendee_limit(request):
+            fields['attendees'] = EventAttendeeSerializer(
+                source='first_attendees', many=True, read_only=True
+            )
+
+        return fields
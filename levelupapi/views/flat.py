@@ -0,0 +1,180 @@
+"""Flat serialization of list pages straight from `.values()` rows
+
+A nested ModelSerializer walks every field of every row through DRF's field
+machinery and reverses a URL per hyperlink. FlatSerializer compiles the same
+serializer once into the list of `.values()` lookups it reads and a tree of
+plain getters, and builds hyperlinks from a per-request URL template, so a
+page of rows becomes the same dicts, in the same key order, without
+instantiating a model or a field per row.
+"""
+from functools import lru_cache
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.reverse import reverse
+
+# Stands in for the primary key when reversing a URL template
+PK_PLACEHOLDER = '2147483647'
+
+# Fields whose value is the database value itself
+PASSTHROUGH_FIELDS = (serializers.ReadOnlyField, serializers.BooleanField)
+
+
+def is_model_field(model, name):
+    """Whether `name` is a concrete field of `model`"""
+    try:
+        return model._meta.get_field(name).concrete
+    except FieldDoesNotExist:
+        return False
+
+
+class Unsupported(Exception):
+    """The serializer uses a field the flat path cannot reproduce"""
+
+
+def compile_fields(serializer, model, prefix=''):
+    """Plan the getters of `serializer` rendering instances of `model`
+
+    Returns:
+        tuple -- (`.values()` lookups, [(name, kind, lookup, field or plan)])
+    """
+    lookups = []
+    plan = []
+    pk_lookup = prefix + model._meta.pk.name
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+
+        if isinstance(field, serializers.HyperlinkedIdentityField):
+            if field.lookup_field != 'pk':
+                raise Unsupported(name)
+            lookups.append(pk_lookup)
+            plan.append((name, 'url', pk_lookup, field))
+
+        elif isinstance(field, serializers.ModelSerializer):
+            if field.source == '*':
+                raise Unsupported(name)
+            relation = model._meta.get_field(field.source)
+            if not (relation.many_to_one or relation.one_to_one) or relation.auto_created:
+                raise Unsupported(name)
+            nested_prefix = f"{prefix}{field.source}__"
+            nested_lookups, nested_plan = compile_fields(field, relation.related_model, nested_prefix)
+            related_pk = nested_prefix + relation.related_model._meta.pk.name
+            lookups.append(related_pk)
+            lookups.extend(nested_lookups)
+            plan.append((name, 'nested', related_pk, nested_plan))
+
+        elif isinstance(field, serializers.BaseSerializer) or '.' in field.source:
+            raise Unsupported(name)
+
+        elif isinstance(field, serializers.PrimaryKeyRelatedField) and not field.source_attrs[1:]:
+            # A relation collapsed by ?expand= reads the foreign key column
+            relation = model._meta.get_field(field.source)
+            if not (relation.many_to_one or relation.one_to_one) or relation.auto_created:
+                raise Unsupported(name)
+            lookups.append(prefix + field.source)
+            plan.append((name, 'value', prefix + field.source, field))
+
+        elif isinstance(field, (serializers.SerializerMethodField, serializers.RelatedField, serializers.ManyRelatedField)):
+            raise Unsupported(name)
+
+        else:
+            if field.source == 'pk':
+                lookup = pk_lookup
+            elif is_model_field(model, field.source) or not prefix:
+                # Top level sources may also be annotations, see supports()
+                lookup = prefix + field.source
+            else:
+                raise Unsupported(name)
+            lookups.append(lookup)
+            kind = 'value' if isinstance(field, PASSTHROUGH_FIELDS) else 'field'
+            plan.append((name, kind, lookup, field))
+
+    return lookups, plan
+
+
+class FlatSerializer:
+    """Serializes `.values()` rows exactly like `serializer_class(many=True)`"""
+
+    def __init__(self, serializer_class, model, selection=None):
+        self.model = model
+        serializer = serializer_class(context={'sparse_fields': selection})
+        self.lookups, self.plan = compile_fields(serializer, model)
+        # Keep the lookups unique but in first-seen order
+        self.lookups = list(dict.fromkeys(self.lookups))
+
+    def supports(self, queryset):
+        """Whether `queryset` has every value the serializer reads
+
+        Top level sources that are not model fields, such as Event.joined,
+        have to be annotated onto the queryset. Prefetched relations, such
+        as an event's first attendees, are left to the nested serializer.
+        """
+        if queryset._prefetch_related_lookups:
+            return False
+
+        return all(
+            '__' in lookup or is_model_field(self.model, lookup)
+            or lookup in queryset.query.annotations
+            for lookup in self.lookups
+        )
+
+    def values(self, queryset, *extra):
+        """The rows `queryset` yields for this serializer
+
+        Arguments:
+            extra -- More lookups to read, e.g. a paginator's ordering
+        """
+        lookups = dict.fromkeys(self.lookups + list(extra))
+        return queryset.prefetch_related(None).values(*lookups)
+
+    def getters(self, plan, request):
+        """Bind a compiled plan to the URLs of this request"""
+        getters = []
+        for name, kind, lookup, spec in plan:
+            if kind == 'url':
+                url = reverse(
+                    spec.view_name, kwargs={spec.lookup_url_kwarg: PK_PLACEHOLDER},
+                    request=request
+                )
+                head, tail = url.split(PK_PLACEHOLDER)
+                getters.append((name, kind, lookup, (head, tail)))
+            elif kind == 'nested':
+                getters.append((name, kind, lookup, self.getters(spec, request)))
+            else:
+                getters.append((name, kind, lookup, spec.to_representation))
+        return getters
+
+    @staticmethod
+    def build(row, getters):
+        """One row as the nested serializer would have rendered it"""
+        data = {}
+        for name, kind, lookup, spec in getters:
+            value = row[lookup]
+            if value is None:
+                data[name] = None
+            elif kind == 'value':
+                data[name] = value
+            elif kind == 'field':
+                data[name] = spec(value)
+            elif kind == 'url':
+                data[name] = f"{spec[0]}{value}{spec[1]}"
+            else:
+                data[name] = FlatSerializer.build(row, spec)
+        return data
+
+    def serialize(self, rows, request):
+        """Render a page of `.values()` rows"""
+        getters = self.getters(self.plan, request)
+        return [self.build(row, getters) for row in rows]
+
+
+@lru_cache(maxsize=256)
+def flat_serializer(serializer_class, model, selection=None):
+    """The compiled FlatSerializer of a serializer class pruned to a
+    SparseFields `selection`, or None when the serializer has fields the flat
+    path cannot reproduce"""
+    try:
+        return FlatSerializer(serializer_class, model, selection)
+    except Unsupported:
+        return None
@@ -1,14 +1,77 @@
 """View module for handling requests about games"""
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
 from django.http import HttpResponseServerError
 from rest_framework import status, serializers
+from rest_framework.decorators import action
 from rest_framework.viewsets import ViewSet
 from rest_framework.response import Response
+from levelupapi import search
+from levelupapi.cache import GAMES, RECOMMENDATIONS
 from levelupapi.models import Game, GameType, Gamer
+from levelupapi.views import bulk
+from levelupapi.views.asynchronous import AsyncViewSetMixin
+from levelupapi.views.caching import cached
+from levelupapi.views.conditional import conditional
+from levelupapi.views.eager_loading import eager_load
+from levelupapi.views.pagination import GameCursorPagination, PaginatedViewSetMixin
+from levelupapi.views.params import query_value
+from levelupapi.views.sparse import SparseFieldsMixin
 
-class Games(ViewSet):
+# Ranges ?min_<name>= and ?max_<name>= can narrow the games to
+GAME_RANGES = {
+    'players': 'num_players',
+    'skill': 'skill_level',
+}
+
+def filter_games(games, request):
+    """Apply the games list filters in the query string
+
+    ?search= is answered from the full-text index, see levelupapi.search,
+    and annotates the games with their `search_rank`.
+    """
+
+    # Support filtering games by type, e.g.:
+    #   http://localhost:8000/games?type=1
+
+    game_type = query_value(request, 'type', int)
+    if game_type is not None:
+        games = games.filter(game_type__id=game_type)
+
+    # Support player count and skill level ranges, e.g.:
+    #   http://localhost:8000/games?min_players=2&max_skill=3
+    for name, field in GAME_RANGES.items():
+        low = query_value(request, f'min_{name}', int)
+        if low is not None:
+            games = games.filter(**{f'{field}__gte': low})
+
+        high = query_value(request, f'max_{name}', int)
+        if high is not None:
+            games = games.filter(**{f'{field}__lte': high})
+
+    # Support searching names as they are typed, e.g.:
+    #   http://localhost:8000/games?search=tick+ri
+    text = request.query_params.get('search', None)
+    if text is not None:
+        games = search.search_games(games, text)
+
+    return games
+
+def games_version(view, request):
+    """Version stamp of the listed games and their game types
+
+    Creator name changes touch the games' updated_at, see levelupapi.signals
+    """
+    return filter_games(Game.objects.all(), request).aggregate(
+        modified=Max('updated_at'),
+        game_types_modified=Max('game_type__updated_at'),
+        count=Count('id')
+    )
+
+class Games(AsyncViewSetMixin, PaginatedViewSetMixin, ViewSet):
     """Level up games"""
+    cursor_pagination_class = GameCursorPagination
 
     def create(self, request):
         """Handle POST operations
@@ -18,7 +81,7 @@ class Games(ViewSet):
         """
 
         # find the related objects for the new game instance
-        gamer = Gamer.objects.get(user=request.auth.user)
+        gamer = request.gamer
         game_type = GameType.objects.get(pk=request.data["gameTypeId"])
 
         game = Game()
@@ -38,6 +101,7 @@ class Games(ViewSet):
         except ValidationError as ex:
             return Response({"reason": ex.message}, status=status.HTTP_400_BAD_REQUEST)
 
+    @cached(GAMES)
     def retrieve(self, request, pk=None):
         """Handle GET requests for a single game
 
@@ -47,19 +111,47 @@ class Games(ViewSet):
         try:
             # `pk` is a parameter to this function, and Django parses it from
             # URL route parameter http://localhost:8000/games/2
-            game = Game.objects.get(pk=pk)
+            serializer = GameSerializer(context={'request': request})
+            game = eager_load(Game.objects.all(), serializer).get(pk=pk)
             serializer = GameSerializer(game, context={'request': request})
             return Response(serializer.data)
         except Exception as ex:
             return HttpResponseServerError(ex)
 
+    @action(methods=['get'], detail=False)
+    @cached(GAMES, RECOMMENDATIONS, per_gamer=True)
+    def recommended(self, request):
+        """Handle GET requests for the games recommended to the gamer, built
+        offline by levelupapi.recommendations
+
+        Returns:
+            Response -- JSON serialized games, best recommendation first
+        """
+        serializer = GameSerializer(context={'request': request})
+        games = (
+            eager_load(Game.objects.all(), serializer)
+            .filter(recommendations__gamer=request.gamer)
+            .order_by('recommendations__rank')
+        )
+        serializer = GameSerializer(games, many=True, context={'request': request})
+        return Response(serializer.data)
+
+    @action(methods=['post'], detail=False, url_path='bulk')
+    def bulk_create(self, request):
+        """Handle POST requests with a batch of games, see levelupapi.views.bulk
+
+        Returns:
+            Response -- Per-item results, 201 when every game was created
+        """
+        return bulk.create_games(request)
+
     def update(self, request, pk=None):
         """Handle PUT requests for a game
 
         Returns:
             Response -- Empty body with 204 status code
         """
-        gamer = Gamer.objects.get(user=request.auth.user)
+        gamer = request.gamer
         game_type = GameType.objects.get(pk=request.data["gameTypeId"])
 
         # mostly the same thing as POST, but this time update the resource w/ given pk
@@ -99,24 +191,39 @@ class Games(ViewSet):
         except Exception as ex:
             return Response({'message': ex.args[0]}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def get_ordering(self, request):
+        """Put the best matches first on limit/offset pages of a search"""
+        if 'search' in request.query_params:
+            return ('-search_rank', 'id')
+        return self.ordering
+
+    def list_queryset(self, request):
+        """The filtered games of a list request, loaded for GameSerializer"""
+        serializer = GameSerializer(context={'request': request})
+        return filter_games(
+            eager_load(Game.objects.all(), serializer, include=self.ordering), request
+        )
+
+    @cached(GAMES)
+    @conditional(games_version)
     def list(self, request):
         """Handle GET requests to games resource
 
         Returns:
-            Response -- JSON serialized list of games
+            Response -- JSON serialized page of games, or 304 when unchanged
         """
-        games = Game.objects.all()
+        return self.paginated_response(request, self.list_queryset(request), GameSerializer)
 
-        # Support filtering games by type, e.g.:
-        #   http://localhost:8000/games?type=1
-
-        game_type = self.request.query_params.get('type', None)
-        if game_type is not None:
-            games = games.filter(game_type__id=game_type)
-        
-        serializer = GameSerializer(games, many=True, context={'request': request})
+    @cached(GAMES)
+    @conditional(games_version)
+    async def alist(self, request):
+        """Handle GET requests to games resource in async views, see
+        levelupapi.views.asynchronous
 
-        return Response(serializer.data)
+        Returns:
+            Response -- JSON serialized page of games, or 304 when unchanged
+        """
+        return await self.apaginated_response(request, self.list_queryset(request), GameSerializer)
 
 class UserSerializer(serializers.ModelSerializer):
     """JSON serialiezr for user"""
@@ -139,7 +246,7 @@ class GameTypeSerializer(serializers.ModelSerializer):
         model = GameType
         fields = ('id', 'name')
 
-class GameSerializer(serializers.HyperlinkedModelSerializer):
+class GameSerializer(SparseFieldsMixin, serializers.HyperlinkedModelSerializer):
     """JSON serializer for games"""
     creator = GamerSerializer(many=False)
     game_type = GameTypeSerializer(many=False)
@@ -1,11 +1,20 @@
 """View module for handling requests about game types"""
+from django.db.models import Count, Max
 from django.http import HttpResponseServerError
 from rest_framework.viewsets import ViewSet
 from rest_framework.response import Response
 from rest_framework import serializers
+from levelupapi.cache import GAME_TYPES
 from levelupapi.models import GameType
+from levelupapi.views.caching import cached
+from levelupapi.views.conditional import conditional
+from levelupapi.views.pagination import PaginatedViewSetMixin
 
-class GameTypes(ViewSet):
+def game_types_version(view, request):
+    """Version stamp of the game types"""
+    return GameType.objects.aggregate(modified=Max('updated_at'), count=Count('id'))
+
+class GameTypes(PaginatedViewSetMixin, ViewSet):
     """Level up game types"""
 
     def retrieve(self, request, pk=None):
@@ -21,17 +30,17 @@ class GameTypes(ViewSet):
         except Exception as ex:
             return HttpResponseServerError(ex)
 
+    @cached(GAME_TYPES)
+    @conditional(game_types_version)
     def list(self, request):
         """Handle GET requests to get al game types
 
         Returns:
-            Response -- JSON serialized list of game types
+            Response -- JSON serialized page of game types, or 304 when unchanged
         """
         gametypes = GameType.objects.all()
 
-        # many=True kwarg is necessary if serializing a list of objects instead of single object
-        serializer = GameTypeSerializer(gametypes, many=True, context={'request': request})
-        return Response(serializer.data)
+        return self.paginated_response(request, gametypes, GameTypeSerializer)
 
 class GameTypeSerializer(serializers.HyperlinkedModelSerializer):
     """JSON serializer for game types"""
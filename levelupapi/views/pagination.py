@@ -0,0 +1,228 @@
+"""Pagination for the level up ViewSets"""
+import json
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.settings import api_settings
+from levelupapi.views.asynchronous import concurrently
+from levelupapi.views.flat import flat_serializer
+from levelupapi.views.sparse import SparseFields
+
+
+class KeysetCursorPagination(CursorPagination):
+    """Cursor pagination seeking past the whole `ordering` tuple
+
+    DRF's CursorPagination keeps only the first ordering field as the
+    cursor's position and counts off an OFFSET past the rows sharing it,
+    which skips or repeats rows when those change between pages. Here the
+    position holds every field of `ordering`, which must end with a unique
+    one, and a page filters on (a, b, c) > (x, y, z) so it seeks the index
+    from the last row it listed.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*(
+                field[1:] if field.startswith('-') else '-' + field for field in self.ordering
+            ))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if current_position is not None:
+            queryset = queryset.filter(self.seek(queryset.model, current_position, reverse))
+
+        # One more row tells whether a page follows
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = results[:self.page_size]
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            following_position = None
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None or offset > 0
+            self.has_previous = following_position is not None
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None or offset > 0
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def seek(self, model, position, reverse):
+        """The rows after `position` in the ordering, or before it when
+        paging back
+
+        Raises:
+            NotFound -- The cursor's position is not one of ours
+        """
+        try:
+            values = json.loads(position)
+            fields = [field.lstrip('-') for field in self.ordering]
+            if not isinstance(values, list) or len(values) != len(fields):
+                raise ValueError(position)
+            values = [model._meta.get_field(field).to_python(value) for field, value in zip(fields, values)]
+        except (ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        # (a, b, c) > (x, y, z) is a > x, or a = x and b > y, or a = x,
+        # b = y and c > z. The leading a >= x bounds the index range scan.
+        after = Q()
+        for index, order in enumerate(self.ordering):
+            lookup = 'lt' if order.startswith('-') != reverse else 'gt'
+            equal = dict(zip(fields[:index], values[:index]))
+            after |= Q(**equal, **{f'{fields[index]}__{lookup}': values[index]})
+
+        bound = 'lte' if self.ordering[0].startswith('-') != reverse else 'gte'
+        return Q(**{f'{fields[0]}__{bound}': values[0]}) & after
+
+    def _get_position_from_instance(self, instance, ordering):
+        fields = [field.lstrip('-') for field in ordering]
+        if isinstance(instance, dict):
+            values = [instance[field] for field in fields]
+        else:
+            values = [getattr(instance, field) for field in fields]
+        return json.dumps([str(value) for value in values], separators=(',', ':'))
+
+
+class EventCursorPagination(KeysetCursorPagination):
+    """Keyset pagination for events in calendar order, seeking the
+    (date, time, id) index"""
+    ordering = ('date', 'time', 'id')
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+
+class GameCursorPagination(CursorPagination):
+    """Keyset pagination for games, seeking on the primary key"""
+    ordering = ('id', )
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+
+class PrecountedLimitOffsetPagination(LimitOffsetPagination):
+    """LimitOffsetPagination of rows the caller has already counted
+
+    paginate_queryset() takes `count` rather than counting the rows, so the
+    count can be read alongside the page.
+    """
+
+    def __init__(self, count):
+        super().__init__()
+        self.precomputed_count = count
+
+    def get_count(self, queryset):
+        return self.precomputed_count
+
+
+class PaginatedViewSetMixin:
+    """Adds paginated list responses to a plain ViewSet
+
+    Lists are paginated with the project's DEFAULT_PAGINATION_CLASS
+    (limit/offset) unless the client asks for keyset pagination with
+    `?pagination=cursor` on a view that declares a `cursor_pagination_class`.
+    """
+    pagination_class = api_settings.DEFAULT_PAGINATION_CLASS
+    cursor_pagination_class = None
+    ordering = ('id', )
+
+    def get_paginator(self, request):
+        """Pick the paginator for this request"""
+        if self.cursor_pagination_class is not None:
+            if request.query_params.get('pagination', None) == 'cursor':
+                return self.cursor_pagination_class()
+
+        return self.pagination_class()
+
+    def get_ordering(self, request):
+        """The ordering of limit/offset pages for this request"""
+        return self.ordering
+
+    def paginated_response(self, request, queryset, serializer_class):
+        """Serialize one page of `queryset` and wrap it with the page links
+
+        Returns:
+            Response -- JSON serialized page of instances
+        """
+        paginator = self.get_paginator(request)
+
+        # Cursor paginators apply their own ordering, offsets need a stable one
+        if isinstance(paginator, CursorPagination):
+            ordering = paginator.ordering
+        else:
+            ordering = self.get_ordering(request)
+            queryset = queryset.order_by(*ordering)
+
+        rows, render = self.page_source(request, queryset, serializer_class, ordering)
+        page = paginator.paginate_queryset(rows, request, view=self)
+        return paginator.get_paginated_response(render(page))
+
+    async def apaginated_response(self, request, queryset, serializer_class):
+        """paginated_response() for async views
+
+        A limit/offset page counts the rows and reads the page concurrently
+        rather than one query after the other.
+
+        Returns:
+            Response -- JSON serialized page of instances
+        """
+        paginator = self.get_paginator(request)
+        limit = paginator.get_limit(request) if isinstance(paginator, LimitOffsetPagination) else None
+        if limit is None:
+            # A cursor page is a single query, nothing to overlap
+            return await sync_to_async(self.paginated_response)(request, queryset, serializer_class)
+
+        offset = paginator.get_offset(request)
+        ordering = self.get_ordering(request)
+        rows, render = self.page_source(
+            request, queryset.order_by(*ordering), serializer_class, ordering
+        )
+        count, data = await concurrently(
+            lambda: paginator.get_count(rows),
+            lambda: render(rows[offset:offset + limit])
+        )
+
+        # The page is already read, leave the paginator nothing to slice
+        paginator = PrecountedLimitOffsetPagination(count)
+        paginator.paginate_queryset(rows.none(), request, view=self)
+        return paginator.get_paginated_response(data)
+
+    def page_source(self, request, queryset, serializer_class, ordering):
+        """The rows to paginate and the function rendering a page of them
+
+        With settings.FAST_JSON the rows are `.values()` rows rendered by the
+        compiled FlatSerializer instead, when the serializer allows it.
+
+        Returns:
+            tuple -- (queryset, function of a page returning its JSON data)
+        """
+        if getattr(settings, 'FAST_JSON', False):
+            selection = SparseFields.from_request(request)
+            flat = flat_serializer(serializer_class, queryset.model, selection)
+            if flat is not None and flat.supports(queryset):
+                rows = flat.values(queryset, *(field.lstrip('-') for field in ordering))
+                return rows, lambda page: flat.serialize(page, request)
+
+        return queryset, lambda page: serializer_class(page, many=True, context={'request': request}).data
@@ -0,0 +1,28 @@
+"""Query string parameters shared by the list views"""
+from rest_framework import exceptions
+
+
+def query_value(request, name, parse):
+    """Parse query parameter `name`, None when it is absent
+
+    Raises:
+        ValidationError -- The value does not parse, answered with a 400
+    """
+    value = request.query_params.get(name, None)
+    if value is None:
+        return None
+    try:
+        return parse(value)
+    except ValueError:
+        raise exceptions.ValidationError({name: f'Invalid value "{value}".'})
+
+
+def boolean(value):
+    """Parse a "true" or "false" query value
+
+    Raises:
+        ValueError -- The value is neither
+    """
+    if value not in ('true', 'false'):
+        raise ValueError(value)
+    return value == 'true'
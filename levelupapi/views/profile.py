@@ -1,30 +1,63 @@
 """Profile ViewSet and Serializers"""
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
 from rest_framework.viewsets import ViewSet
 from rest_framework.response import Response
 from rest_framework import serializers
 from levelupapi.models import Gamer, Event, Game
+from levelupapi.views.asynchronous import AsyncViewSetMixin
+from levelupapi.views.eager_loading import eager_load
+from levelupapi.views.sparse import SparseFields, SparseFieldsMixin
 
 User = get_user_model()
 
-class Profile(ViewSet):
+class Profile(AsyncViewSetMixin, ViewSet):
     """Profiles ViewSet"""
 
     def list(self, request):
         """GET profile, not really a "list" but just want to be able
         to expose this info via /profile"""
 
-        gamer = Gamer.objects.get(user=request.auth.user)
-        events = Event.objects.filter(registration__gamer=gamer)
+        parts = self.profile_parts(request)
+        return Response({ key: render() for key, render in parts.items() })
 
-        events = EventSerializer(events, many=True, context={'request': request})
-        gamer = GamerSerializer(gamer, many=False, context={'request': request})
+    async def alist(self, request):
+        """GET profile in async views
 
-        profile = {}
-        profile["gamer"] = gamer.data
-        profile["events"] = events.data
-        
-        return Response(profile)
+        The gamer came with the token, so only the events section queries
+        and goes to the request's worker thread; the gamer is rendered on
+        the event loop.
+        """
+
+        parts = self.profile_parts(request)
+        events = parts.pop("events", None)
+        data = { key: render() for key, render in parts.items() }
+        if events is not None:
+            data["events"] = await sync_to_async(events)()
+        return Response(data)
+
+    def profile_parts(self, request):
+        """The profile's sections, as functions rendering each one by key"""
+        gamer = request.gamer
+
+        # ?fields= and ?expand= paths start with "gamer." or "events."
+        selection = SparseFields.from_request(request) or SparseFields()
+
+        parts = {}
+
+        if selection.includes("gamer"):
+            gamer_context = {'request': request, 'sparse_fields': selection.child("gamer")}
+            parts["gamer"] = lambda: GamerSerializer(gamer, many=False, context=gamer_context).data
+
+        if selection.includes("events"):
+            events_context = {'request': request, 'sparse_fields': selection.child("events")}
+            events = eager_load(
+                Event.objects.filter(registration__gamer=gamer),
+                EventSerializer(context=events_context)
+            )
+            parts["events"] = lambda: EventSerializer(events, many=True, context=events_context).data
+
+        return parts
 
 class UserSerializer(serializers.ModelSerializer):
     """JSON serializer for gamer's related Django user"""
@@ -32,7 +65,7 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ('first_name', 'last_name', 'username')
 
-class GamerSerializer(serializers.ModelSerializer):
+class GamerSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """JSON serializer for gamers"""
     user = UserSerializer(many=False)
 
@@ -46,7 +79,7 @@ class GameSerializer(serializers.HyperlinkedModelSerializer):
         model = Game
         fields = ('name', )
 
-class EventSerializer(serializers.HyperlinkedModelSerializer):
+class EventSerializer(SparseFieldsMixin, serializers.HyperlinkedModelSerializer):
     """JSON serializer for events"""
     game = GameSerializer(many=False)
 
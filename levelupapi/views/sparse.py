@@ -0,0 +1,128 @@
+"""Sparse fieldsets and expansion control through ?fields= and ?expand=
+
+`?fields=id,date,game.name` keeps only the listed fields; naming a nested
+object without a sub-path keeps all of it. `?expand=game` renders only the
+listed nested objects (and any named by a `fields` sub-path) in full, every
+other relation becomes its primary key. Without the parameters serializers
+render as they always have.
+"""
+from django.utils.functional import cached_property
+from rest_framework import serializers
+
+
+def parse_paths(value):
+    """Parse "a,b.c" into {('a',), ('b', 'c')}"""
+    return frozenset(
+        tuple(part.strip() for part in path.split('.'))
+        for path in value.split(',') if path.strip()
+    )
+
+
+class SparseFields:
+    """The fields and expanded relations selected for one serializer level
+
+    `fields` and `expand` are sets of dotted paths split into tuples, or None
+    to keep every field and expand every relation.
+    """
+
+    def __init__(self, fields=None, expand=None):
+        self.fields = fields
+        self.expand = expand
+
+    @classmethod
+    def from_request(cls, request):
+        """The selection in the request's query string, or None without one"""
+        params = request.query_params
+        if 'fields' not in params and 'expand' not in params:
+            return None
+
+        fields = params.get('fields', None)
+        expand = params.get('expand', None)
+        return cls(
+            parse_paths(fields) if fields is not None else None,
+            parse_paths(expand) if expand is not None else None
+        )
+
+    def __eq__(self, other):
+        return isinstance(other, SparseFields) and (self.fields, self.expand) == (other.fields, other.expand)
+
+    def __hash__(self):
+        return hash((self.fields, self.expand))
+
+    def includes(self, name):
+        """Whether field `name` is rendered at this level"""
+        return self.fields is None or any(path[0] == name for path in self.fields)
+
+    def expands(self, name):
+        """Whether relation `name` is rendered as a nested object"""
+        if self.expand is None:
+            return True
+        return any(path[0] == name for path in self.expand) or (
+            self.fields is not None
+            and any(path[0] == name and len(path) > 1 for path in self.fields)
+        )
+
+    def child(self, name):
+        """The selection inside relation `name`"""
+        fields = None
+        if self.fields is not None and (name,) not in self.fields:
+            fields = frozenset(path[1:] for path in self.fields if path[0] == name)
+
+        expand = None
+        if self.expand is not None:
+            expand = frozenset(path[1:] for path in self.expand if path[0] == name and len(path) > 1)
+
+        return SparseFields(fields, expand)
+
+
+def prune(fields, selection):
+    """Drop unselected fields and collapse unexpanded relations in place"""
+    for name in list(fields.keys()):
+        if not selection.includes(name):
+            del fields[name]
+            continue
+
+        field = fields[name]
+        many = isinstance(field, serializers.ListSerializer)
+        nested = field.child if many else field
+        if not isinstance(nested, serializers.Serializer):
+            continue
+
+        if selection.expands(name):
+            prune(nested.fields, selection.child(name))
+        else:
+            kwargs = {} if field.source == name else {'source': field.source}
+            fields[name] = serializers.PrimaryKeyRelatedField(
+                many=many, read_only=True, **kwargs
+            )
+
+
+class SparseFieldsMixin:
+    """Prunes a serializer tree to the ?fields= and ?expand= of its request
+
+    The selection comes from the request in the serializer context, or from
+    a `sparse_fields` context entry (a SparseFields, or None for everything)
+    when the response nests the serializer under another key.
+    """
+
+    @cached_property
+    def fields(self):
+        fields = super().fields
+
+        # Only the outermost serializer prunes, walking the nested ones itself
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return fields
+
+        if 'sparse_fields' in self.context:
+            selection = self.context['sparse_fields']
+        else:
+            request = self.context.get('request', None)
+            selection = SparseFields.from_request(request) if request is not None else None
+
+        if selection is not None:
+            prune(fields, selection)
+
+        return fields
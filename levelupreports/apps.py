@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class LevelupreportsConfig(AppConfig):
     name = 'levelupreports'
+
+    def ready(self):
+        # Connect the handlers that maintain the report tables
+        from levelupreports import signals  # pylint: disable=unused-import,import-outside-toplevel
@@ -0,0 +1,18 @@
+"""Command rebuilding the report tables"""
+import time
+from django.core.management.base import BaseCommand
+from levelupreports import summary
+from levelupreports.models import UserEvent, UserGame
+
+
+class Command(BaseCommand):
+    help = "Rebuild the denormalized games by user and events by user report tables from scratch"
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        summary.rebuild()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {UserGame.objects.count()} user games and "
+            f"{UserEvent.objects.count()} user events in {time.perf_counter() - start:.2f}s"
+        ))
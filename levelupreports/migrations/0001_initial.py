@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('levelupapi', '0003_eventgamer_constraints'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserEvent',
+            fields=[
+                ('registration', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='levelupapi.eventgamer')),
+                ('full_name', models.CharField(max_length=301)),
+                ('creator_id', models.IntegerField()),
+                ('date', models.DateField()),
+                ('time', models.TimeField()),
+                ('location', models.CharField(max_length=75)),
+                ('game_name', models.CharField(max_length=100)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='levelupapi.event')),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'date', 'time', 'event'], name='userevent_user_date_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='UserGame',
+            fields=[
+                ('game', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='levelupapi.game')),
+                ('full_name', models.CharField(max_length=301)),
+                ('name', models.CharField(max_length=100)),
+                ('game_type_id', models.IntegerField()),
+                ('num_players', models.IntegerField()),
+                ('skill_level', models.IntegerField()),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'game'], name='usergame_user_game_idx')],
+            },
+        ),
+        # Populate the tables from the existing data, the signal handlers
+        # keep them current from here on
+        migrations.RunSQL(
+            """
+            INSERT INTO levelupreports_usergame
+                (game_id, user_id, full_name, name, game_type_id, num_players, skill_level)
+            SELECT g.id, u.id, u.first_name || ' ' || u.last_name,
+                   g.name, g.game_type_id, g.num_players, g.skill_level
+            FROM levelupapi_game g
+            JOIN levelupapi_gamer gr ON g.creator_id = gr.id
+            JOIN auth_user u ON gr.user_id = u.id
+            """,
+            migrations.RunSQL.noop
+        ),
+        migrations.RunSQL(
+            """
+            INSERT INTO levelupreports_userevent
+                (registration_id, user_id, event_id, full_name, creator_id,
+                 date, time, location, game_name)
+            SELECT eg.id, u.id, e.id, u.first_name || ' ' || u.last_name,
+                   e.creator_id, e.date, e.time, e.location, game.name
+            FROM levelupapi_eventgamer eg
+            JOIN levelupapi_event e ON eg.event_id = e.id
+            JOIN levelupapi_game game ON e.game_id = game.id
+            JOIN levelupapi_gamer g ON eg.gamer_id = g.id
+            JOIN auth_user u ON g.user_id = u.id
+            """,
+            migrations.RunSQL.noop
+        ),
+    ]
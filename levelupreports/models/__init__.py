@@ -0,0 +1,3 @@
+"""Models package"""
+from .user_game import UserGame
+from .user_event import UserEvent
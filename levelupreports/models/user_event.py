@@ -0,0 +1,31 @@
+"""UserEvent Model Module"""
+from django.conf import settings
+from django.db import models
+
+class UserEvent(models.Model):
+    """Denormalized row of the events by user report, one per registration
+
+    Kept current from levelupapi's save signals by levelupreports.summary
+    and removed along with its registration, event or user by the cascading
+    foreign keys.
+    """
+    registration = models.OneToOneField(
+        "levelupapi.EventGamer", on_delete=models.CASCADE, primary_key=True, related_name="+"
+    )
+    # Covered by the (user, date, time) index below
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    event = models.ForeignKey("levelupapi.Event", on_delete=models.CASCADE, related_name="+")
+    full_name = models.CharField(max_length=301)
+    creator_id = models.IntegerField()
+    date = models.DateField()
+    time = models.TimeField()
+    location = models.CharField(max_length=75)
+    game_name = models.CharField(max_length=100)
+
+    class Meta:
+        indexes = [
+            # Supports reading the report one user at a time in calendar order
+            models.Index(fields=['user', 'date', 'time', 'event'], name='userevent_user_date_idx'),
+        ]
@@ -0,0 +1,28 @@
+"""UserGame Model Module"""
+from django.conf import settings
+from django.db import models
+
+class UserGame(models.Model):
+    """Denormalized row of the games by user report, one per game
+
+    Kept current from levelupapi's save signals by levelupreports.summary
+    and removed along with its game or user by the cascading foreign keys.
+    """
+    game = models.OneToOneField(
+        "levelupapi.Game", on_delete=models.CASCADE, primary_key=True, related_name="+"
+    )
+    # Covered by the (user, game) index below
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    full_name = models.CharField(max_length=301)
+    name = models.CharField(max_length=100)
+    game_type_id = models.IntegerField()
+    num_players = models.IntegerField()
+    skill_level = models.IntegerField()
+
+    class Meta:
+        indexes = [
+            # Supports reading the report one user at a time
+            models.Index(fields=['user', 'game'], name='usergame_user_game_idx'),
+        ]
@@ -0,0 +1,53 @@
+"""Signal handlers keeping the report tables current
+
+Deletes need no handlers: report rows cascade with their game,
+registration, event or user. Fixture loads (raw saves) are skipped, run
+`manage.py rebuild_reports` afterwards.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from levelupapi.models import Event, EventGamer, Game, post_bulk_create
+from levelupreports import summary
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Game)
+def game_saved(sender, instance, created, raw=False, **kwargs):
+    """Insert or update the game's row and its name on event rows"""
+    if not raw:
+        summary.refresh_games([instance.pk], update_events=not created)
+
+
+@receiver(post_save, sender=Event)
+def event_saved(sender, instance, created, raw=False, **kwargs):
+    """Copy a changed event onto its attendees' rows"""
+    if not raw and not created:
+        summary.refresh_events([instance.pk])
+
+
+@receiver(post_save, sender=EventGamer)
+def registration_saved(sender, instance, created, raw=False, **kwargs):
+    """Add a row for a new registration"""
+    if not raw:
+        summary.refresh_registrations([instance.pk])
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, raw=False, **kwargs):
+    """Copy a changed name onto the user's rows"""
+    if not raw and not created:
+        summary.refresh_user(instance)
+
+
+@receiver(post_bulk_create, sender=Game)
+def games_created(sender, instances, **kwargs):
+    """Add rows for a batch of new games"""
+    summary.refresh_games([game.pk for game in instances], update_events=False)
+
+
+@receiver(post_bulk_create, sender=EventGamer)
+def registrations_created(sender, instances, **kwargs):
+    """Add rows for a batch of new registrations"""
+    summary.refresh_registrations([registration.pk for registration in instances])
@@ -0,0 +1,141 @@
+"""Maintenance of the denormalized report tables
+
+The report views read UserGame and UserEvent directly. The functions here
+keep those tables in step with levelupapi, either incrementally from the
+signal handlers in levelupreports.signals or all at once with rebuild().
+"""
+from django.db import connection, transaction
+from levelupapi.models import Event, EventGamer, Game
+from levelupreports.models import UserEvent, UserGame
+
+
+def full_name(user):
+    """The name a user is listed under in the reports"""
+    return f"{user.first_name} {user.last_name}"
+
+
+def refresh_games(game_ids, update_events=True):
+    """Rewrite the UserGame rows of the given games
+
+    Arguments:
+        game_ids -- Primary keys of the games that changed
+        update_events -- Also copy the game names onto their events' rows,
+            unnecessary for games that were just created
+    """
+    games = list(Game.objects.filter(pk__in=game_ids).select_related('creator__user'))
+
+    with transaction.atomic():
+        UserGame.objects.filter(game_id__in=game_ids).delete()
+        UserGame.objects.bulk_create(
+            UserGame(
+                game_id=game.id,
+                user_id=game.creator.user_id,
+                full_name=full_name(game.creator.user),
+                name=game.name,
+                game_type_id=game.game_type_id,
+                num_players=game.num_players,
+                skill_level=game.skill_level
+            )
+            for game in games
+        )
+
+        if update_events:
+            for game in games:
+                UserEvent.objects.filter(event__game=game).update(game_name=game.name)
+
+
+def refresh_events(event_ids):
+    """Copy the details of the given events onto their UserEvent rows"""
+    for event in Event.objects.filter(pk__in=event_ids).select_related('game'):
+        UserEvent.objects.filter(event=event).update(
+            creator_id=event.creator_id,
+            date=event.date,
+            time=event.time,
+            location=event.location,
+            game_name=event.game.name
+        )
+
+
+def refresh_registrations(registration_ids):
+    """Rewrite the UserEvent rows of the given registrations"""
+    registrations = (
+        EventGamer.objects.filter(pk__in=registration_ids)
+        .select_related('event__game', 'gamer__user')
+    )
+
+    with transaction.atomic():
+        UserEvent.objects.filter(registration_id__in=registration_ids).delete()
+        UserEvent.objects.bulk_create(
+            UserEvent(
+                registration_id=registration.id,
+                user_id=registration.gamer.user_id,
+                event_id=registration.event_id,
+                full_name=full_name(registration.gamer.user),
+                creator_id=registration.event.creator_id,
+                date=registration.event.date,
+                time=registration.event.time,
+                location=registration.event.location,
+                game_name=registration.event.game.name
+            )
+            for registration in registrations
+        )
+
+
+def refresh_user(user):
+    """Copy a user's name onto all of their report rows"""
+    name = full_name(user)
+    UserGame.objects.filter(user=user).exclude(full_name=name).update(full_name=name)
+    UserEvent.objects.filter(user=user).exclude(full_name=name).update(full_name=name)
+
+
+def rebuild():
+    """Repopulate both report tables from scratch with INSERT ... SELECT"""
+    with transaction.atomic():
+        UserEvent.objects.all().delete()
+        UserGame.objects.all().delete()
+
+        with connection.cursor() as db_cursor:
+            db_cursor.execute("""
+                INSERT INTO levelupreports_usergame
+                    (game_id, user_id, full_name, name, game_type_id, num_players, skill_level)
+                SELECT
+                    g.id,
+                    u.id,
+                    u.first_name || ' ' || u.last_name,
+                    g.name,
+                    g.game_type_id,
+                    g.num_players,
+                    g.skill_level
+                FROM
+                    levelupapi_game g
+                JOIN
+                    levelupapi_gamer gr ON g.creator_id = gr.id
+                JOIN
+                    auth_user u ON gr.user_id = u.id
+            """)
+
+            db_cursor.execute("""
+                INSERT INTO levelupreports_userevent
+                    (registration_id, user_id, event_id, full_name, creator_id,
+                     date, time, location, game_name)
+                SELECT
+                    eg.id,
+                    u.id,
+                    e.id,
+                    u.first_name || ' ' || u.last_name,
+                    e.creator_id,
+                    e.date,
+                    e.time,
+                    e.location,
+                    game.name
+                FROM
+                    levelupapi_eventgamer eg
+                JOIN
+                    levelupapi_event e ON eg.event_id = e.id
+                JOIN
+                    levelupapi_game game ON e.game_id = game.id
+                JOIN
+                    levelupapi_gamer g ON eg.gamer_id = g.id
+                JOIN
+                    auth_user u ON g.user_id = u.id
+            """)
@@ -1,7 +1,13 @@
+from django.conf import settings
 from django.urls import path
 from .views import usergame_list, userevent_list
+from .views.export import asynchronous
+
+if settings.ASYNC_READ_VIEWS:
+    usergame_list = asynchronous(usergame_list)
+    userevent_list = asynchronous(userevent_list)
 
 urlpatterns = [
     path('reports/usergames', usergame_list),
     path('reports/userevents', userevent_list)
-]
\ No newline at end of file
+]
@@ -1,4 +1,2 @@
-from .connection import Connection
-
 from .users.gamesbyuser import usergame_list
 from .users.eventsbyuser import userevent_list
\ No newline at end of file
@@ -1,2 +0,0 @@
-class Connection:
-    db_path = "/Users/jacob/workspace/nss/server-side-course/chapter2/level-up-server/db.sqlite3"
@@ -0,0 +1,116 @@
+"""Streaming CSV and NDJSON exports for the reports"""
+import csv
+import json
+from functools import wraps
+from itertools import islice
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+
+# Lines pulled from a report's worker thread per trip in async views
+ASYNC_BATCH_SIZE = 500
+
+
+class Echo:
+    """File-like object that hands back whatever is written to it, so
+    csv.writer can produce lines for a streaming response"""
+
+    def write(self, value):
+        return value
+
+
+def group_rows(rows, key, fields, items, item_fields):
+    """Group consecutive rows that share `key` into one dict per group
+
+    Rows must arrive ordered by `key`. Only the group being built is held
+    in memory, so grouping a result of any size takes constant space.
+
+    Arguments:
+        rows -- Iterable of row dicts ordered by `key`
+        key -- Column identifying the group
+        fields -- Columns copied from the group's first row onto the group
+        items -- Name of the list of grouped rows on each group
+        item_fields -- Columns copied from every row into the list
+    """
+    group = None
+
+    for row in rows:
+        if group is None or group[key] != row[key]:
+            if group is not None:
+                yield group
+
+            group = { field: row[field] for field in (key, ) + fields }
+            group[items] = []
+
+        group[items].append({ field: row[field] for field in item_fields })
+
+    if group is not None:
+        yield group
+
+
+def export_response(export_format, rows, columns, filename, group):
+    """Stream a report as CSV (one line per row) or NDJSON (one line per group)
+
+    Arguments:
+        export_format -- "csv" or "ndjson"
+        rows -- Iterable of row dicts ordered by the grouping key
+        columns -- CSV columns, in order
+        filename -- Download name without extension
+        group -- Function turning the rows into an iterable of groups
+    """
+    if export_format == 'csv':
+        writer = csv.writer(Echo())
+        lines = (
+            writer.writerow([row[column] for column in columns])
+            for row in _with_header(rows, columns)
+        )
+        content_type = 'text/csv'
+    else:
+        lines = (
+            json.dumps(line, cls=DjangoJSONEncoder) + '\n'
+            for line in group(rows)
+        )
+        content_type = 'application/x-ndjson'
+
+    response = StreamingHttpResponse(lines, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
+
+
+async def in_batches(lines, size=ASYNC_BATCH_SIZE):
+    """Iterate blocking `lines` from async code, a batch at a time
+
+    Each batch is read in the request's worker thread, where the report's
+    database cursor lives.
+    """
+    lines = iter(lines)
+    while True:
+        batch = await sync_to_async(list)(islice(lines, size))
+        if not batch:
+            return
+        for line in batch:
+            yield line
+
+
+def asynchronous(view):
+    """The async version of a report view for ASGI deployments
+
+    The report is built in the request's worker thread as before. Given a
+    plain iterator, Django's ASGI handler reads a whole streaming response
+    into memory before sending any of it, so exports stream from an async
+    iterator pulling a batch of lines at a time instead.
+    """
+    @wraps(view)
+    async def async_view(request, *args, **kwargs):
+        response = await sync_to_async(view)(request, *args, **kwargs)
+        if response.streaming and not response.is_async:
+            response.streaming_content = in_batches(response.streaming_content)
+        return response
+    return async_view
+
+
+def _with_header(rows, columns):
+    yield { column: column for column in columns }
+    yield from rows
@@ -1,69 +1,46 @@
-"""Module for generating games by user report"""
-import sqlite3
+"""Module for generating events by user report"""
+from django.db.models import F
 from django.shortcuts import render
-from levelupapi.models import Event
-from levelupreports.views import Connection
+from levelupreports.models import UserEvent
+from levelupreports.views.export import EXPORT_FORMATS, export_response, group_rows
+
+def userevent_rows():
+    """Report rows from the UserEvent table, one user at a time"""
+    return (
+        UserEvent.objects
+        .order_by('user_id', 'date', 'time', 'event_id')
+        .values(
+            'user_id', 'full_name', 'creator_id', 'date', 'time', 'location', 'game_name',
+            id=F('event_id')
+        )
+        .iterator(chunk_size=2000)
+    )
+
+def group_events(rows):
+    """Group report rows into one entry per user with their events"""
+    return group_rows(
+        rows, key='user_id', fields=('full_name', ), items='events',
+        item_fields=('id', 'creator_id', 'date', 'time', 'location', 'game_name')
+    )
 
 def userevent_list(request):
-    """Function to build an HTML report of games by user"""
-    if request.method == 'GET':
-        # Connect to project database
-        with sqlite3.connect(Connection.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            db_cursor = conn.cursor()
-
-            # Query for all games, with related user info
-            db_cursor.execute("""
-                SELECT
-                    e.id,
-                    e.creator_id,
-                    e.date,
-                    e.time,
-                    e.location,
-                    game.name AS game_name,
-                    u.first_name || ' ' || u.last_name AS full_name,
-                    u.id AS user_id
-                FROM
-                    levelupapi_event e
-                JOIN
-                    levelupapi_game game ON e.game_id = game.id
-                JOIN
-                    levelupapi_eventgamer eg ON e.id = eg.event_id
-                JOIN
-                    levelupapi_gamer g ON eg.gamer_id = g.id
-                JOIN
-                    auth_user u ON g.user_id = u.id
-            """)
-
-            dataset = db_cursor.fetchall()
-
-            events_by_user = {}
-
-            for row in dataset:
-                event = Event()
-                event.id = row['id']
-                event.date = row['date']
-                event.time = row['time']
-                event.location = row['location']
-                event.creator_id = row['creator_id']
-                event.game_name = row['game_name']
+    """Function to build an HTML report of events by user
 
-                uid = row['user_id']
-
-                if uid in events_by_user:
-                    events_by_user[uid]['events'].append(event)
-                else:
-                    events_by_user[uid] = {
-                        "organizer_id": event.creator_id,
-                        "full_name": row['full_name'],
-                        "events": [ event ]
-                    }
-
-            user_events_list = events_by_user.values()
-
-            template = "users/list_with_events.html"
-            context = {
-                "user_events": user_events_list
-            }
-
-            return render(request, template, context)
+    ?format=csv and ?format=ndjson stream the report instead
+    """
+    if request.method == 'GET':
+        export_format = request.GET.get('format', None)
+        if export_format in EXPORT_FORMATS:
+            return export_response(
+                export_format, userevent_rows(),
+                columns=('user_id', 'full_name', 'id', 'creator_id', 'date', 'time', 'location', 'game_name'),
+                filename='userevents', group=group_events
+            )
+
+        # The groups are built as the template walks them
+        template = "users/list_with_events.html"
+        context = {
+            "user_events": group_events(userevent_rows())
+        }
+
+        return render(request, template, context)
@@ -1 +1,19 @@
 from .game_tests import GameTests
+from .event_tests import EventTests
+from .query_count_tests import QueryCountTests
+from .authentication_tests import AuthenticationTests
+from .report_tests import ReportTests
+from .seed_tests import SeedTests
+from .instrumentation_tests import InstrumentationTests, FingerprintTests
+from .conditional_get_tests import ConditionalGetTests
+from .response_cache_tests import ResponseCacheTests
+from .fast_json_tests import FastJsonTests, FlatSerializerTests, ORJSONRendererTests
+from .sparse_fields_tests import SparseFieldsTests
+from .bulk_tests import BulkTests
+from .async_views_tests import AsyncViewTests, ConcurrentlyTests
+from .calendar_tests import CalendarTests
+from .search_tests import SearchTests
+from .recommendation_tests import RecommendationTests
+from .replica_tests import ReplicaTests
+from .database_tests import DatabaseProfileTests
+from .login_tests import LoginTests
@@ -0,0 +1,171 @@
+import importlib
+import json
+import sys
+import threading
+from unittest import mock
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.db import connection, transaction
+from django.test import TransactionTestCase, override_settings
+from django.urls import resolve
+from rest_framework import status
+from rest_framework.test import APITestCase
+from levelupapi.cache import response_cache
+from levelupapi.models import GameType, Game, Event, EventGamer, Gamer
+from levelupapi.views.asynchronous import concurrently
+
+
+def async_urlconf():
+    """levelup.urls imported again with ASYNC_READ_VIEWS on"""
+    with override_settings(ASYNC_READ_VIEWS=True), mock.patch.dict(sys.modules):
+        for name in ('levelup.urls', 'levelupreports.urls'):
+            sys.modules.pop(name, None)
+        return importlib.import_module('levelup.urls')
+
+
+@override_settings(GAMER_TOKEN_CACHE=None, RESPONSE_CACHE=None)
+class AsyncViewTests(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.enterClassContext(override_settings(ROOT_URLCONF=async_urlconf()))
+
+    def setUp(self):
+        """
+        Create a new account with a game and an event it signed up for
+        """
+        url = "/register"
+        data = {
+            "username": "jweckert17",
+            "password": "hunter2",
+            "email": "jweckert17@gmail.com",
+            "first_name": "Jacob",
+            "last_name": "Eckert",
+            "bio": "Just a hardcore gamer 1337!"
+        }
+        response = self.client.post(url, data, format='json')
+        self.token = 'Token ' + json.loads(response.content)['token']
+        self.client.credentials(HTTP_AUTHORIZATION=self.token)
+
+        self.gamer = Gamer.objects.get(user__username="jweckert17")
+        game_type = GameType.objects.create(name="Board game")
+        for name in ("Clue", "Risk"):
+            game = Game.objects.create(
+                name=name, num_players=4, skill_level=3,
+                creator=self.gamer, game_type=game_type
+            )
+            event = Event.objects.create(
+                date="2020-11-01", time="18:00", location=f"{name} table",
+                creator=self.gamer, game=game
+            )
+        EventGamer.objects.create(event=event, gamer=self.gamer)
+
+    def aget(self, url, **headers):
+        """GET url through the ASGI handler"""
+        return async_to_sync(self.async_client.get)(
+            url, headers={'authorization': self.token, **headers}
+        )
+
+    def test_read_views_are_async(self):
+        """
+        Ensure only the read endpoints and login are routed as async views
+        """
+        for url in ("/games", "/events", "/profile", "/reports/usergames", "/login"):
+            self.assertTrue(iscoroutinefunction(resolve(url).func), url)
+        for url in ("/gametypes", "/games/1", "/register"):
+            self.assertFalse(iscoroutinefunction(resolve(url).func), url)
+
+    def test_async_views_match_sync_views(self):
+        """
+        Ensure async views answer exactly like the sync ones
+        """
+        urls = (
+            "/games", "/games?limit=1&offset=1", "/games?pagination=cursor&limit=1",
+            "/events", "/events?limit=1", "/profile", "/profile?fields=events.id",
+        )
+        for url in urls:
+            with override_settings(ROOT_URLCONF='levelup.urls'):
+                expected = self.client.get(url)
+
+            response = self.aget(url)
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK, url)
+            self.assertEqual(json.loads(response.content), json.loads(expected.content), url)
+
+    def test_page_counted_while_read(self):
+        """
+        Ensure an offset page still counts every event
+        """
+        response = self.aget("/events?limit=1")
+
+        body = json.loads(response.content)
+        self.assertEqual(body['count'], 2)
+        self.assertEqual(len(body['results']), 1)
+        self.assertIsNotNone(body['next'])
+
+    @override_settings(RESPONSE_CACHE={'ALIAS': 'responses', 'TIMEOUT': 300})
+    def test_async_list_cached_and_conditional(self):
+        """
+        Ensure async lists are cached and answer If-None-Match with 304
+        """
+        response_cache.clear()
+
+        response = self.aget("/games")
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+        self.assertEqual(self.aget("/games")['X-Cache'], 'HIT')
+        response = self.aget("/games", if_none_match=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_other_actions_and_auth(self):
+        """
+        Ensure writes still work on async views and reads still need a token
+        """
+        data = {"name": "Go", "numPlayers": 2, "skillLevel": 5, "gameTypeId": GameType.objects.get().id}
+        response = async_to_sync(self.async_client.post)(
+            "/games", data, content_type="application/json", headers={'authorization': self.token}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = async_to_sync(self.async_client.get)("/games")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_export_streams_asynchronously(self):
+        """
+        Ensure report exports stream from an async iterator
+        """
+        response = await self.async_client.get("/reports/usergames?format=csv")
+
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        lines = content.splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn("Jacob Eckert", lines[1])
+
+
+class ConcurrentlyTests(TransactionTestCase):
+    def test_calls_get_own_threads(self):
+        """
+        Ensure calls outside a transaction run in threads of their own
+        """
+        GameType.objects.create(name="Board game")
+
+        def call():
+            return threading.get_ident(), GameType.objects.count()
+
+        results = async_to_sync(concurrently)(call, call)
+
+        self.assertEqual([count for _, count in results], [1, 1])
+        self.assertNotIn(threading.get_ident(), [ident for ident, _ in results])
+
+    def test_calls_share_transaction(self):
+        """
+        Ensure calls inside a transaction see its writes on its connection
+        """
+        def call():
+            return connection.in_atomic_block, GameType.objects.count()
+
+        with transaction.atomic():
+            GameType.objects.create(name="Board game")
+            results = async_to_sync(concurrently)(call, call)
+
+        self.assertEqual(results, [(True, 1), (True, 1)])
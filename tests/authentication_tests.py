@@ -0,0 +1,79 @@
+import json
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+from levelupapi.authentication import token_cache
+from levelupapi.models import Gamer
+
+@override_settings(GAMER_TOKEN_CACHE={'MAX_SIZE': 10, 'TIMEOUT': 60})
+class AuthenticationTests(APITestCase):
+    def setUp(self):
+        """
+        Create a new account with an empty token cache
+        """
+        token_cache.clear()
+
+        url = "/register"
+        data = {
+            "username": "jweckert17",
+            "password": "hunter2",
+            "email": "jweckert17@gmail.com",
+            "first_name": "Jacob",
+            "last_name": "Eckert",
+            "bio": "Just a hardcore gamer 1337!"
+        }
+        response = self.client.post(url, data, format='json')
+        self.token = json.loads(response.content)['token']
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token)
+
+    def test_cached_token_skips_query(self):
+        """
+        Ensure a repeat request is authenticated without touching the database
+        """
+        with self.assertNumQueries(2):
+            self.client.get("/profile")
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/profile")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_gamer_change_evicts_token(self):
+        """
+        Ensure a changed gamer is reloaded instead of served from the cache
+        """
+        self.client.get("/profile")
+
+        gamer = Gamer.objects.get(user__username="jweckert17")
+        gamer.bio = "Retired"
+        gamer.save()
+
+        response = self.client.get("/profile")
+        self.assertEqual(json.loads(response.content)["gamer"]["bio"], "Retired")
+
+    def test_deleted_token_is_rejected(self):
+        """
+        Ensure a deleted token stops authenticating immediately
+        """
+        self.client.get("/profile")
+
+        Token.objects.get(key=self.token).delete()
+
+        response = self.client.get("/profile")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_requests_get_their_own_instances(self):
+        """
+        Ensure changes a request makes to its user and gamer don't reach the
+        cached token or other requests
+        """
+        request = self.client.get("/profile").wsgi_request
+        request.user.first_name = "Changed"
+        request.user.gamer.bio = "Changed"
+
+        response = self.client.get("/profile")
+        self.assertEqual(json.loads(response.content)["gamer"]["bio"], "Just a hardcore gamer 1337!")
+        self.assertIsNot(response.wsgi_request.user, request.user)
+        self.assertIs(response.wsgi_request.user.gamer.user, response.wsgi_request.user)
+        self.assertEqual(token_cache.get(self.token).user.first_name, "Jacob")
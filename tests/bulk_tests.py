@@ -0,0 +1,158 @@
+import json
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from levelupapi.cache import response_cache
+from levelupapi.models import GameType, Game, Event, EventGamer, Gamer
+from levelupreports.models import UserEvent, UserGame
+
+class BulkTests(APITestCase):
+    def setUp(self):
+        """
+        Create a new account, a sample game type and a sample game
+        """
+        response_cache.clear()
+
+        url = "/register"
+        data = {
+            "username": "jweckert17",
+            "password": "hunter2",
+            "email": "jweckert17@gmail.com",
+            "first_name": "Jacob",
+            "last_name": "Eckert",
+            "bio": "Just a hardcore gamer 1337!"
+        }
+        response = self.client.post(url, data, format='json')
+        json_response = json.loads(response.content)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + json_response['token'])
+
+        self.gamer = Gamer.objects.get(user__username="jweckert17")
+        self.game_type = GameType.objects.create(name="Board game")
+        self.game = Game.objects.create(
+            name="Clue", num_players=2, skill_level=3,
+            creator=self.gamer, game_type=self.game_type
+        )
+
+    def create_events(self, count):
+        """Create `count` events of the sample game and return their ids"""
+        return [
+            Event.objects.create(
+                date="2020-11-01", time="18:00", location=f"Table {i}",
+                creator=self.gamer, game=self.game
+            ).id
+            for i in range(count)
+        ]
+
+    def test_bulk_create_games(self):
+        """
+        Ensure a batch of games is created with a fixed number of queries
+        """
+        items = [
+            {"name": f"Game {i}", "numPlayers": 4, "skillLevel": 2, "gameTypeId": self.game_type.id}
+            for i in range(50)
+        ]
+
+        with self.assertNumQueries(11):
+            response = self.client.post("/games/bulk", items, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        results = json.loads(response.content)['results']
+        self.assertEqual(len(results), 50)
+        game = Game.objects.get(pk=results[3]['id'])
+        self.assertEqual(game.name, "Game 3")
+        self.assertEqual(game.creator, self.gamer)
+        self.assertEqual(UserGame.objects.filter(game_id__in=[r['id'] for r in results]).count(), 50)
+
+    def test_bulk_create_is_all_or_nothing(self):
+        """
+        Ensure one bad item fails the whole batch with per-item results
+        """
+        items = [
+            {"name": "Good", "numPlayers": 4, "skillLevel": 2, "gameTypeId": self.game_type.id},
+            {"name": "Bad", "numPlayers": "lots", "skillLevel": 2, "gameTypeId": self.game_type.id},
+            {"name": "Orphan", "numPlayers": 4, "skillLevel": 2, "gameTypeId": 9999},
+        ]
+
+        response = self.client.post("/games/bulk", items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        results = json.loads(response.content)['results']
+        self.assertEqual(results[0]['status'], status.HTTP_424_FAILED_DEPENDENCY)
+        self.assertIn('numPlayers', results[1]['errors'])
+
+        del items[1]
+        response = self.client.post("/games/bulk", items, format='json')
+        results = json.loads(response.content)['results']
+        self.assertEqual(results[1], {"status": 404, "message": "Game type does not exist."})
+
+        self.assertEqual(Game.objects.count(), 1)
+
+    def test_bulk_create_events(self):
+        """
+        Ensure a batch of events is created and shows up in the events list
+        """
+        self.client.get("/events")
+        items = [
+            {"gameId": self.game.id, "date": "2020-12-0{}".format(i + 1), "time": "19:30", "location": f"Room {i}"}
+            for i in range(3)
+        ]
+
+        response = self.client.post("/events/bulk", items, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.get("/events")
+        self.assertEqual(json.loads(response.content)['count'], 3)
+
+    def test_bulk_signup(self):
+        """
+        Ensure a gamer can sign up for a batch of events at once
+        """
+        event_ids = self.create_events(3)
+        self.client.get(f"/events/{event_ids[0]}")
+
+        response = self.client.post(
+            "/events/signup/bulk", [{"eventId": event_id} for event_id in event_ids], format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(EventGamer.objects.filter(gamer=self.gamer).count(), 3)
+        self.assertEqual(UserEvent.objects.filter(user=self.gamer.user).count(), 3)
+        response = self.client.get(f"/events/{event_ids[0]}")
+        self.assertTrue(json.loads(response.content)['joined'])
+
+    def test_bulk_signup_rejects_duplicates_and_missing(self):
+        """
+        Ensure existing, repeated and missing events fail the batch
+        """
+        event_ids = self.create_events(2)
+        EventGamer.objects.create(event_id=event_ids[0], gamer=self.gamer)
+        items = [{"eventId": event_ids[0]}, {"eventId": event_ids[1]}, {"eventId": event_ids[1]}, {"eventId": 9999}]
+
+        response = self.client.post("/events/signup/bulk", items, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        statuses = [result['status'] for result in json.loads(response.content)['results']]
+        self.assertEqual(statuses, [422, 424, 422, 404])
+        self.assertEqual(EventGamer.objects.count(), 1)
+
+    @override_settings(ENFORCE_EVENT_CAPACITY=True)
+    def test_bulk_signup_capacity(self):
+        """
+        Ensure a full event fails the batch when capacity is enforced
+        """
+        event_id = self.create_events(1)[0]
+        for name in ("a", "b"):
+            from django.contrib.auth import get_user_model
+            user = get_user_model().objects.create_user(username=name, password="pw")
+            EventGamer.objects.create(event_id=event_id, gamer=Gamer.objects.create(user=user, bio=""))
+
+        response = self.client.post("/events/signup/bulk", [{"eventId": event_id}], format='json')
+
+        self.assertEqual(json.loads(response.content)['results'][0]['message'], "Event is full.")
+
+    def test_bulk_requires_a_list(self):
+        """
+        Ensure the body must be a non-empty list
+        """
+        response = self.client.post("/games/bulk", {"name": "Clue"}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,155 @@
+import json
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from levelupapi.models import GameType, Game, Event, EventGamer, Gamer
+
+User = get_user_model()
+
+@override_settings(GAMER_TOKEN_CACHE=None, RESPONSE_CACHE=None)
+class CalendarTests(APITestCase):
+    def setUp(self):
+        """
+        Create a new account and events across two months for two games
+        """
+        url = "/register"
+        data = {
+            "username": "jweckert17",
+            "password": "hunter2",
+            "email": "jweckert17@gmail.com",
+            "first_name": "Jacob",
+            "last_name": "Eckert",
+            "bio": "Just a hardcore gamer 1337!"
+        }
+        response = self.client.post(url, data, format='json')
+        json_response = json.loads(response.content)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + json_response['token'])
+
+        self.gamer = Gamer.objects.get(user__username="jweckert17")
+        other = User.objects.create_user(username="other", password="hunter2")
+        self.other = Gamer.objects.create(user=other, bio="")
+
+        game_type = GameType.objects.create(name="Board game")
+        self.clue, self.risk = (
+            Game.objects.create(
+                name=name, num_players=4, skill_level=3,
+                creator=self.gamer, game_type=game_type
+            )
+            for name in ("Clue", "Risk")
+        )
+
+        self.events = {}
+        for day, game, creator in (
+            ("2020-10-31", self.clue, self.gamer),
+            ("2020-11-01", self.clue, self.gamer),
+            ("2020-11-01", self.risk, self.other),
+            ("2020-11-15", self.risk, self.gamer),
+            ("2020-12-01", self.clue, self.other),
+        ):
+            self.events[(day, game.name)] = Event.objects.create(
+                date=day, time="18:00", location="Kitchen", creator=creator, game=game
+            )
+
+    def event_ids(self, url):
+        """GET an events list and return the ids it lists"""
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [event["id"] for event in json.loads(response.content)["results"]]
+
+    def plan(self, url):
+        """GET url and return the SQLite query plan of its events query"""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        sql = next(
+            query["sql"] for query in context.captured_queries
+            if query["sql"].startswith("SELECT") and 'FROM "levelupapi_event"' in query["sql"]
+            and "COUNT(*)" not in query["sql"]
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql)
+            return " ".join(row[-1] for row in cursor.fetchall())
+
+    def test_date_window(self):
+        """
+        Ensure ?from= and ?to= keep the events within the dates, inclusive
+        """
+        ids = self.event_ids("/events?from=2020-11-01&to=2020-11-15")
+
+        self.assertEqual(ids, [
+            self.events[("2020-11-01", "Clue")].id,
+            self.events[("2020-11-01", "Risk")].id,
+            self.events[("2020-11-15", "Risk")].id,
+        ])
+
+    def test_game_creator_and_joined_filters(self):
+        """
+        Ensure ?gameId=, ?creator= and ?joined= filter the events
+        """
+        self.assertEqual(
+            self.event_ids(f"/events?gameId={self.risk.id}"),
+            [self.events[("2020-11-01", "Risk")].id, self.events[("2020-11-15", "Risk")].id]
+        )
+        self.assertEqual(
+            self.event_ids(f"/events?creator={self.other.id}"),
+            [self.events[("2020-11-01", "Risk")].id, self.events[("2020-12-01", "Clue")].id]
+        )
+
+        attending = self.events[("2020-11-15", "Risk")]
+        EventGamer.objects.create(event=attending, gamer=self.gamer)
+        self.assertEqual(self.event_ids("/events?joined=true"), [attending.id])
+        self.assertEqual(len(self.event_ids("/events?joined=false")), 4)
+
+    def test_invalid_filters(self):
+        """
+        Ensure malformed filter values are a 400 rather than a server error
+        """
+        for url in (
+            "/events?from=yesterday", "/events?gameId=clue", "/events?joined=yes",
+            "/events/calendar?month=2020-13", "/events/calendar?month=9999-12",
+        ):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, url)
+
+        response = self.client.get("/events/calendar")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_calendar_month(self):
+        """
+        Ensure the calendar counts the month's events per day
+        """
+        response = self.client.get("/events/calendar?month=2020-11")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), {
+            "month": "2020-11",
+            "days": [
+                { "date": "2020-11-01", "count": 2 },
+                { "date": "2020-11-15", "count": 1 },
+            ]
+        })
+
+        response = self.client.get(f"/events/calendar?month=2020-11&gameId={self.clue.id}")
+        self.assertEqual(json.loads(response.content)["days"], [{ "date": "2020-11-01", "count": 1 }])
+
+    def test_date_window_uses_calendar_index(self):
+        """
+        Ensure a date window is a range search of the calendar index
+        """
+        plan = self.plan("/events?from=2020-11-01&to=2020-11-30")
+
+        self.assertIn("levelupapi_event USING INDEX event_calendar_idx (date>? AND date<?)", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_calendar_uses_covering_index(self):
+        """
+        Ensure the calendar counts days from the calendar index alone
+        """
+        plan = self.plan("/events/calendar?month=2020-11")
+
+        self.assertIn("USING COVERING INDEX event_calendar_idx (date>? AND date<?)", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
@@ -0,0 +1,155 @@
+import json
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from levelupapi.models import GameType, Game, Event, EventGamer, Gamer
+
+User = get_user_model()
+
+@override_settings(GAMER_TOKEN_CACHE=None, RESPONSE_CACHE=None)
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        """
+        Create a new account with a game and an event
+        """
+        url = "/register"
+        data = {
+            "username": "jweckert17",
+            "password": "hunter2",
+            "email": "jweckert17@gmail.com",
+            "first_name": "Jacob",
+            "last_name": "Eckert",
+            "bio": "Just a hardcore gamer 1337!"
+        }
+        response = self.client.post(url, data, format='json')
+        json_response = json.loads(response.content)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + json_response['token'])
+
+        self.gamer = Gamer.objects.get(user__username="jweckert17")
+        self.game_type = GameType.objects.create(name="Board game")
+        self.game = Game.objects.create(
+            name="Clue", num_players=4, skill_level=3,
+            creator=self.gamer, game_type=self.game_type
+        )
+        self.event = Event.objects.create(
+            date="2020-11-01", time="18:00", location="Table 1",
+            creator=self.gamer, game=self.game
+        )
+
+    def revalidate(self, url):
+        """GET url, then GET it again with the returned ETag"""
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response['ETag'], self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_unchanged_games_not_modified(self):
+        """
+        Ensure an unchanged games list answers 304 without loading the games
+        """
+        etag = self.client.get("/games")['ETag']
+
+        with self.assertNumQueries(2):
+            response = self.client.get("/games", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+    def test_changed_games_modified(self):
+        """
+        Ensure saving a game or its game type changes the games list ETag
+        """
+        etag = self.client.get("/games")['ETag']
+        self.game.name = "Cluedo"
+        self.game.save()
+
+        response = self.client.get("/games", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content)['results'][0]['name'], "Cluedo")
+
+        etag = response['ETag']
+        self.game_type.name = "Party game"
+        self.game_type.save()
+
+        response = self.client.get("/games", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_filters_and_pages_have_own_etags(self):
+        """
+        Ensure an ETag only matches the page and filter it was issued for
+        """
+        etag = self.client.get("/games")['ETag']
+
+        response = self.client.get(f"/games?type={self.game_type.id}", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_game_types_not_modified_until_added(self):
+        """
+        Ensure adding a game type changes the game types list ETag
+        """
+        etag, response = self.revalidate("/gametypes")
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        GameType.objects.create(name="Card game")
+
+        response = self.client.get("/gametypes", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_event_etag_follows_signup(self):
+        """
+        Ensure joining an event changes its ETag for the gamer
+        """
+        url = f"/events/{self.event.id}"
+        etag, response = self.revalidate(url)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.post(f"{url}/signup")
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(json.loads(response.content)['joined'])
+
+    def test_event_etag_follows_swapped_attendee(self):
+        """
+        Ensure a cancellation followed by another gamer's signup changes the
+        event's ETag, though the attendee count is back where it was
+        """
+        first, second = (
+            Gamer.objects.create(user=User.objects.create_user(username=name, password="hunter2"))
+            for name in ("attendee1", "attendee2")
+        )
+        EventGamer.objects.create(event=self.event, gamer=first)
+        url = f"/events/{self.event.id}?attendees=5"
+        etag = self.client.get(url)['ETag']
+
+        EventGamer.objects.filter(event=self.event, gamer=first).delete()
+        EventGamer.objects.create(event=self.event, gamer=second)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_creator_name_change_modified(self):
+        """
+        Ensure renaming a creator changes the ETags of their games and events
+        """
+        games_etag = self.client.get("/games")['ETag']
+        event_etag = self.client.get(f"/events/{self.event.id}")['ETag']
+
+        user = self.gamer.user
+        user.first_name = "Jake"
+        user.save()
+
+        response = self.client.get("/games", HTTP_IF_NONE_MATCH=games_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(f"/events/{self.event.id}", HTTP_IF_NONE_MATCH=event_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_missing_event_not_found(self):
+        """
+        Ensure a missing event is still a 404
+        """
+        response = self.client.get("/events/9999", HTTP_IF_NONE_MATCH='"abc"')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
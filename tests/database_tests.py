@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase
+
+
+class DatabaseProfileTests(TestCase):
+    def pragma(self, name):
+        """The value of a PRAGMA on the default connection"""
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_connection_pragmas(self):
+        """
+        Ensure every connection opens with the SQLITE_PRAGMAS applied
+        """
+        self.assertEqual(self.pragma("synchronous"), 1)
+        self.assertEqual(self.pragma("busy_timeout"), settings.SQLITE_PRAGMAS['busy_timeout'])
+        self.assertEqual(self.pragma("cache_size"), settings.SQLITE_PRAGMAS['cache_size'])
+
+    def test_transactions_take_write_lock(self):
+        """
+        Ensure transactions begin IMMEDIATE, waiting for the write lock up front
+        """
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
@@ -0,0 +1,296 @@
+import json
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from levelupapi.cache import response_cache
+from levelupapi.models import GameType, Game, Event, EventGamer, Gamer
+
+User = get_user_model()
+
+class EventTests(APITestCase):
+    def setUp(self):
+        """
+        Create a new account, a sample game type and a sample game
+        """
+        response_cache.clear()
+        url = "/register"
+        data = {
+            "username": "jweckert17",
+            "password": "hunter2",
+            "email": "jweckert17@gmail.com",
+            "first_name": "Jacob",
+            "last_name": "Eckert",
+            "bio": "Just a hardcore gamer 1337!"
+        }
+        response = self.client.post(url, data, format='json')
+        json_response = json.loads(response.content)
+
+        self.token = json_response['token']
+        self.gamer = Gamer.objects.get(user__username="jweckert17")
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token)
+
+        gametype = GameType()
+        gametype.name = "Board game"
+        gametype.save()
+
+        self.game = Game.objects.create(
+            name="Clue", num_players=4, skill_level=3,
+            creator=self.gamer, game_type=gametype
+        )
+
+    def create_events(self, count, date="2020-11-01"):
+        """Seed the DB with `count` events for the sample game"""
+        return [
+            Event.objects.create(
+                date=date, time="18:00", location=f"Table {i}",
+                creator=self.gamer, game=self.game
+            )
+            for i in range(count)
+        ]
+
+    def eventgamer_queries(self, url):
+        """GET url and return the queries that touched the EventGamer table"""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return [
+            query for query in context.captured_queries
+            if EventGamer._meta.db_table in query['sql']
+        ]
+
+    def test_list_events_joined(self):
+        """
+        Ensure the event list flags the events the gamer has signed up for
+        """
+        attending, skipping = self.create_events(2)
+        EventGamer.objects.create(event=attending, gamer=self.gamer)
+
+        response = self.client.get("/events")
+        json_response = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        joined = { event["id"]: event["joined"] for event in json_response["results"] }
+        self.assertEqual(joined, { attending.id: True, skipping.id: False })
+
+    def test_get_event_joined(self):
+        """
+        Ensure a single event reports whether the gamer has signed up
+        """
+        event = self.create_events(1)[0]
+
+        response = self.client.get(f"/events/{event.id}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(json.loads(response.content)["joined"])
+
+        EventGamer.objects.create(event=event, gamer=self.gamer)
+
+        response = self.client.get(f"/events/{event.id}")
+        self.assertTrue(json.loads(response.content)["joined"])
+
+    def test_list_events_joined_query_count(self):
+        """
+        Ensure the joined flag costs a single query however many events exist
+        """
+        self.create_events(1)
+        self.assertEqual(len(self.eventgamer_queries("/events")), 1)
+
+        self.create_events(20)
+        self.assertEqual(len(self.eventgamer_queries("/events")), 1)
+
+    def test_list_events_offset_pagination(self):
+        """
+        Ensure events are paginated with limit/offset by default
+        """
+        later = self.create_events(2, date="2020-12-01")
+        earlier = self.create_events(3, date="2020-11-01")
+
+        response = self.client.get("/events?limit=2&offset=2")
+        json_response = json.loads(response.content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json_response["count"], 5)
+        self.assertEqual(
+            [event["id"] for event in json_response["results"]],
+            [earlier[2].id, later[0].id]
+        )
+
+    def test_list_events_cursor_pagination(self):
+        """
+        Ensure following cursor links walks every event in calendar order
+        """
+        later = self.create_events(3, date="2020-12-01")
+        earlier = self.create_events(2, date="2020-11-01")
+
+        ids = []
+        url = "/events?pagination=cursor&limit=2"
+        while url is not None:
+            response = self.client.get(url)
+            json_response = json.loads(response.content)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(json_response["results"]), 2)
+
+            ids.extend(event["id"] for event in json_response["results"])
+            url = json_response["next"]
+
+        self.assertEqual(ids, [event.id for event in earlier + later])
+
+    def test_cursor_pages_seek_past_last_event(self):
+        """
+        Ensure events added before a cursor's position on the same date
+        neither shift the next page nor show up on it, and the previous
+        page leads back to the first
+        """
+        events = self.create_events(4)
+
+        first = json.loads(self.client.get("/events?pagination=cursor&limit=2").content)
+        Event.objects.create(
+            date="2020-11-01", time="17:00", location="Porch",
+            creator=self.gamer, game=self.game
+        )
+        second = json.loads(self.client.get(first["next"]).content)
+
+        self.assertEqual([event["id"] for event in second["results"]], [events[2].id, events[3].id])
+        self.assertIsNone(second["next"])
+
+        previous = json.loads(self.client.get(second["previous"]).content)
+        self.assertEqual([event["id"] for event in previous["results"]], [events[0].id, events[1].id])
+
+        response = self.client.get("/events?pagination=cursor&cursor=cD1ub3Q%3D")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_signup_for_event(self):
+        """
+        Ensure a gamer can sign up for an event exactly once
+        """
+        event = self.create_events(1)[0]
+
+        response = self.client.post(f"/events/{event.id}/signup")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.post(f"/events/{event.id}/signup")
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+        self.assertEqual(EventGamer.objects.filter(event=event, gamer=self.gamer).count(), 1)
+
+    def test_signup_for_missing_event(self):
+        """
+        Ensure signing up for an event that does not exist is a 404
+        """
+        response = self.client.post("/events/999/signup")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(ENFORCE_EVENT_CAPACITY=True)
+    def test_signup_for_full_event(self):
+        """
+        Ensure signups stop once the game's num_players are registered
+        """
+        event = self.create_events(1)[0]
+        self.game.num_players = 1
+        self.game.save()
+
+        other = User.objects.create_user(username="other", password="hunter2")
+        EventGamer.objects.create(event=event, gamer=Gamer.objects.create(user=other, bio=""))
+
+        response = self.client.post(f"/events/{event.id}/signup")
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertFalse(EventGamer.objects.filter(event=event, gamer=self.gamer).exists())
+
+        self.game.num_players = 2
+        self.game.save()
+
+        response = self.client.post(f"/events/{event.id}/signup")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def sign_up(self, event, count):
+        """Register `count` new gamers for `event`, in order"""
+        for i in range(count):
+            user = User.objects.create_user(
+                username=f"attendee{event.id}_{i}", password="hunter2",
+                first_name=f"Gamer{i}", last_name="Smith"
+            )
+            EventGamer.objects.create(event=event, gamer=Gamer.objects.create(user=user, bio=""))
+
+    def test_list_events_attendance(self):
+        """
+        Ensure events report their attendee count and spots left
+        """
+        full, open_event = self.create_events(2)
+        self.sign_up(full, 4)
+        self.sign_up(open_event, 1)
+
+        response = self.client.get("/events")
+
+        attendance = {
+            event["id"]: (event["attendee_count"], event["spots_left"])
+            for event in json.loads(response.content)["results"]
+        }
+        self.assertEqual(attendance, { full.id: (4, 0), open_event.id: (1, 3) })
+
+    def test_list_events_has_space_and_fill_rate(self):
+        """
+        Ensure events filter on ?has_space= and sort on ?ordering=fill_rate
+        """
+        full, half, empty = self.create_events(3)
+        self.sign_up(full, 4)
+        self.sign_up(half, 2)
+
+        response = self.client.get("/events?has_space=true")
+        ids = [event["id"] for event in json.loads(response.content)["results"]]
+        self.assertEqual(ids, [half.id, empty.id])
+
+        response = self.client.get("/events?has_space=false")
+        self.assertEqual(json.loads(response.content)["count"], 1)
+
+        response = self.client.get("/events?ordering=-fill_rate")
+        ids = [event["id"] for event in json.loads(response.content)["results"]]
+        self.assertEqual(ids, [full.id, half.id, empty.id])
+
+    def test_list_events_rejects_unusable_space_and_ordering(self):
+        """
+        Ensure a malformed ?has_space= and a fill rate ordering of cursor
+        pages are answered 400 rather than ignored
+        """
+        for url in ("/events?has_space=yes", "/events?pagination=cursor&ordering=fill_rate"):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_events_first_attendees(self):
+        """
+        Ensure ?attendees=N lists the first N attendees in one extra query
+        """
+        events = self.create_events(3)
+        for event in events:
+            self.sign_up(event, 3)
+
+        response = self.client.get("/events")
+        self.assertNotIn("attendees", json.loads(response.content)["results"][0])
+
+        # The events and their attendees come back in two queries
+        self.assertEqual(len(self.eventgamer_queries("/events?attendees=2")), 2)
+
+        response = self.client.get("/events?attendees=2")
+        for event in json.loads(response.content)["results"]:
+            self.assertEqual(event["attendee_count"], 3)
+            self.assertEqual(
+                [attendee["first_name"] for attendee in event["attendees"]], ["Gamer0", "Gamer1"]
+            )
+
+        response = self.client.get(f"/events/{events[0].id}?attendees=1")
+        self.assertEqual(len(json.loads(response.content)["attendees"]), 1)
+
+    def test_event_etag_follows_attendance(self):
+        """
+        Ensure another gamer signing up changes an event's ETag
+        """
+        event = self.create_events(1)[0]
+        etag = self.client.get(f"/events/{event.id}")["ETag"]
+
+        self.sign_up(event, 1)
+
+        response = self.client.get(f"/events/{event.id}", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content)["spots_left"], 3)
@@ -0,0 +1,120 @@
+import datetime
+import json
+from decimal import Decimal
+from django.test import SimpleTestCase, override_settings
+from rest_framework import serializers, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from levelupapi.models import GameType, Game, Event, EventGamer, Gamer
+from levelupapi.renderers import ORJSONRenderer
+from levelupapi.views.flat import flat_serializer
+
+@override_settings(GAMER_TOKEN_CACHE=None, RESPONSE_CACHE=None)
+class FastJsonTests(APITestCase):
+    def setUp(self):
+        """
+        Create a new account with a few games and events
+        """
+        url = "/register"
+        data = {
+            "username": "jweckert17",
+            "password": "hunter2",
+            "email": "jweckert17@gmail.com",
+            "first_name": "Jacob",
+            "last_name": "Eckert",
+            "bio": "Just a hardcore gamer 1337!"
+        }
+        response = self.client.post(url, data, format='json')
+        json_response = json.loads(response.content)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + json_response['token'])
+
+        gamer = Gamer.objects.get(user__username="jweckert17")
+        game_type = GameType.objects.create(name="Jeu de société")
+        for i in range(3):
+            game = Game.objects.create(
+                name=f"Game {i} \u2028\u2029 ✨", num_players=4, skill_level=3,
+                creator=gamer, game_type=game_type
+            )
+            event = Event.objects.create(
+                date="2020-11-01", time=datetime.time(18, 0, 30, 250), location=f"Table \"{i}\"",
+                creator=gamer, game=game
+            )
+        EventGamer.objects.create(event=event, gamer=gamer)
+
+    def assert_identical(self, url):
+        """Ensure the fast path renders url byte for byte like the serializers"""
+        expected = self.client.get(url)
+
+        with self.settings(FAST_JSON=True):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, expected.content)
+
+    def test_events_identical(self):
+        """
+        Ensure event pages, with their nested game and `joined`, are identical
+        """
+        self.assert_identical("/events")
+        self.assert_identical("/events?limit=2&offset=1")
+        self.assert_identical("/events?pagination=cursor&limit=2")
+
+    def test_games_identical(self):
+        """
+        Ensure game pages are identical
+        """
+        self.assert_identical("/games")
+        self.assert_identical("/games?pagination=cursor&limit=1")
+
+    def test_game_types_identical(self):
+        """
+        Ensure game type pages are identical
+        """
+        self.assert_identical("/gametypes")
+
+    def test_fast_path_skips_model_instances(self):
+        """
+        Ensure the fast path still reads the page in one query
+        """
+        with self.settings(FAST_JSON=True), self.assertNumQueries(3):
+            self.client.get("/events")
+
+
+class BioSerializer(serializers.ModelSerializer):
+    """Serializer with a computed field"""
+    bio_length = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Gamer
+        fields = ('id', 'bio_length')
+
+    def get_bio_length(self, gamer):
+        return len(gamer.bio)
+
+
+class FlatSerializerTests(SimpleTestCase):
+    def test_unsupported_serializer(self):
+        """
+        Ensure serializers with fields the flat path can't reproduce are left alone
+        """
+        self.assertIsNone(flat_serializer(BioSerializer, Gamer))
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_matches_json_renderer(self):
+        """
+        Ensure orjson output matches JSONRenderer's for the types DRF emits
+        """
+        data = {
+            "text": "café \u2028 \"quoted\"",
+            "when": datetime.datetime(2020, 11, 1, 18, 0, 30, 123456, tzinfo=datetime.timezone.utc),
+            "date": datetime.date(2020, 11, 1),
+            "time": datetime.time(18, 0),
+            "amount": Decimal("1.50"),
+            "nested": [1, 2.5, None, True, {"a": []}],
+        }
+
+        with self.settings(FAST_JSON=True):
+            fast = ORJSONRenderer().render(data)
+
+        self.assertEqual(fast, JSONRenderer().render(data))
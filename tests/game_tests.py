@@ -1,6 +1,7 @@
 import json
 from rest_framework import status
 from rest_framework.test import APITestCase
+from levelupapi.cache import response_cache
 from levelupapi.models import GameType, Game
 
 class GameTests(APITestCase):
@@ -8,6 +9,7 @@ class GameTests(APITestCase):
         """
         Create a new account and create sample category
         """
+        response_cache.clear()
 
         # register a user
         url = "/register"
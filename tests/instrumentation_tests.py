@@ -0,0 +1,144 @@
+import json
+import time
+from unittest import mock
+from django.test import SimpleTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from levelup.instrumentation import RequestMetrics, fingerprint
+from levelupapi.models import GameType
+from levelupapi.renderers import ORJSONRenderer
+
+INSTRUMENTATION = {'SLOW_QUERY_MS': 0, 'DUPLICATE_QUERY_THRESHOLD': 2}
+
+
+@override_settings(
+    GAMER_TOKEN_CACHE=None, RESPONSE_CACHE=None, REQUEST_INSTRUMENTATION=INSTRUMENTATION
+)
+class InstrumentationTests(APITestCase):
+    def setUp(self):
+        """
+        Create a new account and a sample game type
+        """
+        url = "/register"
+        data = {
+            "username": "jweckert17",
+            "password": "hunter2",
+            "email": "jweckert17@gmail.com",
+            "first_name": "Jacob",
+            "last_name": "Eckert",
+            "bio": "Just a hardcore gamer 1337!"
+        }
+        with self.assertLogs('levelup.instrumentation', level='INFO'):
+            response = self.client.post(url, data, format='json')
+        json_response = json.loads(response.content)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + json_response['token'])
+
+        GameType.objects.create(name="Board game")
+
+    def records(self, logs, event):
+        """The structured log lines of one kind"""
+        records = [json.loads(record.getMessage()) for record in logs.records]
+        return [record for record in records if record['event'] == event]
+
+    def test_server_timing_header(self):
+        """
+        Ensure responses report their SQL, view, rendering and total time
+        """
+        with self.assertLogs('levelup.instrumentation', level='INFO'):
+            response = self.client.get("/gametypes")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timing = response['Server-Timing']
+        self.assertIn('db;dur=', timing)
+        self.assertIn('desc="4 queries"', timing)
+        self.assertIn('view;dur=', timing)
+        self.assertIn('render;dur=', timing)
+        self.assertIn('total;dur=', timing)
+
+    def test_request_log_names_view(self):
+        """
+        Ensure each request logs one line with its view and query count
+        """
+        with self.assertLogs('levelup.instrumentation', level='INFO') as logs:
+            self.client.get("/gametypes")
+
+        requests = self.records(logs, 'request')
+        self.assertEqual(len(requests), 1)
+        self.assertEqual(requests[0]['view'], 'GameTypes.list')
+        self.assertEqual(requests[0]['status'], 200)
+        self.assertEqual(requests[0]['queries'], 4)
+
+    def test_rendering_timed_apart_from_view(self):
+        """
+        Ensure the renderer's time is reported as rendering, not as the view's
+        """
+        render = ORJSONRenderer.render
+
+        def slow_render(renderer, *args, **kwargs):
+            time.sleep(0.05)
+            return render(renderer, *args, **kwargs)
+
+        with self.assertLogs('levelup.instrumentation', level='INFO') as logs, \
+                mock.patch.object(ORJSONRenderer, 'render', slow_render):
+            self.client.get("/gametypes")
+
+        request = self.records(logs, 'request')[0]
+        self.assertGreaterEqual(request['render_ms'], 50)
+        self.assertLess(request['view_ms'], 50)
+
+    def test_slow_queries_are_logged(self):
+        """
+        Ensure queries past SLOW_QUERY_MS are logged with their SQL and view
+        """
+        with self.assertLogs('levelup.instrumentation', level='INFO') as logs:
+            self.client.get("/gametypes")
+
+        slow = self.records(logs, 'slow_query')
+        self.assertEqual(len(slow), 4)
+        self.assertTrue(all(record['view'] == 'GameTypes.list' for record in slow))
+        self.assertTrue(any('levelupapi_gametype' in record['sql'] for record in slow))
+
+    def test_disabled_by_default(self):
+        """
+        Ensure the middleware stays out of the way unless configured
+        """
+        with self.settings(REQUEST_INSTRUMENTATION=None):
+            self.client.handler.load_middleware()
+            response = self.client.get("/gametypes")
+
+        self.assertNotIn('Server-Timing', response)
+
+
+class FingerprintTests(SimpleTestCase):
+    def test_parameters_are_ignored(self):
+        """
+        Ensure the same statement with other parameters shares a fingerprint
+        """
+        self.assertEqual(
+            fingerprint("SELECT * FROM game WHERE id = 1 AND name = 'Catan'"),
+            fingerprint("SELECT * FROM game WHERE id = 42 AND name = 'Risk'"),
+        )
+        self.assertEqual(
+            fingerprint("SELECT * FROM game WHERE id IN (%s, %s, %s)"),
+            fingerprint("SELECT * FROM game WHERE id IN (%s)"),
+        )
+        self.assertNotEqual(
+            fingerprint("SELECT * FROM game WHERE id = %s"),
+            fingerprint("SELECT * FROM event WHERE id = %s"),
+        )
+
+    def test_repeated_statements_are_duplicates(self):
+        """
+        Ensure a statement run once per row is reported as a duplicate
+        """
+        metrics = RequestMetrics()
+        metrics.record("SELECT * FROM event", 0.001)
+        for pk in range(3):
+            metrics.record(f"SELECT * FROM game WHERE id = {pk}", 0.001)
+
+        duplicates = metrics.duplicates(threshold=2)
+
+        self.assertEqual(len(duplicates), 1)
+        count, sql = next(iter(duplicates.values()))
+        self.assertEqual(count, 3)
+        self.assertEqual(sql, "SELECT * FROM game WHERE id = 0")
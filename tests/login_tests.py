@@ -0,0 +1,239 @@
+import json
+import threading
+from unittest import mock
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.signals import user_login_failed
+from django.core.cache import cache, caches
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from levelupapi.login import hashing_pool, login_throttle
+from .async_views_tests import async_urlconf
+
+User = get_user_model()
+
+LOGIN_THROTTLE = {
+    'IP_ATTEMPTS': 10,
+    'IP_WINDOW': 60,
+    'USERNAME_FAILURES': 3,
+    'USERNAME_WINDOW': 300,
+    'CACHE_ALIAS': 'login-throttle',
+}
+
+@override_settings(LOGIN_THROTTLE=LOGIN_THROTTLE)
+class LoginTests(APITestCase):
+    def setUp(self):
+        """
+        Create a new account, with no login attempts counted and a fresh
+        hashing pool
+        """
+        login_throttle.clear()
+        hashing_pool.shutdown()
+        self.addCleanup(hashing_pool.shutdown)
+
+        url = "/register"
+        data = {
+            "username": "jweckert17",
+            "password": "hunter2",
+            "email": "jweckert17@gmail.com",
+            "first_name": "Jacob",
+            "last_name": "Eckert",
+            "bio": "Just a hardcore gamer 1337!"
+        }
+        response = self.client.post(url, data, format='json')
+        self.token = json.loads(response.content)['token']
+
+    def login(self, password="hunter2", username="jweckert17", **extra):
+        """POST the credentials to /login"""
+        return self.client.post(
+            "/login", { "username": username, "password": password }, format='json', **extra
+        )
+
+    def test_login_returns_token(self):
+        """
+        Ensure a login reads the user and token in one query and checks the
+        password on the hashing pool
+        """
+        with self.assertNumQueries(1):
+            response = self.login()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), { "valid": True, "token": self.token })
+        self.assertEqual(hashing_pool.stats()['completed'], 1)
+
+        for username, password in (("jweckert17", "hunter3"), ("nobody", "hunter2")):
+            response = self.login(password, username)
+            self.assertEqual(json.loads(response.content), { "valid": False })
+        self.assertEqual(hashing_pool.stats()['completed'], 3)
+
+    def test_username_failures_throttled(self):
+        """
+        Ensure a username is locked out after USERNAME_FAILURES failures
+        without hashing, whichever address the attempts come from
+        """
+        for attempt in range(3):
+            self.login("wrong", REMOTE_ADDR=f"10.0.0.{attempt}")
+
+        with mock.patch.object(hashing_pool, 'submit') as submit:
+            response = self.login(REMOTE_ADDR="10.0.0.9")
+
+        submit.assert_not_called()
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '300')
+        self.assertEqual(login_throttle.stats()['rejected_username'], 1)
+
+    def test_attempts_counted_before_hashing(self):
+        """
+        Ensure attempts still being checked count against the username, so
+        a burst of them can't all get past the limit
+        """
+        waits = [login_throttle.attempt("JWeckert17", f"10.0.0.{attempt}") for attempt in range(5)]
+
+        self.assertEqual(waits, [None, None, None, 300, 300])
+        self.assertEqual(self.login().status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_failed_login_signalled(self):
+        """
+        Ensure logins go through authenticate(), which reports failures with
+        the user_login_failed signal
+        """
+        failures = []
+        def receiver(sender, credentials, request, **kwargs):
+            failures.append(credentials["username"])
+        user_login_failed.connect(receiver)
+        self.addCleanup(user_login_failed.disconnect, receiver)
+
+        self.login("wrong")
+        self.login()
+
+        self.assertEqual(failures, ["jweckert17"])
+
+    def test_clear_leaves_other_caches(self):
+        """
+        Ensure resetting the throttle only drops its own counts
+        """
+        cache.set("replica-pin:abc", True)
+        self.addCleanup(cache.delete, "replica-pin:abc")
+        self.login("wrong")
+
+        login_throttle.clear()
+
+        self.assertTrue(cache.get("replica-pin:abc"))
+        self.assertIsNone(caches['login-throttle'].get(login_throttle.username_key("jweckert17")))
+
+    def test_success_resets_failures(self):
+        """
+        Ensure a successful login forgets the username's failures
+        """
+        for _ in range(2):
+            self.login("wrong")
+        self.login()
+        for _ in range(2):
+            self.login("wrong")
+
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+    def test_ip_attempts_throttled(self):
+        """
+        Ensure one address can't try more than IP_ATTEMPTS logins per window,
+        while other addresses still can
+        """
+        for attempt in range(10):
+            self.login(username=f"gamer{attempt}", REMOTE_ADDR="10.0.0.1")
+
+        response = self.login(REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(login_throttle.stats()['rejected_ip'], 1)
+
+        self.assertEqual(self.login(REMOTE_ADDR="10.0.0.2").status_code, status.HTTP_200_OK)
+
+    @override_settings(LOGIN_HASHING={'WORKERS': 1, 'QUEUE': 0})
+    def test_saturated_pool_rejects_logins(self):
+        """
+        Ensure logins are answered 503 while every worker is busy and the
+        queue is full
+        """
+        release = threading.Event()
+        busy = hashing_pool.submit(release.wait)
+        try:
+            response = self.login()
+        finally:
+            release.set()
+            busy.result()
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(hashing_pool.stats()['rejected'], 1)
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+    @override_settings(LOGIN_HASHING={'WORKERS': 1, 'QUEUE': 0})
+    def test_saturated_pool_withdraws_attempts(self):
+        """
+        Ensure logins turned away by a full pool count against neither the
+        address nor the username
+        """
+        counts = caches['login-throttle']
+        keys = ["login-ip:10.0.0.1", login_throttle.username_key("jweckert17")]
+        self.login("wrong", REMOTE_ADDR="10.0.0.1")
+
+        release = threading.Event()
+        busy = hashing_pool.submit(release.wait)
+        try:
+            for _ in range(3):
+                response = self.login(REMOTE_ADDR="10.0.0.1")
+                self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        finally:
+            release.set()
+            busy.result()
+
+        self.assertEqual(counts.get_many(keys), dict.fromkeys(keys, 1))
+
+    @override_settings(PASSWORD_HASHERS=[
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ])
+    def test_outdated_hash_upgraded(self):
+        """
+        Ensure a password stored with an outdated hasher is rehashed on login
+        """
+        User.objects.filter(username="jweckert17").update(
+            password=make_password("hunter2", hasher='md5')
+        )
+
+        self.assertTrue(json.loads(self.login().content)["valid"])
+
+        self.assertTrue(User.objects.get(username="jweckert17").password.startswith('pbkdf2_sha256$'))
+        self.assertTrue(json.loads(self.login().content)["valid"])
+
+    def test_async_login(self):
+        """
+        Ensure the async login view answers like the sync one
+        """
+        data = json.dumps({ "username": "jweckert17", "password": "hunter2" })
+        with override_settings(ROOT_URLCONF=async_urlconf()):
+            response = async_to_sync(self.async_client.post)(
+                "/login", data, content_type='application/json'
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), { "valid": True, "token": self.token })
+
+    def test_login_stats_for_admins(self):
+        """
+        Ensure only admins can read the login metrics
+        """
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token)
+        self.assertEqual(self.client.get("/login/stats").status_code, status.HTTP_403_FORBIDDEN)
+
+        user = User.objects.get(username="jweckert17")
+        user.is_staff = True
+        user.save()
+        response = self.client.get("/login/stats")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(json.loads(response.content)),
+            {"hashing", "throttle"}
+        )
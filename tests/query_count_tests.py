@@ -0,0 +1,90 @@
+import json
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from levelupapi.models import GameType, Game, Event, EventGamer, Gamer
+
+@override_settings(GAMER_TOKEN_CACHE=None, RESPONSE_CACHE=None)
+class QueryCountTests(APITestCase):
+    """
+    Pin the number of SQL queries each list endpoint costs, so that nested
+    serializers can't quietly reintroduce per-row lookups
+    """
+    def setUp(self):
+        """
+        Create a new account and a sample game type
+        """
+        url = "/register"
+        data = {
+            "username": "jweckert17",
+            "password": "hunter2",
+            "email": "jweckert17@gmail.com",
+            "first_name": "Jacob",
+            "last_name": "Eckert",
+            "bio": "Just a hardcore gamer 1337!"
+        }
+        response = self.client.post(url, data, format='json')
+        json_response = json.loads(response.content)
+
+        self.gamer = Gamer.objects.get(user__username="jweckert17")
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + json_response['token'])
+
+        self.game_type = GameType.objects.create(name="Board game")
+
+    def seed(self, count):
+        """Seed the DB with `count` games, each with one attended event"""
+        for i in range(count):
+            game = Game.objects.create(
+                name=f"Game {i}", num_players=4, skill_level=3,
+                creator=self.gamer, game_type=self.game_type
+            )
+            event = Event.objects.create(
+                date="2020-11-01", time="18:00", location=f"Table {i}",
+                creator=self.gamer, game=game
+            )
+            EventGamer.objects.create(event=event, gamer=self.gamer)
+
+    def assert_queries(self, url, expected, rows):
+        """Ensure GET url costs `expected` queries whatever the row count"""
+        for count in rows:
+            self.seed(count)
+            with self.assertNumQueries(expected):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_games_query_count(self):
+        """
+        Token, ETag version stamp, page count, games joined with creator, user
+        and game type
+        """
+        self.assert_queries("/games", 4, rows=(1, 10))
+
+    def test_list_events_query_count(self):
+        """
+        Token with gamer, page count, events joined with game, creators and users
+        """
+        self.assert_queries("/events", 3, rows=(1, 10))
+
+    def test_list_gametypes_query_count(self):
+        """
+        Token, ETag version stamp, page count, game types
+        """
+        self.assert_queries("/gametypes", 4, rows=(1, 10))
+
+    def test_list_events_cursor_query_count(self):
+        """
+        Token with gamer, events - keyset pages need no count
+        """
+        self.assert_queries("/events?pagination=cursor", 2, rows=(1, 10))
+
+    def test_list_games_cursor_query_count(self):
+        """
+        Token, ETag version stamp, games
+        """
+        self.assert_queries("/games?pagination=cursor", 3, rows=(1, 10))
+
+    def test_profile_query_count(self):
+        """
+        Token with user and gamer, attended events joined with game
+        """
+        self.assert_queries("/profile", 2, rows=(1, 10))
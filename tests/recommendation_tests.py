@@ -0,0 +1,176 @@
+import json
+from datetime import date, timedelta
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from levelupapi import recommendations
+from levelupapi.models import (
+    GameType, Game, Event, EventGamer, Gamer, GameRecommendation, StaleRecommendation
+)
+
+User = get_user_model()
+
+@override_settings(GAMER_TOKEN_CACHE=None, RESPONSE_CACHE=None)
+class RecommendationTests(APITestCase):
+    def setUp(self):
+        """
+        Create a new account that played Clue with two other gamers, who
+        also played Risk and Uno
+        """
+        url = "/register"
+        data = {
+            "username": "jweckert17",
+            "password": "hunter2",
+            "email": "jweckert17@gmail.com",
+            "first_name": "Jacob",
+            "last_name": "Eckert",
+            "bio": "Just a hardcore gamer 1337!"
+        }
+        response = self.client.post(url, data, format='json')
+        json_response = json.loads(response.content)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + json_response['token'])
+
+        self.gamer = Gamer.objects.get(user__username="jweckert17")
+        self.alice, self.bob = (
+            Gamer.objects.create(user=User.objects.create_user(username=name, password="hunter2"), bio="")
+            for name in ("alice", "bob")
+        )
+
+        board = GameType.objects.create(name="Board game")
+        card = GameType.objects.create(name="Card game")
+        self.games = {
+            name: Game.objects.create(
+                name=name, num_players=4, skill_level=skill_level,
+                creator=creator, game_type=game_type
+            )
+            for name, skill_level, game_type, creator in (
+                ("Clue", 3, board, self.alice),
+                ("Risk", 4, board, self.alice),
+                ("Uno", 9, card, self.bob),
+                ("Sorry", 3, board, self.gamer),
+            )
+        }
+
+        for game, attendees in (
+            ("Clue", (self.gamer, self.alice, self.bob)),
+            ("Risk", (self.alice, )),
+            ("Risk", (self.bob, )),
+            ("Uno", (self.bob, )),
+            ("Sorry", (self.alice, )),
+        ):
+            event = self.event(game, "2020-11-01")
+            for gamer in attendees:
+                EventGamer.objects.create(event=event, gamer=gamer)
+
+        self.build()
+
+    def event(self, game, day):
+        """Create an event of the named game"""
+        return Event.objects.create(
+            date=day, time="18:00", location="Kitchen", creator=self.alice, game=self.games[game]
+        )
+
+    def build(self, *args):
+        """Run the build_recommendations command"""
+        call_command('build_recommendations', *args, stdout=StringIO())
+
+    def names(self, url):
+        """GET url and return the names of the games it lists, in order"""
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [game["name"] for game in json.loads(response.content)]
+
+    def test_recommended_games(self):
+        """
+        Ensure games are ranked by co-attendance, leaving out the games the
+        gamer played or created
+        """
+        self.assertEqual(self.names("/games/recommended"), ["Risk", "Uno"])
+
+        ranks = GameRecommendation.objects.filter(gamer=self.gamer).values_list('game__name', 'rank')
+        self.assertEqual(sorted(ranks, key=lambda row: row[1]), [("Risk", 1), ("Uno", 2)])
+
+    def test_affinity_breaks_ties(self):
+        """
+        Ensure the gamer's game types and skill level decide between games
+        their co-attendees played as often
+        """
+        EventGamer.objects.create(event=self.event("Uno", "2020-11-02"), gamer=self.alice)
+        self.build("--all")
+
+        # Uno now has as many co-attendances as Risk, which is a board game
+        # close to the gamer's skill level like Clue
+        self.assertEqual(self.names("/games/recommended"), ["Risk", "Uno"])
+
+    def test_recommended_events(self):
+        """
+        Ensure upcoming events of recommended games are listed by the game's
+        rank, then by date, leaving out past and joined events
+        """
+        today = date.today()
+        uno = self.event("Uno", today + timedelta(days=1))
+        risk_later = self.event("Risk", today + timedelta(days=7))
+        risk_soon = self.event("Risk", today + timedelta(days=3))
+        joined = self.event("Risk", today + timedelta(days=2))
+        EventGamer.objects.create(event=joined, gamer=self.gamer)
+
+        response = self.client.get("/events/recommended")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [event["id"] for event in json.loads(response.content)],
+            [risk_soon.id, risk_later.id, uno.id]
+        )
+
+    def test_signups_refresh_incrementally(self):
+        """
+        Ensure signups mark the gamer and the event's attendees stale and
+        a plain build only rebuilds those and the gamer's co-attendees
+        """
+        self.assertFalse(StaleRecommendation.objects.exists())
+
+        carol = Gamer.objects.create(user=User.objects.create_user(username="carol"), bio="")
+        event = self.event("Uno", "2020-11-03")
+        EventGamer.objects.create(event=event, gamer=carol)
+        EventGamer.objects.create(event=event, gamer=self.gamer)
+
+        self.assertEqual(
+            set(StaleRecommendation.objects.values_list('gamer_id', 'registrations_changed')),
+            {(carol.id, True), (self.gamer.id, True)}
+        )
+
+        # alice and bob went to Clue with the gamer, who now plays Uno too
+        self.assertEqual(recommendations.refresh_stale()[0], 4)
+
+        self.assertFalse(StaleRecommendation.objects.exists())
+        # Uno is played now, carol co-attended it with the gamer
+        self.assertEqual(self.names("/games/recommended"), ["Risk"])
+        self.assertEqual(
+            list(GameRecommendation.objects.filter(gamer=carol).values_list('game__name', flat=True)),
+            ["Clue"]
+        )
+
+    def test_recommended_games_single_lookup(self):
+        """
+        Ensure recommended games are read in one query over the (gamer, rank) index
+        """
+        with CaptureQueriesContext(connection) as context:
+            self.names("/games/recommended")
+
+        queries = [
+            query["sql"] for query in context.captured_queries
+            if "levelupapi_gamerecommendation" in query["sql"]
+        ]
+        self.assertEqual(len(queries), 1)
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + queries[0])
+            plan = " ".join(row[-1] for row in cursor.fetchall())
+
+        # SQLite backs unique_gamer_recommendation_rank with an autoindex
+        self.assertRegex(plan, r"SEARCH levelupapi_gamerecommendation USING INDEX \S+ \(gamer_id=\?\)")
+        self.assertNotIn("TEMP B-TREE", plan)
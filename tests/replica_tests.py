@@ -0,0 +1,156 @@
+import json
+from unittest import mock
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from levelup import replicas
+from levelupapi.cache import response_cache
+from levelupapi.models import GameType, Game, Event, Gamer
+from levelupreports.models import UserGame
+
+READ_REPLICAS = {
+    'ALIASES': ['replica'],
+    'MAX_LAG_SECONDS': 5,
+    'LAG_CHECK_SECONDS': 5,
+    'CACHE_ALIAS': 'default',
+}
+
+# The replica alias mirrors the test database, so the rows are committed
+# for it to see them
+@override_settings(GAMER_TOKEN_CACHE=None, RESPONSE_CACHE=None, READ_REPLICAS=READ_REPLICAS)
+class ReplicaTests(TransactionTestCase):
+    databases = {'default', 'replica', 'reports'}
+
+    def setUp(self):
+        """
+        Create a new account with a game and an event, and forget any pins
+        and replica lags
+        """
+        cache.clear()
+        replicas.reset_lags()
+        self.client = APIClient()
+
+        url = "/register"
+        data = {
+            "username": "jweckert17",
+            "password": "hunter2",
+            "email": "jweckert17@gmail.com",
+            "first_name": "Jacob",
+            "last_name": "Eckert",
+            "bio": "Just a hardcore gamer 1337!"
+        }
+        response = self.client.post(url, data, format='json')
+        json_response = json.loads(response.content)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + json_response['token'])
+
+        self.gamer = Gamer.objects.get(user__username="jweckert17")
+        game_type = GameType.objects.create(name="Board game")
+        self.game = Game.objects.create(
+            name="Clue", num_players=4, skill_level=3,
+            creator=self.gamer, game_type=game_type
+        )
+        self.event = Event.objects.create(
+            date="2020-11-01", time="18:00", location="Kitchen",
+            creator=self.gamer, game=self.game
+        )
+
+        # The account was created by this client, which is now pinned
+        cache.clear()
+
+    def reads(self, method, url, **kwargs):
+        """Make a request and return its response with the queries it ran
+        on the primary and on the replica"""
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            response = getattr(self.client, method)(url, **kwargs)
+
+        return response, [query['sql'] for query in primary], [query['sql'] for query in replica]
+
+    def test_reads_go_to_replica(self):
+        """
+        Ensure a GET reads everything but the token from the replica
+        """
+        response, primary, replica = self.reads('get', "/events")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(primary), 1)
+        self.assertIn('"authtoken_token"', primary[0])
+        self.assertTrue(replica)
+        self.assertTrue(all('"levelupapi_event"' in sql or 'COUNT' in sql for sql in replica))
+
+    def test_writes_pin_gamer_to_primary(self):
+        """
+        Ensure a gamer's reads follow their signup to the primary until the
+        pin expires, while other gamers keep reading from the replica
+        """
+        response, _, replica = self.reads('post', f"/events/{self.event.id}/signup")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(replica, [])
+
+        response, _, replica = self.reads('get', "/events")
+        self.assertEqual(replica, [])
+        self.assertTrue(json.loads(response.content)["results"][0]["joined"])
+
+        with CaptureQueriesContext(connections['replica']) as replica:
+            APIClient().get("/reports/usergames")
+        self.assertTrue(replica.captured_queries)
+
+        cache.clear()
+        _, _, replica = self.reads('get', "/events")
+        self.assertTrue(replica)
+
+    def test_lagging_replica_skipped(self):
+        """
+        Ensure reads fall back to the primary while the replica is further
+        behind than MAX_LAG_SECONDS, checking the lag every LAG_CHECK_SECONDS
+        """
+        with mock.patch.object(replicas, 'measure_lag', return_value=30.0) as measure:
+            _, _, replica = self.reads('get', "/games")
+            self.reads('get', "/games")
+
+        self.assertEqual(replica, [])
+        measure.assert_called_once_with('replica')
+
+        replicas.reset_lags()
+        with mock.patch.object(replicas, 'measure_lag', return_value=1.0):
+            _, _, replica = self.reads('get', "/games")
+        self.assertTrue(replica)
+
+    def test_reports_read_from_replica(self):
+        """
+        Ensure the report tables are read from the replica outside of
+        requests, unless a transaction on the primary is writing
+        """
+        self.assertEqual(UserGame.objects.all().db, 'replica')
+        self.assertEqual(Game.objects.all().db, 'default')
+        with transaction.atomic():
+            self.assertEqual(UserGame.objects.all().db, 'default')
+
+    def test_reports_fall_back_to_read_only_connections(self):
+        """
+        Ensure the report tables are read over REPORTS_DATABASE while every
+        replica lags
+        """
+        with mock.patch.object(replicas, 'measure_lag', return_value=30.0):
+            self.assertEqual(UserGame.objects.all().db, 'reports')
+            self.assertEqual(Game.objects.all().db, 'default')
+
+    @override_settings(RESPONSE_CACHE={'ALIAS': 'responses', 'TIMEOUT': 300})
+    def test_recent_changes_not_cached_from_replica(self):
+        """
+        Ensure a payload read from the replica soon after its rows changed
+        is not cached under the new generation
+        """
+        response_cache.clear()
+        self.game.name = "Cluedo"
+        self.game.save()
+
+        self.assertEqual(self.client.get("/games")['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get("/games")['X-Cache'], 'MISS')
+
+        with override_settings(READ_REPLICAS={**READ_REPLICAS, 'MAX_LAG_SECONDS': 0}):
+            self.client.get("/games")
+            self.assertEqual(self.client.get("/games")['X-Cache'], 'HIT')
@@ -0,0 +1,132 @@
+import json
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APITestCase
+from levelupapi.models import GameType, Game, Event, EventGamer, Gamer
+from levelupreports.models import UserEvent, UserGame
+
+User = get_user_model()
+
+class ReportTests(APITestCase):
+    def setUp(self):
+        """
+        Seed two gamers, a game and an event both of them attend
+        """
+        game_type = GameType.objects.create(name="Board game")
+
+        self.gamers = []
+        for username, first_name in (("jweckert17", "Jacob"), ("sally", "Sally")):
+            user = User.objects.create_user(
+                username=username, password="hunter2", first_name=first_name, last_name="Eckert"
+            )
+            self.gamers.append(Gamer.objects.create(user=user, bio=""))
+
+        game = Game.objects.create(
+            name="Clue", num_players=4, skill_level=3,
+            creator=self.gamers[0], game_type=game_type
+        )
+        event = Event.objects.create(
+            date="2020-11-01", time="18:00", location="Kitchen",
+            creator=self.gamers[0], game=game
+        )
+        for gamer in self.gamers:
+            EventGamer.objects.create(event=event, gamer=gamer)
+
+    def test_usergames_report(self):
+        """
+        Ensure the games by user report lists each creator's games
+        """
+        response = self.client.get("/reports/usergames")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContains(response, "Jacob Eckert")
+        self.assertContains(response, "Title: Clue")
+        self.assertNotContains(response, "Sally Eckert")
+
+    def test_userevents_report(self):
+        """
+        Ensure the events by user report lists every attendee's events
+        """
+        response = self.client.get("/reports/userevents")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContains(response, "Jacob Eckert")
+        self.assertContains(response, "Sally Eckert")
+        self.assertContains(response, "Game: Clue", count=2)
+
+    def test_usergames_csv_export(self):
+        """
+        Ensure the games by user report streams as CSV
+        """
+        response = self.client.get("/reports/usergames?format=csv")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/csv")
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "user_id,full_name,id,name,game_type_id,num_players,skill_level")
+        self.assertEqual(len(lines), 2)
+        self.assertIn("Jacob Eckert,", lines[1])
+
+    def test_userevents_ndjson_export(self):
+        """
+        Ensure the events by user report streams one JSON line per user
+        """
+        response = self.client.get("/reports/userevents?format=ndjson")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        users = [json.loads(line) for line in lines]
+
+        self.assertEqual(
+            [user["full_name"] for user in users],
+            ["Jacob Eckert", "Sally Eckert"]
+        )
+        for user in users:
+            self.assertEqual(len(user["events"]), 1)
+            self.assertEqual(user["events"][0]["game_name"], "Clue")
+
+    def test_reports_follow_changes(self):
+        """
+        Ensure the report tables are kept current as the data changes
+        """
+        game = Game.objects.get(name="Clue")
+        game.name = "Cluedo"
+        game.save()
+
+        user = self.gamers[1].user
+        user.first_name = "Sal"
+        user.save()
+
+        EventGamer.objects.filter(gamer=self.gamers[0]).delete()
+
+        self.assertEqual(
+            list(UserGame.objects.values_list('full_name', 'name')),
+            [("Jacob Eckert", "Cluedo")]
+        )
+        self.assertEqual(
+            list(UserEvent.objects.values_list('full_name', 'game_name')),
+            [("Sal Eckert", "Cluedo")]
+        )
+
+    def test_rebuild_reports(self):
+        """
+        Ensure rebuilding the report tables reproduces the maintained rows
+        """
+        maintained = (
+            list(UserGame.objects.order_by('game_id').values()),
+            list(UserEvent.objects.order_by('registration_id').values())
+        )
+
+        UserGame.objects.all().delete()
+        UserEvent.objects.all().delete()
+        call_command('rebuild_reports', stdout=StringIO())
+
+        rebuilt = (
+            list(UserGame.objects.order_by('game_id').values()),
+            list(UserEvent.objects.order_by('registration_id').values())
+        )
+        self.assertEqual(rebuilt, maintained)
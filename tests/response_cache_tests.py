@@ -0,0 +1,172 @@
+import json
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APITestCase
+from levelupapi.cache import response_cache
+from levelupapi.models import GameType, Game, Event, EventGamer, Gamer
+
+@override_settings(GAMER_TOKEN_CACHE=None)
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        """
+        Create a new account with a game and an event on an empty cache
+        """
+        response_cache.clear()
+
+        url = "/register"
+        data = {
+            "username": "jweckert17",
+            "password": "hunter2",
+            "email": "jweckert17@gmail.com",
+            "first_name": "Jacob",
+            "last_name": "Eckert",
+            "bio": "Just a hardcore gamer 1337!"
+        }
+        response = self.client.post(url, data, format='json')
+        json_response = json.loads(response.content)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + json_response['token'])
+
+        self.gamer = Gamer.objects.get(user__username="jweckert17")
+        self.game_type = GameType.objects.create(name="Board game")
+        self.game = Game.objects.create(
+            name="Clue", num_players=4, skill_level=3,
+            creator=self.gamer, game_type=self.game_type
+        )
+        self.event = Event.objects.create(
+            date="2020-11-01", time="18:00", location="Table 1",
+            creator=self.gamer, game=self.game
+        )
+
+    def test_repeat_request_served_from_cache(self):
+        """
+        Ensure a repeat request only authenticates and returns the same payload
+        """
+        first = self.client.get("/games")
+        self.assertEqual(first['X-Cache'], 'MISS')
+
+        with self.assertNumQueries(1):
+            second = self.client.get("/games")
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(json.loads(second.content), json.loads(first.content))
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_cached_response_honors_etag(self):
+        """
+        Ensure a cache hit still answers a matching If-None-Match with 304
+        """
+        etag = self.client.get("/gametypes")['ETag']
+
+        response = self.client.get("/gametypes", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_query_params_have_own_entries(self):
+        """
+        Ensure each filter is cached separately
+        """
+        self.client.get("/games")
+        other_type = GameType.objects.create(name="Card game")
+
+        response = self.client.get(f"/games?type={other_type.id}")
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(json.loads(response.content)['count'], 0)
+
+    def test_save_invalidates(self):
+        """
+        Ensure saving a game type invalidates the games that show it
+        """
+        self.client.get(f"/games/{self.game.id}")
+        self.game_type.name = "Party game"
+        self.game_type.save()
+
+        response = self.client.get(f"/games/{self.game.id}")
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(json.loads(response.content)['game_type']['name'], "Party game")
+
+    def test_delete_invalidates(self):
+        """
+        Ensure deleting a game drops it from the cached list
+        """
+        self.client.get("/games")
+        self.game.delete()
+
+        response = self.client.get("/games")
+
+        self.assertEqual(json.loads(response.content)['count'], 0)
+
+    def test_joined_never_stale(self):
+        """
+        Ensure signing up and leaving update `joined` for the gamer and the
+        attendance for everyone
+        """
+        user = get_user_model().objects.create_user(username="other", password="pw")
+        other = Gamer.objects.create(user=user, bio="")
+        other_client = APIClient()
+        other_client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=user).key)
+        url = f"/events/{self.event.id}"
+
+        self.client.get(url)
+        other_client.get(url)
+
+        self.client.post(f"{url}/signup")
+        response = self.client.get(url)
+        self.assertTrue(json.loads(response.content)['joined'])
+
+        response = other_client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertFalse(json.loads(response.content)['joined'])
+        self.assertEqual(json.loads(response.content)['attendee_count'], 1)
+
+        EventGamer.objects.create(event=self.event, gamer=other)
+        response = other_client.get(url)
+        self.assertTrue(json.loads(response.content)['joined'])
+
+        self.client.delete(f"{url}/signup")
+        response = self.client.get("/events")
+        self.assertFalse(json.loads(response.content)['results'][0]['joined'])
+
+    def test_evicted_generation_starts_past_old_entries(self):
+        """
+        Ensure losing a generation to eviction never revives old entries
+        """
+        self.client.get("/gametypes")
+        response_cache.backend.delete("generation:gametypes")
+        GameType.objects.filter(pk=self.game_type.pk).update(name="Party game")
+
+        response = self.client.get("/gametypes")
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(json.loads(response.content)['results'][0]['name'], "Party game")
+
+    def test_stats(self):
+        """
+        Ensure hits and misses are counted and only shown to staff
+        """
+        self.client.get("/gametypes")
+        self.client.get("/gametypes")
+
+        response = self.client.get("/cache/stats")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.gamer.user.is_staff = True
+        self.gamer.user.save()
+        response = self.client.get("/cache/stats")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+
+    @override_settings(RESPONSE_CACHE=None)
+    def test_disabled(self):
+        """
+        Ensure every request is served by the view when the cache is off
+        """
+        self.client.get("/games")
+        response = self.client.get("/games")
+
+        self.assertFalse(response.has_header('X-Cache'))
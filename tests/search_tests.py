@@ -0,0 +1,159 @@
+import json
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from levelupapi import search
+from levelupapi.models import GameType, Game, Gamer, GameSearchEntry
+
+@override_settings(GAMER_TOKEN_CACHE=None, RESPONSE_CACHE=None)
+class SearchTests(APITestCase):
+    def setUp(self):
+        """
+        Create a new account and games of two types to search
+        """
+        url = "/register"
+        data = {
+            "username": "jweckert17",
+            "password": "hunter2",
+            "email": "jweckert17@gmail.com",
+            "first_name": "Jacob",
+            "last_name": "Eckert",
+            "bio": "Just a hardcore gamer 1337!"
+        }
+        response = self.client.post(url, data, format='json')
+        json_response = json.loads(response.content)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + json_response['token'])
+
+        self.gamer = Gamer.objects.get(user__username="jweckert17")
+        self.board, self.card = (GameType.objects.create(name=name) for name in ("Board game", "Card game"))
+
+        self.games = {}
+        for name, num_players, skill_level, game_type in (
+            ("Ticket to Ride", 5, 2, self.board),
+            ("Ticket to Ride: Europe", 5, 3, self.board),
+            ("Pandemic", 4, 3, self.board),
+            ("Ride the Rails", 6, 4, self.board),
+            ("Tichu", 4, 4, self.card),
+        ):
+            self.games[name] = Game.objects.create(
+                name=name, num_players=num_players, skill_level=skill_level,
+                creator=self.gamer, game_type=game_type
+            )
+
+    def names(self, url):
+        """GET a games list and return the names it lists, in order"""
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [game["name"] for game in json.loads(response.content)["results"]]
+
+    def test_prefix_search(self):
+        """
+        Ensure each word searched matches the start of a word in the name
+        """
+        self.assertEqual(
+            set(self.names("/games?search=tic")),
+            {"Ticket to Ride", "Ticket to Ride: Europe", "Tichu"}
+        )
+        self.assertEqual(
+            set(self.names("/games?search=TICK%20ri")),
+            {"Ticket to Ride", "Ticket to Ride: Europe"}
+        )
+        self.assertEqual(self.names("/games?search=icket"), [])
+        self.assertEqual(self.names("/games?search=%22*"), [])
+
+    def test_best_matches_first(self):
+        """
+        Ensure a search lists the closest names first
+        """
+        names = self.names("/games?search=ride")
+
+        self.assertEqual(names[0], "Ticket to Ride")
+        self.assertEqual(set(names), {"Ticket to Ride", "Ticket to Ride: Europe", "Ride the Rails"})
+
+    def test_search_with_filters(self):
+        """
+        Ensure a search combines with the type, player and skill filters
+        """
+        self.assertEqual(self.names(f"/games?search=ti&type={self.card.id}"), ["Tichu"])
+        self.assertEqual(
+            self.names("/games?search=ride&min_players=5&max_players=5&min_skill=3"),
+            ["Ticket to Ride: Europe"]
+        )
+        self.assertEqual(self.names("/games?max_skill=2"), ["Ticket to Ride"])
+
+        response = self.client.get("/games?min_players=two")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_broad_search_ranks_newest_matches(self):
+        """
+        Ensure a search matching more than SEARCH_LIMIT of the filtered games
+        ranks the newest of them and still lists the rest after them
+        """
+        with mock.patch.object(search, 'SEARCH_LIMIT', 2):
+            response = self.client.get("/games?search=ti")
+            json_response = json.loads(response.content)
+            names = [game["name"] for game in json_response["results"]]
+
+            self.assertEqual(json_response["count"], 3)
+            self.assertEqual(set(names[:2]), {"Ticket to Ride: Europe", "Tichu"})
+            self.assertEqual(names[2], "Ticket to Ride")
+            self.assertEqual(
+                set(self.names(f"/games?search=ti&type={self.board.id}")),
+                {"Ticket to Ride", "Ticket to Ride: Europe"}
+            )
+
+    def test_index_follows_games(self):
+        """
+        Ensure saved, renamed, bulk created and deleted games are searched
+        by their current names
+        """
+        game = self.games["Pandemic"]
+        game.name = "Pandemic Legacy"
+        game.save()
+        self.assertEqual(self.names("/games?search=leg"), ["Pandemic Legacy"])
+
+        items = [
+            { "name": "Legendary", "numPlayers": 5, "skillLevel": 3, "gameTypeId": self.card.id }
+        ]
+        response = self.client.post("/games/bulk", items, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(set(self.names("/games?search=leg")), {"Pandemic Legacy", "Legendary"})
+
+        game.delete()
+        self.assertEqual(self.names("/games?search=leg"), ["Legendary"])
+        self.assertFalse(GameSearchEntry.objects.filter(pk=game.pk).exists())
+
+    def test_rebuild_search_index(self):
+        """
+        Ensure the index can be rebuilt from the games
+        """
+        GameSearchEntry.objects.all().delete()
+
+        call_command('rebuild_search_index', verbosity=0, stdout=StringIO())
+
+        self.assertEqual(GameSearchEntry.objects.count(), Game.objects.count())
+        self.assertEqual(set(self.names("/games?search=pan")), {"Pandemic"})
+
+    def test_search_uses_full_text_index(self):
+        """
+        Ensure a search looks names up in the FTS5 index rather than scanning games
+        """
+        with CaptureQueriesContext(connection) as context:
+            self.names("/games?search=ride")
+
+        sql = next(
+            query["sql"] for query in context.captured_queries
+            if query["sql"].startswith("SELECT") and "MATCH" in query["sql"]
+            and "COUNT(*)" not in query["sql"]
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql)
+            plan = " ".join(row[-1] for row in cursor.fetchall())
+
+        self.assertIn("SCAN levelupapi_game_fts VIRTUAL TABLE INDEX", plan)
+        self.assertIn("SEARCH levelupapi_game USING INTEGER PRIMARY KEY", plan)
@@ -0,0 +1,64 @@
+import json
+from hashlib import sha1
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from rest_framework import status
+from rest_framework.test import APITestCase
+from levelupapi.management.commands.seed_levelup import SEED_PASSWORD
+from levelupapi.models import Event, EventGamer, Game, Gamer, GameType
+from levelupreports.models import UserEvent
+
+class SeedTests(APITestCase):
+    def test_seed_levelup(self):
+        """
+        Ensure the seed command creates the requested volumes of usable data
+        """
+        call_command(
+            'seed_levelup', users=20, games=10, events=30, registrations=100, stdout=StringIO()
+        )
+
+        self.assertEqual(Gamer.objects.count(), 20)
+        self.assertEqual(Game.objects.count(), 10)
+        self.assertEqual(Event.objects.count(), 30)
+        self.assertEqual(EventGamer.objects.count(), 100)
+        self.assertEqual(UserEvent.objects.count(), 100)
+
+        # Seeded users can log in with the shared password
+        gamer = Gamer.objects.select_related('user').first()
+        response = self.client.post(
+            "/login", { "username": gamer.user.username, "password": SEED_PASSWORD }, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(json.loads(response.content)["valid"])
+
+    def test_seed_levelup_checks_counts(self):
+        """
+        Ensure counts that leave games or events nothing to point to are
+        refused before anything is written
+        """
+        for counts in ({'users': 0, 'games': 1}, {'games': 0, 'events': 1}, {'registrations': -1}):
+            with self.assertRaises(CommandError):
+                call_command('seed_levelup', stdout=StringIO(), **counts)
+
+        self.assertFalse(Gamer.objects.exists())
+
+    def test_seeded_ids_leave_room_for_new_rows(self):
+        """
+        Ensure rows created after seeding get fresh ids and tokens aren't
+        derived from the seed
+        """
+        call_command(
+            'seed_levelup', users=3, games=2, events=2, registrations=0, stdout=StringIO()
+        )
+        gamer = Gamer.objects.select_related('user__auth_token').first()
+        game = Game.objects.create(
+            name="Clue", num_players=4, skill_level=3,
+            creator=gamer, game_type=GameType.objects.first()
+        )
+
+        self.assertEqual(game.id, 3)
+        self.assertEqual(len(gamer.user.auth_token.key), 40)
+        self.assertNotEqual(
+            gamer.user.auth_token.key, sha1(f"17:{gamer.user_id}".encode()).hexdigest()
+        )
@@ -0,0 +1,128 @@
+import json
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from levelupapi.models import GameType, Game, Event, EventGamer, Gamer
+
+@override_settings(GAMER_TOKEN_CACHE=None, RESPONSE_CACHE=None)
+class SparseFieldsTests(APITestCase):
+    def setUp(self):
+        """
+        Create a new account with a game and an attended event
+        """
+        url = "/register"
+        data = {
+            "username": "jweckert17",
+            "password": "hunter2",
+            "email": "jweckert17@gmail.com",
+            "first_name": "Jacob",
+            "last_name": "Eckert",
+            "bio": "Just a hardcore gamer 1337!"
+        }
+        response = self.client.post(url, data, format='json')
+        json_response = json.loads(response.content)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + json_response['token'])
+
+        self.gamer = Gamer.objects.get(user__username="jweckert17")
+        self.game_type = GameType.objects.create(name="Board game")
+        self.game = Game.objects.create(
+            name="Clue", num_players=4, skill_level=3,
+            creator=self.gamer, game_type=self.game_type
+        )
+        self.event = Event.objects.create(
+            date="2020-11-01", time="18:00", location="Table 1",
+            creator=self.gamer, game=self.game
+        )
+        EventGamer.objects.create(event=self.event, gamer=self.gamer)
+
+    def get(self, url):
+        """GET url and return its decoded body and the SQL it ran"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return json.loads(response.content), [query['sql'] for query in queries]
+
+    def test_events_fields(self):
+        """
+        Ensure ?fields= keeps only the listed fields and skips the joins
+        """
+        body, queries = self.get("/events?fields=id,date")
+
+        self.assertEqual(body['results'], [{"id": self.event.id, "date": "2020-11-01"}])
+        page_query = queries[-1]
+        self.assertNotIn('levelupapi_game', page_query)
+        self.assertNotIn('location', page_query)
+
+    def test_events_nested_fields(self):
+        """
+        Ensure a dotted path selects inside a nested object
+        """
+        body, queries = self.get("/events?fields=id,game.name,game.game_type.name")
+
+        self.assertEqual(body['results'], [{
+            "id": self.event.id,
+            "game": {"name": "Clue", "game_type": {"name": "Board game"}},
+        }])
+        self.assertNotIn('auth_user', queries[-1])
+        self.assertNotIn('num_players', queries[-1])
+
+    def test_events_expand(self):
+        """
+        Ensure relations left out of ?expand= are rendered as their ids
+        """
+        body, queries = self.get(f"/events/{self.event.id}?expand=game")
+
+        self.assertEqual(body['creator'], self.gamer.id)
+        self.assertEqual(body['game']['creator'], self.gamer.id)
+        self.assertEqual(body['game']['game_type'], self.game_type.id)
+        self.assertTrue(body['joined'])
+        self.assertNotIn('auth_user', queries[-1])
+
+    def test_games_fields(self):
+        """
+        Ensure game lists and games accept ?fields=
+        """
+        body, _ = self.get("/games?fields=id,name,creator.user.first_name")
+        self.assertEqual(body['results'], [{
+            "id": self.game.id, "name": "Clue", "creator": {"user": {"first_name": "Jacob"}},
+        }])
+
+        body, _ = self.get(f"/games/{self.game.id}?fields=name&expand=")
+        self.assertEqual(body, {"name": "Clue"})
+
+    def test_profile_fields(self):
+        """
+        Ensure profile paths are rooted at gamer and events
+        """
+        body, _ = self.get("/profile?fields=events.id,events.game.name")
+
+        self.assertEqual(body, {"events": [{"id": self.event.id, "game": {"name": "Clue"}}]})
+
+    def test_cursor_page_with_sparse_fields(self):
+        """
+        Ensure a cursor page still reads the ordering without extra queries
+        """
+        with self.assertNumQueries(2):
+            body, _ = self.get("/events?pagination=cursor&fields=id")
+
+        self.assertEqual(body['results'], [{"id": self.event.id}])
+
+    def test_fast_path_matches(self):
+        """
+        Ensure the flat serializers prune the same way
+        """
+        for url in ("/events?fields=id,game.name&expand=game", "/games?expand=", "/events?fields=url"):
+            expected = self.client.get(url).content
+            with self.settings(FAST_JSON=True):
+                self.assertEqual(self.client.get(url).content, expected)
+
+    def test_full_output_unchanged(self):
+        """
+        Ensure responses without the parameters still nest everything
+        """
+        body, _ = self.get(f"/events/{self.event.id}")
+
+        self.assertEqual(body['game']['creator']['user']['first_name'], "Jacob")
+        self.assertEqual(body['creator']['user']['email'], "jweckert17@gmail.com")